@@ -0,0 +1,55 @@
+"""Benchmark for the currency name enrichment in `dim_currency()`.
+
+Compares the per-row `ccy.currency()` calls the transform used to make with
+the cached static lookup.
+
+Run from the root directory with:
+    PYTHONPATH=$(pwd) python benchmarks/bench_dim_currency.py
+"""
+
+import time
+
+import ccy
+import numpy as np
+import pandas as pd
+
+from src.transform.dim_currency import dim_currency
+
+NUM_ROWS = 1_000_000
+
+
+def per_row_names(currency_data):
+    """The per-row enrichment `dim_currency()` used before the static lookup."""
+    return [ccy.currency(code).name for code in currency_data["currency_code"].tolist()]
+
+
+def best_time(function, repeats=3):
+    """Returns the best of `repeats` run times in seconds."""
+
+    timings = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    codes = np.array(["GBP", "USD", "EUR", "JPY", "CHF"], dtype=object)
+    timestamps = pd.Timestamp("2022-11-03 14:20:49.962")
+
+    currency_df = pd.DataFrame(
+        {
+            "currency_id": np.arange(NUM_ROWS),
+            "currency_code": codes[rng.integers(0, len(codes), NUM_ROWS)],
+            "created_at": timestamps,
+            "last_updated": timestamps,
+        }
+    )
+
+    print(f"rows: {NUM_ROWS}")
+    print(f"per-row ccy.currency(): {best_time(lambda: per_row_names(currency_df)):.3f}s")
+    print(f"dim_currency():         {best_time(lambda: dim_currency(currency_df)):.3f}s")
@@ -0,0 +1,81 @@
+"""Benchmark for `split_created_and_updated()`.
+
+Compares the Arrow compute implementation with the previous `.dt.date` /
+`.dt.time` implementation on a million rows.
+
+Run from the root directory with:
+    PYTHONPATH=$(pwd) python benchmarks/bench_split_created_and_updated.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.utils.split_created_and_updated import split_created_and_updated
+
+NUM_ROWS = 1_000_000
+
+
+def previous_split_created_and_updated(data_frame):
+    """The object-dtype implementation replaced by the Arrow compute one."""
+
+    df = data_frame.copy(deep=True)
+
+    df["created_at"] = pd.to_datetime(df["created_at"], format="%Y-%m-%d %H:%M:%S.%f")
+    df["created_date"] = df["created_at"].dt.date
+    df["created_time"] = df["created_at"].dt.time
+    df.drop("created_at", axis=1, inplace=True)
+
+    df["last_updated"] = pd.to_datetime(
+        df["last_updated"], format="%Y-%m-%d %H:%M:%S.%f"
+    )
+    df["last_updated_date"] = df["last_updated"].dt.date
+    df["last_updated_time"] = df["last_updated"].dt.time
+    df.drop("last_updated", axis=1, inplace=True)
+
+    return df
+
+
+def make_data_frame(num_rows):
+    """Creates a payment-like data frame with timestamp columns read from Parquet."""
+
+    rng = np.random.default_rng(0)
+    start = np.datetime64("2022-11-03T14:20:49.962000")
+    offsets = rng.integers(0, 500 * 24 * 3600 * 10**6, num_rows).astype(
+        "timedelta64[us]"
+    )
+
+    return pd.DataFrame(
+        {
+            "payment_id": np.arange(num_rows),
+            "payment_amount": rng.random(num_rows) * 1000,
+            "created_at": start + offsets,
+            "last_updated": start + offsets,
+        }
+    )
+
+
+def time_function(function, df, repeats=3):
+    """Returns the best of `repeats` run times in seconds."""
+
+    timings = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(df)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+if __name__ == "__main__":
+    df = make_data_frame(NUM_ROWS)
+
+    previous = time_function(previous_split_created_and_updated, df)
+    current = time_function(split_created_and_updated, df)
+
+    print(f"rows: {NUM_ROWS}")
+    print(f"previous (.dt.date/.dt.time): {previous:.3f}s")
+    print(f"current (Arrow compute):      {current:.3f}s")
+    print(f"speed up: {previous / current:.1f}x")
@@ -0,0 +1,147 @@
+"""Benchmark comparing the pandas and Arrow transform engines.
+
+Reference data for the joins is passed in directly, so no AWS access is needed.
+
+Run from the root directory with:
+    PYTHONPATH=$(pwd) python benchmarks/bench_transform_engines.py
+"""
+
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.transform.arrow_transforms import (
+    arrow_dim_counterparty,
+    arrow_dim_location,
+    arrow_fact_payment,
+    arrow_fact_sales_order,
+)
+from src.transform.dim_counterparty import dim_counterparty
+from src.transform.dim_location import dim_location
+from src.transform.fact_payment import fact_payment
+from src.transform.fact_sales_order import fact_sales_order
+
+NUM_ROWS = 1_000_000
+NUM_ADDRESSES = 100_000
+
+
+def make_timestamps(rng, num_rows):
+    """Creates a column of timestamps as read from an ingestion file."""
+    start = np.datetime64("2022-11-03T14:20:49.962000")
+    offsets = rng.integers(0, 500 * 24 * 3600 * 10**6, num_rows)
+    return start + offsets.astype("timedelta64[us]")
+
+
+def make_data(rng):
+    """Creates input data frames for each benchmarked transform."""
+
+    timestamps = make_timestamps(rng, NUM_ROWS)
+    address_timestamps = make_timestamps(rng, NUM_ADDRESSES)
+    cities = np.array([f"City {i}" for i in range(500)], dtype=object)
+
+    address_df = pd.DataFrame(
+        {
+            "address_id": np.arange(NUM_ADDRESSES),
+            "address_line_1": cities[rng.integers(0, 500, NUM_ADDRESSES)],
+            "address_line_2": cities[rng.integers(0, 500, NUM_ADDRESSES)],
+            "district": cities[rng.integers(0, 500, NUM_ADDRESSES)],
+            "city": cities[rng.integers(0, 500, NUM_ADDRESSES)],
+            "postal_code": cities[rng.integers(0, 500, NUM_ADDRESSES)],
+            "country": cities[rng.integers(0, 500, NUM_ADDRESSES)],
+            "phone": cities[rng.integers(0, 500, NUM_ADDRESSES)],
+            "created_at": address_timestamps,
+            "last_updated": address_timestamps,
+        }
+    )
+    counterparty_df = pd.DataFrame(
+        {
+            "counterparty_id": np.arange(NUM_ROWS),
+            "counterparty_legal_name": cities[rng.integers(0, 500, NUM_ROWS)],
+            "legal_address_id": rng.integers(0, NUM_ADDRESSES, NUM_ROWS),
+            "created_at": timestamps,
+            "last_updated": timestamps,
+        }
+    )
+    payment_df = pd.DataFrame(
+        {
+            "payment_id": np.arange(NUM_ROWS),
+            "payment_amount": rng.random(NUM_ROWS) * 1000,
+            "company_ac_number": rng.integers(0, 10**8, NUM_ROWS),
+            "counterparty_ac_number": rng.integers(0, 10**8, NUM_ROWS),
+            "created_at": timestamps,
+            "last_updated": timestamps,
+        }
+    )
+    sales_order_df = pd.DataFrame(
+        {
+            "sales_order_id": np.arange(NUM_ROWS),
+            "staff_id": rng.integers(0, 20, NUM_ROWS),
+            "units_sold": rng.integers(1, 100000, NUM_ROWS),
+            "created_at": timestamps,
+            "last_updated": timestamps,
+        }
+    )
+
+    return address_df, counterparty_df, payment_df, sales_order_df
+
+
+def best_time(function, repeats=3):
+    """Returns the best of `repeats` run times in seconds."""
+
+    timings = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+if __name__ == "__main__":
+    address_df, counterparty_df, payment_df, sales_order_df = make_data(
+        np.random.default_rng(0)
+    )
+
+    def to_table(df):
+        return pa.Table.from_pandas(df, preserve_index=False)
+
+    address_table = to_table(address_df)
+    counterparty_table = to_table(counterparty_df)
+    payment_table = to_table(payment_df)
+    sales_order_table = to_table(sales_order_df)
+
+    benchmarks = [
+        (
+            "dim_location",
+            lambda: dim_location(address_df),
+            lambda: arrow_dim_location(address_table),
+        ),
+        (
+            "dim_counterparty",
+            lambda: dim_counterparty(counterparty_df, address_data=address_df),
+            lambda: arrow_dim_counterparty(
+                counterparty_table, address_table=address_table
+            ),
+        ),
+        (
+            "fact_payment",
+            lambda: fact_payment(payment_df),
+            lambda: arrow_fact_payment(payment_table),
+        ),
+        (
+            "fact_sales_order",
+            lambda: fact_sales_order(sales_order_df),
+            lambda: arrow_fact_sales_order(sales_order_table),
+        ),
+    ]
+
+    print(f"rows: {NUM_ROWS}")
+    print(f"{'transform':<20}{'pandas':>10}{'arrow':>10}")
+
+    for name, pandas_function, arrow_function in benchmarks:
+        pandas_time = best_time(pandas_function)
+        arrow_time = best_time(arrow_function)
+        print(f"{name:<20}{pandas_time:>9.3f}s{arrow_time:>9.3f}s")
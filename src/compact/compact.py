@@ -0,0 +1,157 @@
+"""This module contains the definitions for `compact_table_day()` and the
+compaction `lambda_handler()`.
+
+Compaction merges the small files written for a table on one day into a
+single sorted file at `_compacted/<table name>/<date>/<timestamp>.parquet`
+and records it in the table's compaction manifest. The small files are left
+in place, as data in the buckets is immutable. The daily job then snapshots
+each table as of the end of the day, so `get_table_as_of()` starts from the
+latest snapshot instead of replaying the table's whole history, and each
+snapshot only reads the previous one and a day of changes.
+
+Only the ingestion bucket is compacted, as its readers resolve files through
+the manifest. Processed files are loaded into the warehouse one file at a
+time, so compacted copies of them would never be read.
+"""
+
+from datetime import datetime, timedelta
+import logging
+
+from src.utils.client_factory import get_client
+from src.utils.compaction_manifest import (
+    get_compaction_manifest,
+    put_compaction_manifest,
+)
+from src.utils.get_bucket_name import get_bucket_name
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+COMPACTED_PREFIX = "_compacted"
+ROW_GROUP_SIZE = 128 * 1024
+
+TABLES = [
+    "counterparty",
+    "currency",
+    "address",
+    "department",
+    "design",
+    "staff",
+    "sales_order",
+    "payment",
+    "payment_type",
+    "purchase_order",
+    "transaction",
+]
+
+
+def compact_table_day(table_name, bucket_name, date):
+    """A function to merge a table's files for one day into a single compacted file.
+
+    Rows are sorted by primary key (then last_updated) and written in large row groups.
+    The day is skipped if it has fewer than two files or is already compacted from the same files.
+
+    Args:
+        table_name (str): name of the table, e.g. `staff`.
+        bucket_name (str): name of the s3 bucket where data is stored.
+        date (str): the day to compact, in format `YYYY-MM-DD`.
+
+    Returns:
+        compacted_key (str): key of the new compacted file, or None if nothing was compacted.
+    """
+
+    import pandas as pd
+
+    from src.utils.file_catalog import get_catalog, get_primary_key
+    from src.utils.get_table_as_of import list_table_files
+    from src.utils.parquet_file_reader import parquet_file_reader
+
+    catalog = get_catalog(table_name, bucket_name)
+
+    if catalog is None:
+        sources = list_table_files(f"{table_name}/{date}/", bucket_name)
+    else:
+        sources = sorted(
+            catalog.loc[catalog["run_id"].str.startswith(date), "key"].tolist()
+        )
+
+    manifest = get_compaction_manifest(table_name, bucket_name)
+    compacted_day = manifest["days"].get(date)
+
+    if len(sources) < 2:
+        logger.info(f"{table_name} {date}: {len(sources)} files - nothing to compact.")
+        return None
+
+    if compacted_day is not None and compacted_day["sources"] == sources:
+        logger.info(f"{table_name} {date} already compacted.")
+        return None
+
+    df = pd.concat(
+        [parquet_file_reader(source, bucket_name) for source in sources],
+        ignore_index=True,
+    )
+
+    sort_columns = [
+        column
+        for column in [get_primary_key(table_name, df.columns), "last_updated"]
+        if column in df.columns
+    ]
+
+    if sort_columns:
+        df = df.sort_values(sort_columns, kind="stable", ignore_index=True)
+
+    compaction_time = datetime.utcnow().strftime("%H:%M:%S.%f")
+    compacted_key = f"{COMPACTED_PREFIX}/{table_name}/{date}/{compaction_time}.parquet"
+
+    s3 = get_client("s3")
+
+    s3.put_object(
+        Bucket=bucket_name,
+        Key=compacted_key,
+        Body=df.to_parquet(index=False, row_group_size=ROW_GROUP_SIZE),
+    )
+
+    manifest["days"][date] = {"key": compacted_key, "sources": sources}
+    put_compaction_manifest(table_name, bucket_name, manifest)
+
+    logger.info(
+        f"{len(sources)} {table_name} files for {date} compacted into {compacted_key}"
+    )
+
+    return compacted_key
+
+
+def lambda_handler(event, context):
+    """Compacts and snapshots every table in the ingestion bucket for one day.
+
+    Args:
+        event (dict): may contain `date` (`YYYY-MM-DD`, defaults to yesterday) and `tables`
+        (defaults to every ingested table).
+
+    Returns:
+        compacted_keys (list): keys of the compacted files written.
+    """
+
+    date = event.get("date")
+
+    if date is None:
+        date = str((datetime.utcnow() - timedelta(days=1)).date())
+
+    from src.utils.get_table_as_of import create_table_snapshot
+
+    bucket_name = get_bucket_name("ingestion")
+    compacted_keys = []
+
+    for table_name in event.get("tables", TABLES):
+        if table_name not in TABLES:
+            continue
+
+        compacted_key = compact_table_day(table_name, bucket_name, date)
+
+        if compacted_key is not None:
+            compacted_keys.append(compacted_key)
+
+        create_table_snapshot(table_name, bucket_name, f"{date} 23:59:59.999999")
+
+    return compacted_keys
+
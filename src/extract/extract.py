@@ -5,10 +5,10 @@ retrieve_data_from_table() and retrieve_data_from_totesys()"""
 from datetime import datetime
 import json
 import logging
-import boto3
 import pg8000
 
-from src.utils.get_secret_dict import get_secret_dict
+from src.utils.config_provider import load_parameter, put_parameter
+from src.utils.connection_manager import get_totesys_connection
 
 
 logger = logging.getLogger("MyLogger")
@@ -27,7 +27,8 @@ def create_current_timestamp():
 
 
 def get_timestamp(parameter_name):
-    """Retrieves a timestamp from AWS System Manager's Parameter Store.
+    """Retrieves a timestamp from AWS System Manager's Parameter Store, cached by the
+    configuration provider.
 
     Args:
         parameter_name (str): name of the parameter in AWS.
@@ -35,10 +36,7 @@ def get_timestamp(parameter_name):
     Returns:
         timestamp (str): timestamp in format `YYYY-MM-DD HH:MM:SS.000000`
     """
-    ssm_client = boto3.client("ssm", region_name="eu-west-2")
-
-    parameter = ssm_client.get_parameter(Name=parameter_name)
-    timestamp = parameter["Parameter"]["Value"]
+    timestamp = load_parameter(parameter_name)
     logger.info(f"Timestamp retrieved - {parameter_name}: {timestamp}")
     return timestamp
 
@@ -50,24 +48,21 @@ def update_timestamp(parameter_name, value):
         parameter_name (str): name of the parameter in AWS.
         value (str): the value of the paremeter to be saved.
     """
-    ssm_client = boto3.client("ssm", region_name="eu-west-2")
-
-    ssm_client.put_parameter(
-        Name=parameter_name, Type="String", Value=value, Overwrite=True
-    )
+    put_parameter(parameter_name, value)
     logger.info(f"{parameter_name} updated to {value}")
 
 
 def connect_to_totesys():
-    """Retrieves database credentials from AWS Secrets Manager and creates pg8000 connection to totesys database.
+    """Gets a pg8000 connection to totesys database from the connection manager.
+
+    The connection is kept open between warm invocations and only recreated, with database
+    credentials from AWS Secrets Manager, if it fails its liveness check.
 
     Returns:
         class: Connection to the totesys database.
     """
 
-    db_dict = get_secret_dict("db_credentials")
-
-    conn = pg8000.connect(**db_dict)
+    conn = get_totesys_connection()
     logger.info("Connected to totesys")
     return conn
 
@@ -11,6 +11,7 @@ from src.extract.extract import (
 )
 from src.extract.sql_to_list_of_dicts import sql_to_list_of_dicts
 from src.extract.parquet_file_maker import parquet_file_maker
+from src.utils.config_provider import prefetch_config
 
 logger = logging.getLogger("MyLogger")
 logger.setLevel(logging.INFO)
@@ -30,6 +31,8 @@ def lambda_handler(event, context):
         KeyError: Raises if an error in the extraction functions
 
     """
+    prefetch_config(buckets=["ingestion"], secrets=["db_credentials"])
+
     try:
         current_timestamp = create_current_timestamp()
         last_ingested_timestamp = get_timestamp("last_ingested_timestamp")
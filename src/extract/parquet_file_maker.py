@@ -1,8 +1,8 @@
 """This module contains the definition for `parquet_file_maker()`"""
 
 import logging
-import pandas as pd
-import boto3
+
+from src.utils.client_factory import get_client
 
 
 def parquet_file_maker(data):
@@ -22,6 +22,8 @@ def parquet_file_maker(data):
                         ]
                     }
 
+    The new file is also recorded in the file catalog.
+
     Return:
         Message that cofirms parquet file has
         been created and stored successfully.
@@ -61,16 +63,26 @@ def parquet_file_maker(data):
     table_name = dict_keys[1]
     data_to_write = data[table_name]
 
-    s3_client = boto3.client("s3")
+    s3_client = get_client("s3")
+
+    # pandas is only imported once a table has new rows to write.
+    import pandas as pd
+
+    from src.utils.file_catalog import update_catalog
 
     df = pd.DataFrame.from_records(data_to_write)
 
     parquet_file = pd.DataFrame.to_parquet(df)
 
+    bucket_name = "totesys-etl-ingestion-bucket-teamness-120224"
+    file_path = f"{table_name}/{date}/{time}.parquet"
+
     s3_client.put_object(
         Body=parquet_file,
-        Bucket="totesys-etl-ingestion-bucket-teamness-120224",
-        Key=f"{table_name}/{date}/{time}.parquet",
+        Bucket=bucket_name,
+        Key=file_path,
     )
 
+    update_catalog(df, file_path, bucket_name)
+
     logger.info(f"{table_name}/{date}/{time}.parquet successfully created.")
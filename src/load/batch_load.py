@@ -0,0 +1,246 @@
+"""This module contains the definitions for `get_pending_files()`,
+`load_table_files()`, `batch_load()` and the batch load `lambda_handler()`.
+
+The batch load loads every processed file not yet in the load ledger in one
+invocation. Tables are loaded in star schema dependency order, so a fact row
+is never loaded before the dimension rows it references, and tables that do
+not depend on each other are loaded in parallel. Each table's files are
+loaded in one transaction, in key (and so run) order.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, timedelta
+from graphlib import TopologicalSorter
+import logging
+
+from src.load.load import load_table
+from src.load.load_ledger import claim_load, get_last_loaded_key, get_loaded_files
+from src.utils.client_factory import get_client
+from src.utils.config_provider import prefetch_config
+from src.utils.connection_manager import get_warehouse_engine
+from src.utils.get_bucket_name import get_bucket_name
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+# Days before a table's latest loaded file that are listed again for files that arrived late.
+LOOKBACK_DAYS = 1
+
+# The dimension tables each processed table references.
+TABLE_DEPENDENCIES = {
+    "dim_counterparty": [],
+    "dim_currency": [],
+    "dim_design": [],
+    "dim_location": [],
+    "dim_payment_type": [],
+    "dim_staff": [],
+    "dim_transaction": [],
+    "fact_payment": [
+        "dim_counterparty",
+        "dim_currency",
+        "dim_payment_type",
+        "dim_transaction",
+    ],
+    "fact_purchase_order": [
+        "dim_counterparty",
+        "dim_currency",
+        "dim_location",
+        "dim_staff",
+    ],
+    "fact_sales_order": [
+        "dim_counterparty",
+        "dim_currency",
+        "dim_design",
+        "dim_location",
+        "dim_staff",
+    ],
+}
+
+
+def get_pending_files(bucket_name, connection, prefix="", lookback_days=LOOKBACK_DAYS):
+    """A function to list the processed files that are not in the load ledger.
+
+    Each table is listed from `lookback_days` before the date of its latest loaded file, and only
+    that key range of the ledger is read, so the cost follows the recent files rather than the
+    table's history. Files can be written and loaded out of order, so the lookback catches files
+    that arrived after later ones were loaded. Older gaps need a full scan.
+
+    Args:
+        bucket_name (str): name of the processed bucket.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+        prefix (str, optional): only list keys starting with this, e.g. `fact_sales_order/`.
+        lookback_days (int, optional): days before each table's latest loaded file to list.
+        None lists every file. Defaults to `LOOKBACK_DAYS`.
+
+    Returns:
+        pending_files (dict): ETags of the pending files by key, in key order.
+    """
+
+    paginator = get_client("s3").get_paginator("list_objects_v2")
+    pending_files = {}
+
+    for table_name in TABLE_DEPENDENCIES:
+        table_prefix = f"{table_name}/"
+
+        if not (table_prefix.startswith(prefix) or prefix.startswith(table_prefix)):
+            continue
+
+        start_after = None
+        last_loaded_key = get_last_loaded_key(connection, table_name)
+
+        if last_loaded_key is not None and lookback_days is not None:
+            last_loaded_date = date.fromisoformat(last_loaded_key.split("/")[1])
+            start_after = (
+                f"{table_prefix}{last_loaded_date - timedelta(days=lookback_days)}/"
+            )
+
+        loaded_files = set(get_loaded_files(connection, table_name, start_after))
+        list_args = {"Bucket": bucket_name, "Prefix": max(prefix, table_prefix, key=len)}
+
+        if start_after is not None:
+            list_args["StartAfter"] = start_after
+
+        for page in paginator.paginate(**list_args):
+            for s3_object in page.get("Contents", []):
+                key, etag = s3_object["Key"], s3_object["ETag"].strip('"')
+
+                if (key, etag) not in loaded_files:
+                    pending_files[key] = etag
+
+    return dict(sorted(pending_files.items()))
+
+
+def load_table_files(table_name, files, bucket_name):
+    """A function to load one table's files in a single transaction with `load_table()`.
+
+    Files already in the load ledger, e.g. loaded by a concurrent invocation, are skipped. The
+    other files are claimed and read before loading, so index maintenance is decided on the
+    table's total rows.
+
+    Args:
+        table_name (str): name of the warehouse table, e.g. `fact_sales_order`.
+        files (dict): ETags of the table's files by key, in the order to load them.
+        bucket_name (str): name of the processed bucket.
+
+    Returns:
+        loaded_keys (list): keys of the files loaded.
+    """
+
+    from src.utils.parquet_file_reader import parquet_row_group_reader
+
+    with get_warehouse_engine().connect() as connection:
+        connection.begin()
+
+        try:
+            parquet_files = {}
+
+            for key, etag in files.items():
+                if not claim_load(key, etag, table_name, connection):
+                    logger.info(f"{key} already loaded - skipping.")
+                    continue
+
+                parquet_files[key] = parquet_row_group_reader(key, bucket_name)
+
+            load_table(list(parquet_files.values()), table_name, connection)
+
+        except Exception:
+            connection.rollback()
+            logger.error(f"{table_name} load failed - rolled back.")
+            raise
+
+    logger.info(f"{len(parquet_files)} files loaded to {table_name}")
+
+    return list(parquet_files)
+
+
+def batch_load(files, bucket_name, max_workers=4):
+    """A function to load processed files table by table in dependency order.
+
+    Tables whose dependencies are loaded are loaded together on a thread pool. If a table fails,
+    the tables already started finish, no further tables are started and the error is raised.
+
+    Args:
+        files (dict): ETags of the files to load by key.
+        bucket_name (str): name of the processed bucket.
+        max_workers (int, optional): the number of tables to load at once. Defaults to 4.
+
+    Returns:
+        loaded_keys (list): keys of the files loaded.
+    """
+
+    files_by_table = {}
+
+    for key, etag in sorted(files.items()):
+        files_by_table.setdefault(key.split("/")[0], {})[key] = etag
+
+    # Dependencies with no pending files are already loaded.
+    sorter = TopologicalSorter(
+        {
+            table_name: [
+                dependency
+                for dependency in TABLE_DEPENDENCIES.get(table_name, [])
+                if dependency in files_by_table
+            ]
+            for table_name in files_by_table
+        }
+    )
+    sorter.prepare()
+
+    loaded_keys = []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        while sorter.is_active():
+            table_names = sorted(sorter.get_ready())
+
+            logger.info(f"Loading {table_names}")
+
+            futures = {
+                table_name: executor.submit(
+                    load_table_files, table_name, files_by_table[table_name], bucket_name
+                )
+                for table_name in table_names
+            }
+
+            for table_name, future in futures.items():
+                loaded_keys.extend(future.result())
+
+            sorter.done(*table_names)
+
+    return loaded_keys
+
+
+def lambda_handler(event, context):
+    """Loads every pending processed file in one invocation.
+
+    Args:
+        event (dict): may contain `keys` (a list of processed bucket keys to load, if pending),
+        `prefix` (only load keys starting with it), `lookback_days` (null to list every file)
+        and `max_workers`.
+
+    Returns:
+        loaded_keys (list): keys of the files loaded.
+    """
+
+    prefetch_config(buckets=["processed"], secrets=["dw_credentials"])
+
+    bucket_name = get_bucket_name("processed")
+
+    with get_warehouse_engine().begin() as connection:
+        pending_files = get_pending_files(
+            bucket_name,
+            connection,
+            event.get("prefix", ""),
+            event.get("lookback_days", LOOKBACK_DAYS),
+        )
+
+    if "keys" in event:
+        keys = {key.replace("%3A", ":") for key in event["keys"]}
+        pending_files = {
+            key: etag for key, etag in pending_files.items() if key in keys
+        }
+
+    logger.info(f"Batch loading {len(pending_files)} files")
+
+    return batch_load(
+        pending_files, bucket_name, max_workers=event.get("max_workers", 4)
+    )
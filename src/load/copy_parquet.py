@@ -0,0 +1,78 @@
+"""This module contains the definitions for `iter_copy_data()` and
+`copy_parquet()`.
+
+`copy_parquet()` bulk loads a parquet file with `COPY ... FROM STDIN`, which
+Postgres parses server side in one statement, instead of the parameterised
+INSERTs issued by `DataFrame.to_sql()`. The file is read one row group at a
+time and each batch of rows is encoded as CSV by pyarrow, so the whole file is
+never held as a data frame.
+"""
+
+import io
+import logging
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+COPY_BATCH_SIZE = 64_000
+
+
+def iter_copy_data(parquet_file, batch_size=COPY_BATCH_SIZE):
+    """A function to encode the rows of a parquet file as CSV COPY data, one batch at a time.
+
+    Nulls are written unquoted and empty strings quoted, which is how Postgres tells them apart
+    in CSV format.
+
+    Args:
+        parquet_file (pyarrow parquet file): the file to encode.
+        batch_size (int, optional): the maximum number of rows per batch. Batches never span
+        row groups.
+
+    Yields:
+        copy_data (bytes): the CSV rows of one batch, without a header.
+    """
+
+    import pyarrow.csv as pv
+
+    write_options = pv.WriteOptions(include_header=False)
+
+    for row_group in range(parquet_file.num_row_groups):
+        for batch in parquet_file.iter_batches(
+            batch_size=batch_size, row_groups=[row_group]
+        ):
+            buffer = io.BytesIO()
+            pv.write_csv(batch, buffer, write_options)
+            yield buffer.getvalue()
+
+
+def copy_parquet(parquet_file, table_name, connection, batch_size=COPY_BATCH_SIZE):
+    """A function to bulk load a parquet file into a table with `COPY ... FROM STDIN`.
+
+    Args:
+        parquet_file (pyarrow parquet file): the file to load, e.g. from `parquet_row_group_reader()`.
+        table_name (str): name of the table to load into, e.g. `fact_sales_order`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse using the
+        pg8000 driver. The caller commits.
+        batch_size (int, optional): the maximum number of rows encoded at a time.
+
+    Returns:
+        rows (int): the number of rows loaded.
+    """
+
+    columns = ", ".join(parquet_file.schema_arrow.names)
+
+    cursor = connection.connection.cursor()
+
+    try:
+        cursor.execute(
+            f"COPY {table_name} ({columns}) FROM STDIN WITH (FORMAT csv)",
+            stream=iter_copy_data(parquet_file, batch_size),
+        )
+    finally:
+        cursor.close()
+
+    rows = parquet_file.metadata.num_rows
+
+    logger.info(f"{table_name}: {rows} rows copied")
+
+    return rows
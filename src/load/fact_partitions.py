@@ -0,0 +1,405 @@
+"""This module contains the definitions for `get_partition_name()`,
+`get_month_bounds()`, `get_file_months()`, `count_null_dates()`,
+`is_partitioned()`, `get_partitions()`, `get_partition_rows()`,
+`create_partition()`, `create_default_partition()`, `swap_partition()` and
+`load_partitioned()`.
+
+The fact tables are Postgres range partitioned by `created_date`, one
+partition per month named `<table name>_<YYYY>_<MM>`, so queries on a date
+range only scan the months in it. Partitions are created as files for new
+months arrive. Bulk loads, e.g. backfills, are built in a standalone table
+with no indexes, which is then attached as the month's partition, so the
+partition's indexes are built once over the loaded rows instead of being
+updated row by row.
+
+Swapping a month that already has a partition copies its existing rows into
+the new table too, so it is only done when the month gets at least as many
+new rows as it already has; otherwise the rows are inserted. Rows with no
+`created_date` belong to no month and are loaded into the table's default
+partition, `<table name>_default`, created when first needed.
+"""
+
+import datetime
+import logging
+import os
+
+from src.load.copy_parquet import copy_parquet
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+# The column each partitioned fact table is partitioned on.
+PARTITIONED_TABLES = {
+    "fact_payment": "created_date",
+    "fact_purchase_order": "created_date",
+    "fact_sales_order": "created_date",
+}
+
+DEFAULT_PARTITION_SWAP_MIN_ROWS = 100_000
+
+
+def get_partition_swap_min_rows():
+    """Returns the number of rows for a month from which it is loaded by partition swap."""
+
+    return int(
+        os.environ.get("PARTITION_SWAP_MIN_ROWS", DEFAULT_PARTITION_SWAP_MIN_ROWS)
+    )
+
+
+def get_partition_name(table_name, month):
+    """Returns the name of a table's partition for a month, e.g. `fact_sales_order_2024_02`."""
+
+    return f"{table_name}_{month:%Y_%m}"
+
+
+def get_month_bounds(month):
+    """Returns the first day of a month and of the month after it, the month's partition bounds."""
+
+    start = month.replace(day=1)
+    end = (start + datetime.timedelta(days=32)).replace(day=1)
+
+    return start, end
+
+
+def get_file_months(parquet_file, column):
+    """A function to find the months a parquet file has rows for, from its row group statistics.
+
+    Every month from the earliest to the latest date is returned, so a file spanning a gap may
+    return months with no rows. If a row group has no statistics, the column is read instead.
+
+    Args:
+        parquet_file (pyarrow parquet file): the file, e.g. from `parquet_row_group_reader()`.
+        column (str): the date column, e.g. `created_date`.
+
+    Returns:
+        months (list): the first day of each month, in order.
+    """
+
+    column_index = parquet_file.schema_arrow.get_field_index(column)
+    dates = []
+
+    for row_group in range(parquet_file.num_row_groups):
+        statistics = (
+            parquet_file.metadata.row_group(row_group).column(column_index).statistics
+        )
+
+        if statistics is None or not statistics.has_min_max:
+            dates = [
+                date
+                for date in parquet_file.read(columns=[column]).column(0).to_pylist()
+                if date is not None
+            ]
+            break
+
+        dates.extend([statistics.min, statistics.max])
+
+    if not dates:
+        return []
+
+    months = []
+    month, last_month = min(dates).replace(day=1), max(dates).replace(day=1)
+
+    while month <= last_month:
+        months.append(month)
+        month = get_month_bounds(month)[1]
+
+    return months
+
+
+def count_null_dates(parquet_file, column):
+    """A function to count the rows of a parquet file with no date, from its row group statistics.
+
+    If a row group has no statistics, the column is read instead.
+
+    Args:
+        parquet_file (pyarrow parquet file): the file, e.g. from `parquet_row_group_reader()`.
+        column (str): the date column, e.g. `created_date`.
+
+    Returns:
+        null_count (int): the number of rows with a null date.
+    """
+
+    column_index = parquet_file.schema_arrow.get_field_index(column)
+    null_count = 0
+
+    for row_group in range(parquet_file.num_row_groups):
+        statistics = (
+            parquet_file.metadata.row_group(row_group).column(column_index).statistics
+        )
+
+        if statistics is None or not statistics.has_null_count:
+            return parquet_file.read(columns=[column]).column(0).null_count
+
+        null_count += statistics.null_count
+
+    return null_count
+
+
+def is_partitioned(table_name, connection):
+    """Returns whether a table is a Postgres partitioned table."""
+
+    from sqlalchemy import text
+
+    result = connection.execute(
+        text(
+            "SELECT count(*) FROM pg_partitioned_table"
+            " WHERE partrelid = to_regclass(:table_name)"
+        ),
+        {"table_name": table_name},
+    )
+
+    return bool(result.scalar())
+
+
+def get_partitions(table_name, connection):
+    """Returns the names of a partitioned table's partitions."""
+
+    from sqlalchemy import text
+
+    result = connection.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits"
+            " JOIN pg_class child ON child.oid = pg_inherits.inhrelid"
+            " WHERE pg_inherits.inhparent = to_regclass(:table_name)"
+        ),
+        {"table_name": table_name},
+    )
+
+    return {row[0] for row in result}
+
+
+def get_partition_rows(partition_name, connection):
+    """Returns the number of rows in a partition, from the planner statistics if it has been analyzed."""
+
+    from sqlalchemy import text
+
+    estimate = connection.execute(
+        text("SELECT reltuples FROM pg_class WHERE oid = to_regclass(:partition_name)"),
+        {"partition_name": partition_name},
+    ).scalar()
+
+    if estimate is not None and estimate >= 0:
+        return int(estimate)
+
+    return connection.execute(text(f"SELECT count(*) FROM {partition_name}")).scalar()
+
+
+def create_partition(table_name, month, connection):
+    """A function to create a table's empty partition for a month.
+
+    Args:
+        table_name (str): name of the partitioned table, e.g. `fact_sales_order`.
+        month (date): the first day of the month.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+    """
+
+    from sqlalchemy import text
+
+    start, end = get_month_bounds(month)
+    partition_name = get_partition_name(table_name, month)
+
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {partition_name} PARTITION OF {table_name}"
+            f" FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    )
+
+    logger.info(f"{partition_name} created")
+
+
+def create_default_partition(table_name, connection):
+    """A function to create a table's default partition, for rows with no partition date.
+
+    Args:
+        table_name (str): name of the partitioned table, e.g. `fact_sales_order`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+    """
+
+    from sqlalchemy import text
+
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {table_name}_default"
+            f" PARTITION OF {table_name} DEFAULT"
+        )
+    )
+
+    logger.info(f"{table_name}_default created")
+
+
+def swap_partition(table_name, month, source_table, connection, replace=False):
+    """A function to build a month's partition from a source table and attach it.
+
+    The month's rows are copied into a new table with no indexes, which is given a check
+    constraint matching the partition bounds so attaching it does not scan it again. If the month
+    already has a partition, its rows are copied in first and it is detached and dropped, so the
+    whole month is rewritten. The caller commits, so readers see the old partition until the new
+    one is attached.
+
+    Args:
+        table_name (str): name of the partitioned table, e.g. `fact_sales_order`.
+        month (date): the first day of the month.
+        source_table (str): a table with the new rows, e.g. a staging table.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+        replace (bool, optional): whether the month already has a partition. Defaults to False.
+
+    Returns:
+        rows (int): the number of new rows loaded.
+    """
+
+    from sqlalchemy import text
+
+    column = PARTITIONED_TABLES[table_name]
+    start, end = get_month_bounds(month)
+    partition_name = get_partition_name(table_name, month)
+    load_table = f"{partition_name}_load"
+    month_range = f"{column} >= '{start}' AND {column} < '{end}'"
+
+    connection.execute(
+        text(
+            f"CREATE TABLE {load_table}"
+            f" (LIKE {table_name} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)"
+        )
+    )
+
+    if replace:
+        connection.execute(
+            text(f"INSERT INTO {load_table} SELECT * FROM {partition_name}")
+        )
+
+    rows = connection.execute(
+        text(
+            f"INSERT INTO {load_table} SELECT * FROM {source_table} WHERE {month_range}"
+        )
+    ).rowcount
+
+    connection.execute(
+        text(
+            f"ALTER TABLE {load_table} ADD CONSTRAINT {load_table}_bounds"
+            f" CHECK ({column} IS NOT NULL AND {month_range})"
+        )
+    )
+
+    if replace:
+        connection.execute(
+            text(f"ALTER TABLE {table_name} DETACH PARTITION {partition_name}")
+        )
+        connection.execute(text(f"DROP TABLE {partition_name}"))
+
+    connection.execute(text(f"ALTER TABLE {load_table} RENAME TO {partition_name}"))
+    connection.execute(
+        text(
+            f"ALTER TABLE {table_name} ATTACH PARTITION {partition_name}"
+            f" FOR VALUES FROM ('{start}') TO ('{end}')"
+        )
+    )
+    connection.execute(
+        text(f"ALTER TABLE {partition_name} DROP CONSTRAINT {load_table}_bounds")
+    )
+
+    logger.info(f"{partition_name}: {rows} rows loaded by partition swap")
+
+    return rows
+
+
+def load_partitioned(parquet_file, table_name, connection):
+    """A function to load a fact table file into the table's monthly partitions.
+
+    Files with fewer than `PARTITION_SWAP_MIN_ROWS` rows (default 100,000) are copied straight
+    into the table after any missing partitions are created. Larger files are copied into a
+    temporary staging table. Each month with no partition yet is then built with
+    `swap_partition()`. A month with a partition is only rebuilt if it has at least
+    `PARTITION_SWAP_MIN_ROWS` new rows and at least as many as the partition already holds, as
+    its existing rows are copied too; the other months are inserted into the table. Rows with
+    no date are inserted into the default partition. Tables that are not partitioned are copied
+    into as before. The caller commits.
+
+    Args:
+        parquet_file (pyarrow parquet file): the rows to load, e.g. from `parquet_row_group_reader()`.
+        table_name (str): name of the fact table, e.g. `fact_sales_order`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+
+    Returns:
+        rows (int): the number of rows loaded.
+    """
+
+    from sqlalchemy import text
+
+    if not is_partitioned(table_name, connection):
+        logger.warning(f"{table_name} is not partitioned - copying into the table.")
+        return copy_parquet(parquet_file, table_name, connection)
+
+    column = PARTITIONED_TABLES[table_name]
+    partitions = get_partitions(table_name, connection)
+    swap_min_rows = get_partition_swap_min_rows()
+
+    if parquet_file.metadata.num_rows < swap_min_rows:
+        for month in get_file_months(parquet_file, column):
+            if get_partition_name(table_name, month) not in partitions:
+                create_partition(table_name, month, connection)
+
+        if f"{table_name}_default" not in partitions and count_null_dates(parquet_file, column):
+            create_default_partition(table_name, connection)
+
+        return copy_parquet(parquet_file, table_name, connection)
+
+    staging_table = f"staging_{table_name}"
+
+    connection.execute(
+        text(
+            f"CREATE TEMPORARY TABLE {staging_table}"
+            f" (LIKE {table_name} INCLUDING DEFAULTS)"
+        )
+    )
+    copy_parquet(parquet_file, staging_table, connection)
+
+    month_rows = connection.execute(
+        text(
+            f"SELECT date_trunc('month', {column})::date, count(*)"
+            f" FROM {staging_table} GROUP BY 1 ORDER BY 1"
+        )
+    ).fetchall()
+
+    rows = 0
+
+    for month, count in month_rows:
+        if month is None:
+            if f"{table_name}_default" not in partitions:
+                create_default_partition(table_name, connection)
+
+            rows += connection.execute(
+                text(
+                    f"INSERT INTO {table_name} SELECT * FROM {staging_table}"
+                    f" WHERE {column} IS NULL"
+                )
+            ).rowcount
+            logger.warning(
+                f"{table_name}: {count} rows with no {column} loaded into {table_name}_default"
+            )
+            continue
+
+        partition_name = get_partition_name(table_name, month)
+        exists = partition_name in partitions
+
+        if not exists or (
+            count >= swap_min_rows
+            and count >= get_partition_rows(partition_name, connection)
+        ):
+            rows += swap_partition(
+                table_name, month, staging_table, connection, replace=exists
+            )
+        else:
+            start, end = get_month_bounds(month)
+            rows += connection.execute(
+                text(
+                    f"INSERT INTO {table_name} SELECT * FROM {staging_table}"
+                    f" WHERE {column} >= '{start}' AND {column} < '{end}'"
+                )
+            ).rowcount
+
+    connection.execute(text(f"DROP TABLE {staging_table}"))
+
+    logger.info(f"{table_name}: {rows} rows loaded into {len(month_rows)} months")
+
+    return rows
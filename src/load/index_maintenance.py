@@ -0,0 +1,172 @@
+"""This module contains the definitions for `timed()`, `get_secondary_indexes()`,
+`drop_indexes()`, `create_indexes()`, `analyze_table()` and
+`log_load_timings()`.
+
+Bulk loads of `INDEX_REBUILD_MIN_ROWS` rows or more (default 500,000) drop a
+table's secondary indexes before loading and recreate them afterwards, so each
+index is built once over the loaded table instead of being updated row by row.
+Primary key, unique and constraint indexes are kept, as upserts and
+constraints rely on them, and partitioned tables are left to the partition
+swap. Indexes are recreated in the load's transaction, or, with
+`BUILD_INDEXES_CONCURRENTLY=true`, with `CREATE INDEX CONCURRENTLY` after the
+load commits, so the table is not locked against writes while they build.
+Loads of `ANALYZE_MIN_ROWS` rows or more (default 10,000) are followed by
+`ANALYZE`, so the planner sees the new rows without waiting for autovacuum.
+"""
+
+from contextlib import contextmanager
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+DEFAULT_INDEX_REBUILD_MIN_ROWS = 500_000
+DEFAULT_ANALYZE_MIN_ROWS = 10_000
+
+
+def get_index_rebuild_min_rows():
+    """Returns the number of rows from which a load drops and recreates secondary indexes."""
+
+    return int(os.environ.get("INDEX_REBUILD_MIN_ROWS", DEFAULT_INDEX_REBUILD_MIN_ROWS))
+
+
+def get_analyze_min_rows():
+    """Returns the number of rows from which a load is followed by `ANALYZE`."""
+
+    return int(os.environ.get("ANALYZE_MIN_ROWS", DEFAULT_ANALYZE_MIN_ROWS))
+
+
+def build_indexes_concurrently():
+    """Returns whether dropped indexes are recreated concurrently after the load commits."""
+
+    return os.environ.get("BUILD_INDEXES_CONCURRENTLY", "false").lower() == "true"
+
+
+@contextmanager
+def timed(timings, step):
+    """Records the run time in seconds of the block in `timings[step]`."""
+
+    start = time.perf_counter()
+
+    try:
+        yield
+    finally:
+        timings[step] = round(time.perf_counter() - start, 3)
+
+
+def get_secondary_indexes(table_name, connection):
+    """A function to find the indexes of a table that a bulk load can drop and recreate.
+
+    Args:
+        table_name (str): name of the table, e.g. `fact_sales_order`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+
+    Returns:
+        indexes (dict): the `CREATE INDEX` statement of each index by index name. Empty for
+        partitioned tables and databases other than Postgres.
+    """
+
+    if connection.dialect.name != "postgresql":
+        return {}
+
+    from sqlalchemy import text
+
+    result = connection.execute(
+        text(
+            "SELECT index_class.relname, pg_get_indexdef(pg_index.indexrelid)"
+            " FROM pg_index"
+            " JOIN pg_class index_class ON index_class.oid = pg_index.indexrelid"
+            " JOIN pg_class table_class ON table_class.oid = pg_index.indrelid"
+            " WHERE pg_index.indrelid = to_regclass(:table_name)"
+            " AND table_class.relkind = 'r'"
+            " AND NOT pg_index.indisprimary"
+            " AND NOT pg_index.indisunique"
+            " AND NOT EXISTS"
+            " (SELECT 1 FROM pg_constraint WHERE pg_constraint.conindid = pg_index.indexrelid)"
+            " ORDER BY index_class.relname"
+        ),
+        {"table_name": table_name},
+    )
+
+    return {index_name: definition for index_name, definition in result}
+
+
+def drop_indexes(table_name, connection):
+    """A function to drop a table's secondary indexes before a bulk load.
+
+    The drop is part of the caller's transaction, so if the load is rolled back the indexes are
+    restored with it.
+
+    Args:
+        table_name (str): name of the table, e.g. `fact_sales_order`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+
+    Returns:
+        indexes (dict): the `CREATE INDEX` statement of each dropped index by index name.
+    """
+
+    from sqlalchemy import text
+
+    indexes = get_secondary_indexes(table_name, connection)
+
+    for index_name in indexes:
+        connection.execute(text(f"DROP INDEX {index_name}"))
+
+    if indexes:
+        logger.info(f"{table_name}: dropped indexes {list(indexes)}")
+
+    return indexes
+
+
+def create_indexes(indexes, connection, concurrently=False):
+    """A function to recreate indexes dropped by `drop_indexes()`.
+
+    Args:
+        indexes (dict): the `CREATE INDEX` statement of each index by index name.
+        connection (connection): an open SQLAlchemy connection to the data warehouse. For
+        `concurrently`, it must not be in a transaction.
+        concurrently (bool, optional): whether to build with `CREATE INDEX CONCURRENTLY`, which
+        does not block writes but cannot run in a transaction. Defaults to False.
+    """
+
+    from sqlalchemy import text
+
+    if concurrently and indexes:
+        connection = connection.execution_options(isolation_level="AUTOCOMMIT")
+
+    for definition in indexes.values():
+        if concurrently:
+            definition = definition.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY", 1)
+
+        connection.execute(text(definition))
+
+    if indexes:
+        logger.info(f"Recreated indexes {list(indexes)}")
+
+
+def analyze_table(table_name, connection):
+    """A function to refresh the planner statistics of a table after a load.
+
+    Args:
+        table_name (str): name of the table, e.g. `fact_sales_order`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+    """
+
+    if connection.dialect.name != "postgresql":
+        return
+
+    from sqlalchemy import text
+
+    connection.execute(text(f"ANALYZE {table_name}"))
+
+
+def log_load_timings(table_name, rows, timings):
+    """Logs the run time in seconds of each step of a table's load as one JSON line."""
+
+    logger.info(
+        f"{table_name} load timings: "
+        + json.dumps({"table_name": table_name, "rows": rows, **timings})
+    )
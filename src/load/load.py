@@ -1,54 +1,179 @@
-"""This file contains the definition for the load `lambda_handler()`.
+"""This file contains the definitions for `get_object_etag()`, `load_file()`,
+`load_table()` and the load `lambda_handler()`.
 """
 
 import io
 import json
 import logging
-import pandas as pd
-import boto3
-from sqlalchemy import create_engine
 
+from src.load.copy_parquet import copy_parquet
+from src.load.fact_partitions import PARTITIONED_TABLES, load_partitioned
+from src.load.index_maintenance import (
+    analyze_table,
+    build_indexes_concurrently,
+    create_indexes,
+    drop_indexes,
+    get_analyze_min_rows,
+    get_index_rebuild_min_rows,
+    log_load_timings,
+    timed,
+)
+from src.load.load_ledger import claim_load
+from src.load.load_scd2 import load_scd2
+from src.load.load_upsert import load_upsert
+from src.utils.add_scd2_columns import SCD2_COLUMNS
+from src.utils.client_factory import get_client
+from src.utils.config_provider import prefetch_config
+from src.utils.connection_manager import get_warehouse_engine
 from src.utils.get_bucket_name import get_bucket_name
-from src.utils.get_secret_dict import get_secret_dict
-from src.utils.parquet_file_reader import parquet_file_reader
 
 logger = logging.getLogger("MyLogger")
 logger.setLevel(logging.INFO)
 
 
+def get_object_etag(event, bucket_name):
+    """A function to get the ETag of the file an S3 event is for.
+
+    Args:
+        event (dict): the S3 event.
+        bucket_name (str): name of the s3 bucket the file is stored in, used to look up the ETag
+        when the event does not carry one.
+
+    Returns:
+        etag (str): the file's ETag, without quotes.
+    """
+
+    s3_object = event["Records"][0]["s3"]["object"]
+    etag = s3_object.get("eTag")
+
+    if etag is None:
+        key = s3_object["key"].replace("%3A", ":")
+        etag = get_client("s3").head_object(Bucket=bucket_name, Key=key)["ETag"]
+
+    return etag.strip('"')
+
+
+def load_file(parquet_file, table_name, connection):
+    """A function to load one processed file into its warehouse table.
+
+    Type 2 dimensions close and insert versions with `load_scd2()`, other dimensions are upserted
+    on their natural key with `load_upsert()`, partitioned facts are loaded into their monthly
+    partitions with `load_partitioned()` and other facts are bulk loaded with `copy_parquet()`.
+    The caller commits.
+
+    Args:
+        parquet_file (pyarrow parquet file): the file, e.g. from `parquet_row_group_reader()`.
+        table_name (str): name of the warehouse table, e.g. `fact_sales_order`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+    """
+
+    if set(SCD2_COLUMNS).issubset(parquet_file.schema_arrow.names):
+        load_scd2(parquet_file, table_name, connection)
+    elif table_name.startswith("dim_"):
+        load_upsert(parquet_file, table_name, connection)
+    # Partitions are Postgres only; other databases, e.g. sqlite in tests, load the table as is.
+    elif table_name in PARTITIONED_TABLES and connection.dialect.name == "postgresql":
+        load_partitioned(parquet_file, table_name, connection)
+    else:
+        copy_parquet(parquet_file, table_name, connection)
+
+
+def load_table(parquet_files, table_name, connection):
+    """A function to load files into a table and commit, deferring index maintenance for bulk loads.
+
+    If the files have `INDEX_REBUILD_MIN_ROWS` rows or more, the table's secondary indexes are
+    dropped before loading and recreated after, and with `ANALYZE_MIN_ROWS` rows or more the
+    table is analyzed after the commit. The run time of each step is logged.
+
+    Args:
+        parquet_files (list): the files to load, in order.
+        table_name (str): name of the warehouse table, e.g. `fact_sales_order`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse, in the
+        transaction to load in. The transaction is committed.
+
+    Returns:
+        timings (dict): the run time in seconds of each step, e.g. `load` and `analyze`.
+    """
+
+    rows = sum(parquet_file.metadata.num_rows for parquet_file in parquet_files)
+    concurrently = build_indexes_concurrently()
+    timings = {}
+    indexes = {}
+
+    if rows >= get_index_rebuild_min_rows():
+        with timed(timings, "drop_indexes"):
+            indexes = drop_indexes(table_name, connection)
+
+    with timed(timings, "load"):
+        for parquet_file in parquet_files:
+            load_file(parquet_file, table_name, connection)
+
+    if indexes and not concurrently:
+        with timed(timings, "create_indexes"):
+            create_indexes(indexes, connection)
+
+    connection.commit()
+
+    if indexes and concurrently:
+        with timed(timings, "create_indexes"):
+            try:
+                create_indexes(indexes, connection, concurrently=True)
+            except Exception:
+                logger.error(
+                    f"{table_name} loaded but its indexes were not rebuilt: {list(indexes.values())}"
+                )
+                raise
+
+    if rows >= get_analyze_min_rows():
+        with timed(timings, "analyze"):
+            analyze_table(table_name, connection)
+            connection.commit()
+
+    log_load_timings(table_name, rows, timings)
+
+    return timings
+
+
 def lambda_handler(event, context):
 
     file_name = event["Records"][0]["s3"]["object"]["key"]
     formatted_file_name = file_name.replace("%3A", ":")
     logger.info(f"File name is {formatted_file_name}!")
 
-    bucket_name = get_bucket_name("processed")
-    df = parquet_file_reader(formatted_file_name, bucket_name)
-    logger.info(f"{formatted_file_name} retrieved from {bucket_name}")
+    if formatted_file_name.startswith("_"):
+        logger.info(f"{formatted_file_name} is not processed table data - skipping.")
+        return
 
-    table_name = formatted_file_name.split("/")[0]
-    logger.info(f"{table_name} data: {df}")
+    prefetch_config(buckets=["processed"], secrets=["dw_credentials"])
 
-    
-    dw_dict = get_secret_dict("dw_credentials")
+    # pyarrow is only imported once there is a file to load.
+    from src.utils.parquet_file_reader import parquet_row_group_reader
 
-    engine = create_engine(
-        f'postgresql+pg8000://{dw_dict["user"]}:{dw_dict["password"]}@{dw_dict["host"]}:{dw_dict["port"]}/{dw_dict["database"]}'
-    )
+    bucket_name = get_bucket_name("processed")
+    table_name = formatted_file_name.split("/")[0]
+    etag = get_object_etag(event, bucket_name)
+    engine = get_warehouse_engine()
 
     with engine.connect() as connection:
 
         connection.begin()
 
         try:
-            df.to_sql(
-                table_name,
-                connection,
-                index=False,
-                if_exists="append",
+            # Recorded in the same transaction as the rows, so a redelivered file is skipped
+            # before it is downloaded.
+            if not claim_load(formatted_file_name, etag, table_name, connection):
+                connection.rollback()
+                logger.info(f"{formatted_file_name} already loaded - skipping.")
+                return
+
+            parquet_file = parquet_row_group_reader(formatted_file_name, bucket_name)
+            logger.info(f"{formatted_file_name} retrieved from {bucket_name}")
+            logger.info(
+                f"{table_name} data: {parquet_file.metadata.num_rows} rows"
+                f" in {parquet_file.num_row_groups} row groups"
             )
 
-            connection.commit()
+            load_table([parquet_file], table_name, connection)
 
         except Exception as e:
             connection.rollback()
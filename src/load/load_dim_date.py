@@ -1,24 +1,120 @@
-import json
-import boto3
+"""This module contains the definitions for `get_dim_date()`,
+`get_loaded_dates()`, `insert_missing_dates()` and `load_dim_date()`.
 
-from sqlalchemy import create_engine
+dim_date is generated once per date range and saved as a typed Parquet
+artifact in the catalog bucket at `dim_date/<start date>_<end date>.parquet`.
+Loads only insert the dates missing from the warehouse, so re-running
+`load_dim_date()` inserts nothing and does not read the artifact.
+"""
+
+import io
+import logging
+
+import pandas as pd
+from sqlalchemy import text
 
 from src.transform.create_dim_date import create_dim_date
+from src.utils.client_factory import get_client
+from src.utils.connection_manager import get_warehouse_engine
+from src.utils.get_bucket_name import BucketNotFoundError, get_bucket_name
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+DIM_DATE_START = "2010-01-01"
+DIM_DATE_END = "2050-12-31"
+
+
+def get_dim_date(start_date, end_date):
+    """A function to retrieve the dim_date artifact for a date range, generating it the first time.
+
+    Args:
+        start_date (str): first date of the range, e.g. `2010-01-01`.
+        end_date (str): last date of the range, e.g. `2050-12-31`.
+
+    Returns:
+        dim_date_df (data frame): one row per date of the range.
+    """
+
+    key = f"dim_date/{start_date}_{end_date}.parquet"
+
+    try:
+        catalog_bucket = get_bucket_name("catalog")
+    except BucketNotFoundError:
+        logger.warning("Catalog bucket not found - dim_date generated without saving.")
+        return create_dim_date(start_date, end_date)
+
+    s3 = get_client("s3")
+
+    try:
+        response = s3.get_object(Bucket=catalog_bucket, Key=key)
+        return pd.read_parquet(io.BytesIO(response["Body"].read()))
+    except s3.exceptions.NoSuchKey:
+        pass
+
+    dim_date_df = create_dim_date(start_date, end_date)
+
+    s3.put_object(Bucket=catalog_bucket, Key=key, Body=dim_date_df.to_parquet(index=False))
+
+    logger.info(f"{key} saved to {catalog_bucket}")
+
+    return dim_date_df
+
 
+def get_loaded_dates(connection):
+    """A function to retrieve the dates already loaded into the dim_date table.
 
-def load_dim_date():
-    """Function to populate dim_date table in data warehouse"""
-    dim_date_df = create_dim_date("2010-01-01", "2050-12-31")
+    Args:
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
 
-    sm = boto3.client("secretsmanager")
+    Returns:
+        dates (series): the `date_id` of each loaded row.
+    """
 
-    dw_secret = sm.get_secret_value(SecretId="dw_credentials")
-    dw_credentials = dw_secret["SecretString"]
-    dw_dict = json.loads(dw_credentials)
+    loaded_df = pd.read_sql(
+        text("SELECT date_id FROM dim_date"), connection, parse_dates=["date_id"]
+    )
 
-    engine = create_engine(
-        f'postgresql+pg8000://{dw_dict["user"]}:{dw_dict["password"]}@{dw_dict["host"]}:{dw_dict["port"]}/{dw_dict["database"]}'
-    )  # noqa
+    return loaded_df["date_id"]
+
+
+def insert_missing_dates(start_date, end_date, connection):
+    """Inserts the dates of a range missing from the dim_date table."""
+
+    dates = pd.date_range(start=start_date, end=end_date, freq="D")
+    loaded_dates = get_loaded_dates(connection)
+
+    if dates.isin(loaded_dates).all():
+        logger.info(f"dim_date already holds {start_date} to {end_date} - skipping.")
+        return 0
+
+    dim_date_df = get_dim_date(start_date, end_date)
+    dim_date_df = dim_date_df[~dim_date_df["date_id"].isin(loaded_dates)]
+
+    dim_date_df.to_sql(name="dim_date", con=connection, index=False, if_exists="append")
+
+    logger.info(f"{len(dim_date_df)} dates inserted into dim_date")
+
+    return len(dim_date_df)
+
+
+def load_dim_date(start_date=DIM_DATE_START, end_date=DIM_DATE_END, connection=None):
+    """Function to populate dim_date table in data warehouse with the dates it is missing.
+
+    Args:
+        start_date (str, optional): first date to load. Defaults to `DIM_DATE_START`.
+        end_date (str, optional): last date to load. Defaults to `DIM_DATE_END`.
+        connection (connection, optional): an open SQLAlchemy connection to the data warehouse.
+        The caller commits. If not passed, one is checked out from `get_warehouse_engine()`.
+
+    Returns:
+        inserted (int): the number of dates inserted.
+    """
+
+    if connection is not None:
+        return insert_missing_dates(start_date, end_date, connection)
+
+    engine = get_warehouse_engine()
 
     with engine.connect() as connection:
 
@@ -26,9 +122,7 @@ def load_dim_date():
 
         try:
 
-            dim_date_df.to_sql(
-                name="dim_date", con=engine, index=False, if_exists="append"
-            )
+            inserted = insert_missing_dates(start_date, end_date, connection)
 
             connection.commit()
 
@@ -43,3 +137,6 @@ def load_dim_date():
         finally:
 
             connection.close()
+
+    return inserted
+
@@ -0,0 +1,141 @@
+"""This module contains the definitions for `create_load_ledger()`,
+`claim_load()`, `get_loaded_files()` and `get_last_loaded_key()`.
+
+The load ledger is a warehouse table recording every processed bucket file
+loaded, by key and ETag. S3 redelivers events and Lambda retries failed
+invocations, so the same file can reach the load lambda more than once. The
+ledger row is written in the same transaction as the file's rows: if the load
+fails both are rolled back, and if it commits a redelivery of the file finds
+the row and is skipped.
+"""
+
+import logging
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+LOAD_LEDGER_TABLE = "load_ledger"
+
+
+def create_load_ledger(connection):
+    """A function to create the load ledger table if it does not exist.
+
+    Args:
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+    """
+
+    from sqlalchemy import text
+
+    connection.execute(
+        text(
+            f"CREATE TABLE IF NOT EXISTS {LOAD_LEDGER_TABLE} ("
+            " object_key VARCHAR NOT NULL,"
+            " etag VARCHAR NOT NULL,"
+            " table_name VARCHAR NOT NULL,"
+            " loaded_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,"
+            " PRIMARY KEY (object_key, etag))"
+        )
+    )
+    connection.execute(
+        text(
+            f"CREATE INDEX IF NOT EXISTS {LOAD_LEDGER_TABLE}_table_key"
+            f" ON {LOAD_LEDGER_TABLE} (table_name, object_key)"
+        )
+    )
+
+
+def claim_load(object_key, etag, table_name, connection):
+    """A function to record a file in the load ledger, unless it is already recorded.
+
+    The check and the write are one `INSERT ... ON CONFLICT DO NOTHING` on the ledger's primary
+    key. A concurrent delivery of the same file waits on the key until this transaction ends,
+    then finds it recorded. The caller loads the file and commits in the same transaction, so
+    the file is only claimed if its rows are loaded.
+
+    Args:
+        object_key (str): key of the file in the processed bucket.
+        etag (str): the file's ETag, so a file rewritten under the same key is loaded again.
+        table_name (str): name of the table the file is loaded into, e.g. `fact_sales_order`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+
+    Returns:
+        claimed (bool): True if the file was recorded, False if it was already loaded.
+    """
+
+    from sqlalchemy import text
+
+    create_load_ledger(connection)
+
+    # `WHERE true` lets sqlite parse the ON CONFLICT clause after a SELECT.
+    claimed = connection.execute(
+        text(
+            f"INSERT INTO {LOAD_LEDGER_TABLE} (object_key, etag, table_name)"
+            " SELECT :object_key, :etag, :table_name WHERE true"
+            " ON CONFLICT (object_key, etag) DO NOTHING"
+        ),
+        {"object_key": object_key, "etag": etag, "table_name": table_name},
+    )
+
+    return bool(claimed.rowcount)
+
+
+def get_loaded_files(connection, table_name=None, start_after=None):
+    """A function to retrieve the files recorded in the load ledger.
+
+    Args:
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+        table_name (str, optional): only files loaded into this table, e.g. `fact_sales_order`.
+        Defaults to every table.
+        start_after (str, optional): only keys after this one. Defaults to every key.
+
+    Returns:
+        loaded_files (list): (object key, ETag) tuples, in key order.
+    """
+
+    from sqlalchemy import text
+
+    create_load_ledger(connection)
+
+    conditions = []
+
+    if table_name is not None:
+        conditions.append("table_name = :table_name")
+
+    if start_after is not None:
+        conditions.append("object_key > :start_after")
+
+    where_clause = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+
+    result = connection.execute(
+        text(
+            f"SELECT object_key, etag FROM {LOAD_LEDGER_TABLE}{where_clause}"
+            " ORDER BY object_key, etag"
+        ),
+        {"table_name": table_name, "start_after": start_after},
+    )
+
+    return [tuple(row) for row in result]
+
+
+def get_last_loaded_key(connection, table_name):
+    """A function to retrieve the latest key loaded into a table.
+
+    Args:
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+        table_name (str): name of the table, e.g. `fact_sales_order`.
+
+    Returns:
+        object_key (str): the greatest key recorded for the table, or None if none is recorded.
+    """
+
+    from sqlalchemy import text
+
+    create_load_ledger(connection)
+
+    return connection.execute(
+        text(
+            f"SELECT MAX(object_key) FROM {LOAD_LEDGER_TABLE}"
+            " WHERE table_name = :table_name"
+        ),
+        {"table_name": table_name},
+    ).scalar()
@@ -0,0 +1,115 @@
+"""This module contains the definition for `load_scd2()`.
+
+Type 2 dimensions keep a row per version of each key, so the natural key,
+e.g. `staff_id`, is not unique and cannot be the table's primary key. The
+warehouse tables need a surrogate primary key, which the load leaves to its
+default, and at most one current version per key, e.g.
+
+    CREATE TABLE dim_staff (
+        staff_record_id SERIAL PRIMARY KEY,
+        staff_id INT NOT NULL,
+        ...
+        valid_from TIMESTAMP NOT NULL,
+        valid_to TIMESTAMP,
+        is_current BOOLEAN NOT NULL DEFAULT TRUE
+    );
+    CREATE UNIQUE INDEX dim_staff_current ON dim_staff (staff_id) WHERE is_current;
+
+and the same for `dim_counterparty` on `counterparty_id`. Fact rows hold the
+natural key, so queries joining facts to these dimensions must filter on
+`is_current`, or on `valid_from` and `valid_to` for the version at the
+fact's date, or they return a row per version.
+"""
+
+import logging
+
+from src.load.staging_table import staging_table
+from src.utils.add_scd2_columns import SCD2_COLUMNS
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+
+def load_scd2(parquet_file, table_name, connection):
+    """A function to apply new versions of dimension rows to a type 2 slowly changing dimension table.
+
+    The rows are copied into a temporary staging table with the table's column types. Then, in
+    set-based statements, the current versions of the same keys are closed and the new versions
+    inserted. Files can be loaded out of order: a version older than the current one is inserted
+    already closed, with `valid_to` set to the next version's `valid_from`, and the version before
+    it is closed at its `valid_from`. The caller commits.
+
+    Args:
+        parquet_file (pyarrow parquet file): the new versions, with `valid_from`, `valid_to` and
+        `is_current` columns, e.g. from `parquet_row_group_reader()`.
+        table_name (str): name of the dimension table, e.g. `dim_staff`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+
+    Raises:
+        ValueError if the rows have no SCD2 columns or no natural key column.
+    """
+
+    columns = parquet_file.schema_arrow.names
+
+    if not set(SCD2_COLUMNS).issubset(columns):
+        raise ValueError(
+            f"Invalid Input: {table_name} data is missing columns {SCD2_COLUMNS}."
+        )
+
+    from sqlalchemy import text
+
+    from src.utils.file_catalog import get_primary_key
+
+    primary_key = get_primary_key(table_name, columns)
+
+    if primary_key is None:
+        raise ValueError(
+            f"Invalid Input: {table_name} data has no natural key column."
+        )
+
+    column_list = ", ".join(columns)
+
+    with staging_table(parquet_file, table_name, connection) as staging_table_name:
+        # Per-file loads can arrive out of order, so a version only closes versions older than
+        # itself, and a late version is inserted already closed by the next version after it.
+        later_versions = (
+            f"FROM {table_name} AS later WHERE later.{primary_key} = staged.{primary_key}"
+            f" AND later.valid_from > staged.valid_from"
+        )
+        connection.execute(
+            text(
+                f"UPDATE {table_name} SET valid_to = staged.valid_from"
+                f" FROM {staging_table_name} AS staged"
+                f" WHERE {table_name}.{primary_key} = staged.{primary_key}"
+                f" AND NOT {table_name}.is_current"
+                f" AND {table_name}.valid_from < staged.valid_from"
+                f" AND {table_name}.valid_to > staged.valid_from"
+            )
+        )
+        closed = connection.execute(
+            text(
+                f"UPDATE {table_name} SET valid_to = staged.valid_from, is_current = FALSE"
+                f" FROM {staging_table_name} AS staged"
+                f" WHERE {table_name}.{primary_key} = staged.{primary_key}"
+                f" AND {table_name}.is_current"
+                f" AND {table_name}.valid_from < staged.valid_from"
+            )
+        )
+        staged_columns = {
+            "valid_to": f"(SELECT MIN(later.valid_from) {later_versions})",
+            "is_current": f"NOT EXISTS (SELECT 1 {later_versions})",
+        }
+        select_list = ", ".join(
+            staged_columns.get(column, f"staged.{column}") for column in columns
+        )
+        inserted = connection.execute(
+            text(
+                f"INSERT INTO {table_name} ({column_list})"
+                f" SELECT {select_list} FROM {staging_table_name} AS staged"
+            )
+        )
+
+    logger.info(
+        f"{table_name}: {closed.rowcount} versions closed,"
+        f" {inserted.rowcount} versions inserted"
+    )
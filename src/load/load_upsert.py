@@ -0,0 +1,56 @@
+"""This module contains the definition for `load_upsert()`."""
+
+import logging
+
+from src.load.staging_table import staging_table
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+
+def load_upsert(parquet_file, table_name, connection):
+    """A function to insert or update dimension rows keyed on the table's natural key.
+
+    The rows are copied into a temporary staging table with the table's column types, then
+    applied in one set-based `INSERT ... ON CONFLICT DO UPDATE`, so each key has one row in the
+    dimension table. The table needs a primary key or unique constraint on the natural key. The
+    caller commits.
+
+    Args:
+        parquet_file (pyarrow parquet file): the rows to apply, e.g. from `parquet_row_group_reader()`.
+        table_name (str): name of the dimension table, e.g. `dim_currency`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+
+    Raises:
+        ValueError if the rows have no natural key column.
+    """
+
+    from sqlalchemy import text
+
+    from src.utils.file_catalog import get_primary_key
+
+    columns = parquet_file.schema_arrow.names
+    primary_key = get_primary_key(table_name, columns)
+
+    if primary_key is None:
+        raise ValueError(
+            f"Invalid Input: {table_name} data has no natural key column."
+        )
+
+    column_list = ", ".join(columns)
+    updates = ", ".join(
+        f"{column} = excluded.{column}" for column in columns if column != primary_key
+    )
+    conflict_action = f"DO UPDATE SET {updates}" if updates else "DO NOTHING"
+
+    with staging_table(parquet_file, table_name, connection) as staging_table_name:
+        # `WHERE true` lets sqlite parse the ON CONFLICT clause after a SELECT.
+        upserted = connection.execute(
+            text(
+                f"INSERT INTO {table_name} ({column_list})"
+                f" SELECT {column_list} FROM {staging_table_name} WHERE true"
+                f" ON CONFLICT ({primary_key}) {conflict_action}"
+            )
+        )
+
+    logger.info(f"{table_name}: {upserted.rowcount} rows inserted or updated")
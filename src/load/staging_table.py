@@ -0,0 +1,51 @@
+"""This module contains the definition for `staging_table()`.
+
+The dimension loads apply a file's rows to their table in set-based
+statements, so the rows are first staged in a temporary table with the
+table's column types.
+"""
+
+from contextlib import contextmanager
+
+from src.load.copy_parquet import copy_parquet
+
+
+@contextmanager
+def staging_table(parquet_file, table_name, connection):
+    """Stages the rows of a parquet file in a temporary copy of a table for the block.
+
+    The staging table is dropped when the block completes. If the block raises, it is left for the
+    caller's rollback, which discards it on Postgres, as statements after an error would fail.
+
+    Args:
+        parquet_file (pyarrow parquet file): the rows to stage, e.g. from `parquet_row_group_reader()`.
+        table_name (str): name of the table, e.g. `dim_staff`.
+        connection (connection): an open SQLAlchemy connection to the data warehouse.
+
+    Yields:
+        staging_table (str): name of the staging table, `staging_<table name>`.
+    """
+
+    from sqlalchemy import text
+
+    staging_table_name = f"staging_{table_name}"
+    column_list = ", ".join(parquet_file.schema_arrow.names)
+
+    connection.execute(
+        text(
+            f"CREATE TEMPORARY TABLE {staging_table_name} AS"
+            f" SELECT {column_list} FROM {table_name} WHERE false"
+        )
+    )
+
+    # COPY is Postgres only; other databases, e.g. sqlite in tests, stage with INSERTs.
+    if connection.dialect.name == "postgresql":
+        copy_parquet(parquet_file, staging_table_name, connection)
+    else:
+        parquet_file.read().to_pandas().to_sql(
+            staging_table_name, connection, index=False, if_exists="append"
+        )
+
+    yield staging_table_name
+
+    connection.execute(text(f"DROP TABLE {staging_table_name}"))
@@ -2,55 +2,60 @@
 format files"""
 
 import logging
-import boto3
+import io
+
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
+from src.utils.client_factory import get_client
+from src.utils.file_catalog import update_catalog
 from src.utils.get_bucket_name import get_bucket_name
+from src.transform.transform_registry import get_output_key, get_outputs
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger()
 
 
-def df_to_parquet(df, file_name):
+def df_to_parquet(df, file_name, output_table=None, propagated=False):
     """
-
-    2. Set up s3 key
+    1. Look up the output table and its key scheme in the transform registry
+    2. Set up s3 key, with the propagated suffix for re-emitted rows
     3. Set up parquet file
     4. Send to bucket
+    5. Record the new file in the file catalog
     """
 
-    if not isinstance(df, pd.DataFrame):
-        raise ValueError(f"Invalid Input: {df} is not a data frame.")
+    if not isinstance(df, (pd.DataFrame, pa.Table)):
+        raise ValueError(f"Invalid Input: {df} is not a data frame or Arrow table.")
 
     table_name = file_name.split("/")[0]
 
-    match table_name:
-        case "address":
-            split = file_name.split("/")
-            new_file_name = f"dim_location/{split[1]}/{split[2]}"
-        case (
-            "counterparty"
-            | "currency"
-            | "design"
-            | "payment_type"
-            | "staff"
-            | "transaction"
-        ):
-            new_file_name = f"dim_{file_name}"
-        case "payment" | "purchase_order" | "sales_order":
-            new_file_name = f"fact_{file_name}"
-        case _:
+    if output_table is None:
+        outputs = get_outputs(table_name)
+
+        if not outputs:
             raise ValueError(
                 f"Invalid Input: {table_name} is not a valid input for this function"
             )
 
+        output_table = outputs[0]
+
+    new_file_name = get_output_key(output_table, file_name, propagated=propagated)
+
     bucket_name = get_bucket_name("processed")
 
-    s3 = boto3.client("s3")
+    s3 = get_client("s3")
 
-    parquet_file = pd.DataFrame.to_parquet(df)
+    if isinstance(df, pa.Table):
+        buffer = io.BytesIO()
+        pq.write_table(df, buffer)
+        parquet_file = buffer.getvalue()
+    else:
+        parquet_file = pd.DataFrame.to_parquet(df)
 
     response = s3.put_object(Bucket=bucket_name, Body=parquet_file, Key=new_file_name)
 
     if response["ResponseMetadata"]["HTTPStatusCode"] == 200:
         logger.info(f"{new_file_name} successfully saved to {bucket_name}")
+        update_catalog(df, new_file_name, bucket_name)
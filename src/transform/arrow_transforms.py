@@ -0,0 +1,188 @@
+"""This module contains the Arrow-native versions of the transform functions
+and `get_transform_engine()`.
+
+Each function takes and returns a `pyarrow.Table` and produces the same data
+as its pandas counterpart. Joins use `pyarrow.Table.join` and column
+operations use `pyarrow.compute`, both of which run multithreaded outside the
+GIL. The engine used by the transform lambda is selected with the
+`TRANSFORM_ENGINE` environment variable (`pandas` or `arrow`).
+"""
+
+import os
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.utils.get_archived_table_data import get_archived_table_data
+from src.utils.get_bucket_name import get_bucket_name
+from src.utils.static_lookup import apply_static_lookup
+
+ENGINES = ["pandas", "arrow"]
+
+
+def get_transform_engine():
+    """A function to get the transform engine selected by the `TRANSFORM_ENGINE` environment variable.
+
+    Returns:
+        engine (str): `pandas` (the default) or `arrow`.
+
+    Raises:
+        ValueError if `TRANSFORM_ENGINE` is not a valid engine.
+    """
+
+    engine = os.environ.get("TRANSFORM_ENGINE", "pandas").lower()
+
+    if engine not in ENGINES:
+        raise ValueError(
+            f"Invalid Input: {engine} is not a valid transform engine. Valid engines are {ENGINES}."
+        )
+
+    return engine
+
+
+def get_archived_table(table_name):
+    """A function to retrieve all archived data for a table in the ingestion bucket as an Arrow table."""
+
+    bucket_name = get_bucket_name("ingestion")
+    df = get_archived_table_data(table_name=table_name, bucket_name=bucket_name)
+
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+
+def inner_join(left, right, left_on, right_on):
+    """A function to inner join two Arrow tables, keeping pandas merge row order.
+
+    Rows are ordered by left row then right row, as `pd.merge(how="inner")` orders them.
+    The right key column is dropped as it duplicates the left key.
+    """
+
+    left = left.append_column("__left_row", pa.array(range(left.num_rows)))
+    right = right.append_column("__right_row", pa.array(range(right.num_rows)))
+
+    joined = left.join(right, keys=left_on, right_keys=right_on, join_type="inner")
+    joined = joined.sort_by([("__left_row", "ascending"), ("__right_row", "ascending")])
+
+    return joined.drop_columns(["__left_row", "__right_row"])
+
+
+def arrow_drop_created_and_updated(table):
+    """Arrow version of `drop_created_and_updated()`."""
+
+    return table.drop_columns(["created_at", "last_updated"])
+
+
+def arrow_split_timestamp(timestamps):
+    """Arrow version of `split_timestamp()`."""
+
+    if not pa.types.is_timestamp(timestamps.type):
+        timestamps = pc.cast(timestamps, pa.timestamp("us"))
+
+    timestamps = pc.cast(timestamps, pa.timestamp("us"), safe=False)
+
+    return pc.cast(timestamps, pa.date32()), pc.cast(timestamps, pa.time64("us"))
+
+
+def arrow_split_created_and_updated(table):
+    """Arrow version of `split_created_and_updated()`."""
+
+    created_date, created_time = arrow_split_timestamp(table["created_at"])
+    last_updated_date, last_updated_time = arrow_split_timestamp(table["last_updated"])
+
+    table = arrow_drop_created_and_updated(table)
+    table = table.append_column("created_date", created_date)
+    table = table.append_column("created_time", created_time)
+    table = table.append_column("last_updated_date", last_updated_date)
+    table = table.append_column("last_updated_time", last_updated_time)
+
+    return table
+
+
+def arrow_dim_location(address_table):
+    """Arrow version of `dim_location()`."""
+
+    table = arrow_drop_created_and_updated(address_table)
+
+    return table.rename_columns(
+        ["location_id" if name == "address_id" else name for name in table.column_names]
+    )
+
+
+def arrow_dim_currency(currency_table):
+    """Arrow version of `dim_currency()`."""
+
+    table = arrow_drop_created_and_updated(currency_table)
+
+    currency_names = apply_static_lookup(
+        table["currency_code"], "currency_name", fallback=lambda code: code
+    )
+
+    return table.append_column("currency_name", currency_names)
+
+
+def arrow_dim_counterparty(counterparty_table, address_table=None):
+    """Arrow version of `dim_counterparty()`."""
+
+    if address_table is None:
+        address_table = get_archived_table("address")
+
+    address_table = arrow_drop_created_and_updated(address_table)
+    counterparty_table = counterparty_table.select(
+        ["counterparty_id", "counterparty_legal_name", "legal_address_id"]
+    )
+
+    table = inner_join(
+        counterparty_table, address_table, "legal_address_id", "address_id"
+    ).drop_columns(["legal_address_id"])
+
+    new_names = {
+        "address_line_1": "counterparty_legal_address_line_1",
+        "address_line_2": "counterparty_legal_address_line_2",
+        "district": "counterparty_legal_district",
+        "city": "counterparty_legal_city",
+        "postal_code": "counterparty_legal_postal_code",
+        "country": "counterparty_legal_country",
+        "phone": "counterparty_legal_phone_number",
+    }
+
+    return table.rename_columns(
+        [new_names.get(name, name) for name in table.column_names]
+    )
+
+
+def arrow_dim_staff(staff_table, department_table=None):
+    """Arrow version of `dim_staff()`."""
+
+    if department_table is None:
+        department_table = get_archived_table("department")
+
+    table = inner_join(staff_table, department_table, "department_id", "department_id")
+
+    return table.select(
+        [
+            "staff_id",
+            "first_name",
+            "last_name",
+            "department_name",
+            "location",
+            "email_address",
+        ]
+    )
+
+
+def arrow_fact_payment(payment_table):
+    """Arrow version of `fact_payment()`."""
+
+    table = arrow_split_created_and_updated(payment_table)
+
+    return table.drop_columns(["company_ac_number", "counterparty_ac_number"])
+
+
+def arrow_fact_sales_order(sales_order_table):
+    """Arrow version of `fact_sales_order()`."""
+
+    table = arrow_split_created_and_updated(sales_order_table)
+
+    return table.rename_columns(
+        ["sales_staff_id" if name == "staff_id" else name for name in table.column_names]
+    )
+
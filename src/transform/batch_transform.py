@@ -0,0 +1,218 @@
+"""This module contains the definitions for `get_run_files()`,
+`batch_transform()` and the batch transform `lambda_handler()`.
+
+The batch transform builds every output for an extraction run in one
+invocation, so pandas and pyarrow are imported once and reference tables are
+read once for the whole run instead of once per file. The transform registry,
+and with it pandas and pyarrow, is imported by the functions that use it, so
+importing this module stays cheap.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import logging
+
+from src.utils.client_factory import get_client, reset_clients
+from src.utils.config_provider import prefetch_config
+from src.utils.get_bucket_name import get_bucket_name
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+EXECUTORS = ["thread", "process"]
+
+# Reference data loaded once into each worker process by `set_worker_reference_data()`.
+worker_reference_data = {}
+
+
+def get_run_files(run_id, bucket_name):
+    """A function to list the ingestion files written by one extraction run.
+
+    Args:
+        run_id (str): the run timestamp, e.g. `2024-02-22 18:00:20.106733`.
+        bucket_name (str): name of the ingestion bucket.
+
+    Returns:
+        files (list): keys of the run's files, one per table with new data.
+    """
+
+    from src.transform.transform_registry import TRANSFORM_REGISTRY
+
+    date, time = run_id.split(" ")
+    input_tables = {
+        table_name
+        for entry in TRANSFORM_REGISTRY.values()
+        for table_name in entry["inputs"]
+    }
+
+    s3 = get_client("s3")
+
+    files = []
+
+    for table_name in sorted(input_tables):
+        file_name = f"{table_name}/{date}/{time}.parquet"
+        response = s3.list_objects_v2(Bucket=bucket_name, Prefix=file_name)
+
+        if response["KeyCount"]:
+            files.append(file_name)
+
+    return files
+
+
+def set_worker_reference_data(reference_data):
+    """Stores the reference data passed to a new worker process.
+
+    A forked worker inherits the parent's boto3 clients and their open connections, which are
+    not fork-safe, so the worker discards them and builds its own.
+    """
+
+    reset_clients()
+    worker_reference_data.update(reference_data)
+
+
+def transform_outputs(file_names, output_keys, engine):
+    """Builds the outputs of one table of a batch in a worker process."""
+
+    import pandas as pd
+
+    from src.transform.transform_registry import run_transform
+
+    # Workers only inherit the parent's pandas options when forked, so each sets copy-on-write.
+    with pd.option_context("mode.copy_on_write", True):
+        return run_transform(
+            file_names,
+            engine=engine,
+            max_workers=1,
+            reference_data=worker_reference_data,
+            output_keys=output_keys,
+            update_indexes=False,
+        )
+
+
+def batch_transform(file_names, executor="thread", max_workers=None, engine=None):
+    """A function to transform every file of an extraction run in one invocation.
+
+    With the `thread` executor every output is built on a thread pool sharing one copy of the
+    reference data. pyarrow releases the GIL while reading, computing and writing Parquet, so
+    threads use every vCPU for the Arrow engine and most of the pandas engine's I/O. The `process`
+    executor instead builds each output table in a worker process loaded once with the reference
+    data, for pandas-heavy runs. It needs `/dev/shm`, which Lambda does not provide, so it is for
+    container or local runs only.
+
+    Args:
+        file_names (list): keys of the run's files in the ingestion bucket.
+        executor (str, optional): `thread` (the default) or `process`.
+        max_workers (int, optional): the number of threads or processes to use.
+        engine (str, optional): `pandas` or `arrow`. Defaults to `get_transform_engine()`.
+
+    Returns:
+        output_keys (list): keys of the files saved to the processed bucket.
+
+    Raises:
+        ValueError if `executor` is not a valid executor.
+    """
+
+    if executor not in EXECUTORS:
+        raise ValueError(
+            f"Invalid Input: {executor} is not a valid executor. Valid executors are {EXECUTORS}."
+        )
+
+    from src.transform.arrow_transforms import get_transform_engine
+    from src.transform.transform_registry import (
+        TRANSFORM_REGISTRY,
+        plan_transform,
+        read_reference_data,
+        run_transform,
+        update_reverse_indexes,
+    )
+    from src.utils.parquet_file_reader import parquet_file_reader, parquet_table_reader
+
+    if engine is None:
+        engine = get_transform_engine()
+
+    plan = plan_transform(file_names)
+    reference_data = read_reference_data(plan["reference_tables"], engine)
+
+    logger.info(
+        f"Transforming {len(plan['files'])} files into {len(plan['outputs'])} outputs"
+        f" with the {executor} executor"
+    )
+
+    if executor == "thread":
+        return run_transform(
+            plan["files"],
+            engine=engine,
+            max_workers=max_workers,
+            reference_data=reference_data,
+        )
+
+    # Reverse indexes are updated before the workers start, so no two workers write the same index.
+    bucket_name = get_bucket_name("ingestion")
+    read_file = parquet_table_reader if engine == "arrow" else parquet_file_reader
+    index_files = {
+        output["file_name"]
+        for output in plan["outputs"]
+        if output["file_name"] is not None
+        and "foreign_keys" in TRANSFORM_REGISTRY[output["output_table"]]
+    }
+    update_reverse_indexes(
+        plan,
+        {file_name: read_file(file_name, bucket_name) for file_name in index_files},
+        bucket_name,
+    )
+
+    # Each table's outputs go to one worker, so its row hash state is never written concurrently.
+    output_keys_by_table = {}
+
+    for output in plan["outputs"]:
+        output_keys_by_table.setdefault(output["output_table"], []).append(
+            output["output_key"]
+        )
+
+    with ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=set_worker_reference_data,
+        initargs=(reference_data,),
+    ) as process_executor:
+        results = process_executor.map(
+            transform_outputs,
+            [plan["files"]] * len(output_keys_by_table),
+            output_keys_by_table.values(),
+            [engine] * len(output_keys_by_table),
+        )
+
+        return [output_key for output_keys in results for output_key in output_keys]
+
+
+def lambda_handler(event, context):
+    """Transforms a whole extraction run in one invocation.
+
+    Deployed behind the transform lambda's handler, which passes it every event without
+    `Records`, so batch and per-file transforms never run concurrently.
+
+    Args:
+        event (dict): contains either `keys` (a list of ingestion bucket keys) or `run_id`
+        (a run timestamp, e.g. `2024-02-22 18:00:20.106733`), and optionally `executor`
+        and `max_workers`.
+
+    Returns:
+        output_keys (list): keys of the files saved to the processed bucket.
+    """
+
+    prefetch_config(buckets=["ingestion", "processed", "catalog"])
+
+    if "keys" in event:
+        file_names = [key.replace("%3A", ":") for key in event["keys"]]
+    else:
+        file_names = get_run_files(event["run_id"], get_bucket_name("ingestion"))
+
+    logger.info(f"Batch transforming {file_names}")
+
+    import pandas as pd
+
+    # Copy-on-write as in the per-file transform, so both paths build the same outputs.
+    with pd.option_context("mode.copy_on_write", True):
+        return batch_transform(
+            [file_name for file_name in file_names if not file_name.startswith("_")],
+            executor=event.get("executor", "thread"),
+            max_workers=event.get("max_workers"),
+        )
@@ -2,10 +2,38 @@
 
 import pandas as pd
 
+DAY_NAMES = [
+    "Monday",
+    "Tuesday",
+    "Wednesday",
+    "Thursday",
+    "Friday",
+    "Saturday",
+    "Sunday",
+]
+
+MONTH_NAMES = [
+    "January",
+    "February",
+    "March",
+    "April",
+    "May",
+    "June",
+    "July",
+    "August",
+    "September",
+    "October",
+    "November",
+    "December",
+]
+
 
 def create_dim_date(start_date, end_date):
     """Function to create data for a dim_date table.
 
+    Date parts are stored as int8 (int16 for the year) and day and month names as
+    categoricals built from the date parts, so no names are formatted per row.
+
     Args:
         start_date (str): required start date for dim_date table
         end_date (str): required end date for dim_date table
@@ -14,17 +42,21 @@ def create_dim_date(start_date, end_date):
         dim_date_df: Data frame.
     """
 
-    df_date = pd.DataFrame(
-        {"date_id": pd.date_range(start=f"{start_date}", end=f"{end_date}", freq="D")}
-    )  # noqa
-
-    df_date["year"] = df_date.date_id.dt.year
-    df_date["month"] = df_date.date_id.dt.month
-    df_date["day"] = df_date.date_id.dt.day
-    df_date["day_of_week"] = df_date.date_id.dt.day_of_week + 1
-    df_date["day_name"] = df_date.date_id.dt.day_name()
-    df_date["month_name"] = df_date.date_id.dt.month_name()
-    df_date["quarter"] = df_date.date_id.dt.quarter
+    dates = pd.date_range(start=f"{start_date}", end=f"{end_date}", freq="D")
+
+    df_date = pd.DataFrame({"date_id": dates})
+
+    df_date["year"] = dates.year.astype("int16")
+    df_date["month"] = dates.month.astype("int8")
+    df_date["day"] = dates.day.astype("int8")
+    df_date["day_of_week"] = (dates.day_of_week + 1).astype("int8")
+    df_date["day_name"] = pd.Categorical.from_codes(
+        dates.day_of_week, categories=DAY_NAMES, ordered=True
+    )
+    df_date["month_name"] = pd.Categorical.from_codes(
+        dates.month - 1, categories=MONTH_NAMES, ordered=True
+    )
+    df_date["quarter"] = dates.quarter.astype("int8")
     df_date["last_updated_date"] = "1970-01-01"
     df_date["last_updated_time"] = "00:00"
 
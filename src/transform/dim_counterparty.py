@@ -6,31 +6,31 @@ from src.utils.get_archived_table_data import get_archived_table_data
 from src.utils.get_bucket_name import get_bucket_name
 
 
-def dim_counterparty(counterparty_data):
+def dim_counterparty(counterparty_data, address_data=None):
     """A function to transform data from counterparty table in totesys ready to be loaded into dim_counterparty table in data warehouse.
 
     Args:
         counterparty_data (data frame): data frame of counterparty table data.
+        address_data (data frame, optional): archived address table data. Retrieved from the ingestion bucket if not passed.
 
     Returns:
         dim_counterparty_df (data frame): the transformed data ready to be loaded into dim_counterparty table.
     """
 
-    bucket_name = get_bucket_name("ingestion")
+    if address_data is None:
+        bucket_name = get_bucket_name("ingestion")
+        address_data = get_archived_table_data(
+            table_name="address", bucket_name=bucket_name
+        )
 
-    address_df = get_archived_table_data(table_name="address", bucket_name=bucket_name)
-
-    address_df.drop(
+    address_df = address_data.drop(
         columns=[
             "created_at",
             "last_updated",
         ],
-        inplace=True,
     )
 
-    counterparty_df = counterparty_data.copy(deep=True)
-
-    counterparty_df = counterparty_df[
+    counterparty_df = counterparty_data[
         [
             "counterparty_id",
             "counterparty_legal_name",
@@ -45,15 +45,12 @@ def dim_counterparty(counterparty_data):
         right_on="address_id",
     )
 
-    dim_counterparty_df.drop(
+    dim_counterparty_df = dim_counterparty_df.drop(
         columns=[
             "legal_address_id",
             "address_id",
         ],
-        inplace=True,
-    )
-
-    dim_counterparty_df.rename(
+    ).rename(
         columns={
             "address_line_1": "counterparty_legal_address_line_1",
             "address_line_2": "counterparty_legal_address_line_2",
@@ -63,7 +60,6 @@ def dim_counterparty(counterparty_data):
             "country": "counterparty_legal_country",
             "phone": "counterparty_legal_phone_number",
         },
-        inplace=True,
     )
 
     return dim_counterparty_df
@@ -1,7 +1,7 @@
 """This module contains the definition for transform_currency()."""
 
-import ccy
 from src.utils.drop_created_and_updated import drop_created_and_updated
+from src.utils.static_lookup import apply_static_lookup
 
 
 def dim_currency(currency_data):
@@ -12,7 +12,8 @@ def dim_currency(currency_data):
 
         It will:
             - Drop the created_at and last_updated columns.
-            - Use currency codes to populate a currency name column.
+            - Use currency codes to populate a currency name column. Codes missing from
+              the ISO 4217 lookup keep the code as their name.
 
     Returns:
         df (dataframe): A transformed dataframe ready for insertion into dim_currency table of data warehouse.
@@ -20,9 +21,8 @@ def dim_currency(currency_data):
 
     df = drop_created_and_updated(currency_data)
 
-    currency_codes = df["currency_code"].tolist()
-    currency_names = [ccy.currency(c).name for c in currency_codes]
-
-    df["currency_name"] = currency_names
+    df["currency_name"] = apply_static_lookup(
+        df["currency_code"], "currency_name", fallback=lambda code: code
+    )
 
     return df
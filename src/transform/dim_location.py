@@ -16,13 +16,10 @@ def dim_location(address_data):
         df (data frame): transformed data frame ready for insertion into dim_location table of data warehouse.
     """
 
-    df = drop_created_and_updated(address_data)
-
-    df.rename(
+    df = drop_created_and_updated(address_data).rename(
         columns={
             "address_id": "location_id",
         },
-        inplace=True,
     )
 
     return df
@@ -106,19 +106,26 @@ from src.utils.get_archived_table_data import get_archived_table_data
 from src.utils.get_bucket_name import get_bucket_name
 
 
-def dim_staff(staff_data):
+def dim_staff(staff_data, department_data=None):
+    """A function to transform data from staff table in totesys ready to be loaded into dim_staff table in data warehouse.
 
-    bucket_name = get_bucket_name("ingestion")
+    Args:
+        staff_data (data frame): data frame of staff table data.
+        department_data (data frame, optional): archived department table data. Retrieved from the ingestion bucket if not passed.
 
-    department_df = get_archived_table_data(
-        table_name="department",
-        bucket_name=bucket_name,
-    )
+    Returns:
+        dim_staff_df (data frame): the transformed data ready to be loaded into dim_staff table.
+    """
 
-    staff_df = staff_data.copy(deep=True)
+    if department_data is None:
+        bucket_name = get_bucket_name("ingestion")
+        department_data = get_archived_table_data(
+            table_name="department",
+            bucket_name=bucket_name,
+        )
 
     dim_staff_df = pd.merge(
-        staff_df, department_df, left_on="department_id", right_on="department_id"
+        staff_data, department_data, left_on="department_id", right_on="department_id"
     )
 
     dim_staff_df = dim_staff_df[
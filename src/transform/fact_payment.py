@@ -14,8 +14,8 @@ def fact_payment(payment_data):
         df (data frame): the transformed data frame ready for insertion into fact_payment table in data warehouse.
     """
 
-    df = split_created_and_updated(payment_data)
-    df.drop("company_ac_number", axis=1, inplace=True)
-    df.drop("counterparty_ac_number", axis=1, inplace=True)
+    df = split_created_and_updated(payment_data).drop(
+        columns=["company_ac_number", "counterparty_ac_number"]
+    )
 
     return df
@@ -14,13 +14,10 @@ def fact_sales_order(sales_order_data):
         df (data frame): the transformed data frame ready for insertion into fact_sales_order table in data warehouse.
     """
 
-    df = split_created_and_updated(sales_order_data)
-
-    df.rename(
+    df = split_created_and_updated(sales_order_data).rename(
         columns={
             "staff_id": "sales_staff_id",
         },
-        inplace=True,
     )
 
     return df
@@ -1,19 +1,21 @@
 """This module contains the definition for the lambda_handler() function
 for the transformation lambda.
+
+pandas, pyarrow and the transform registry are imported on the first
+invocation that has a file to transform, not when the module is loaded, so
+the Lambda runtime finishes its init phase sooner and skipped events never
+import them.
+
+Both the per-file S3 events and the batch transform of a whole run, an event
+without `Records`, run in this one function. Every invocation reads, modifies
+and rewrites the row hash state, reverse indexes and file catalogs in the
+catalog bucket, so the function's reserved concurrency of one serialises all
+of them.
 """
 
 import logging
-from src.transform.df_to_parquet import df_to_parquet
-from src.transform.dim_counterparty import dim_counterparty
-from src.transform.dim_currency import dim_currency
-from src.transform.dim_location import dim_location
-from src.transform.dim_staff import dim_staff
-from src.transform.fact_payment import fact_payment
-from src.transform.fact_sales_order import fact_sales_order
-from src.utils.drop_created_and_updated import drop_created_and_updated
-from src.utils.split_created_and_updated import split_created_and_updated
-from src.utils.get_bucket_name import get_bucket_name
-from src.utils.parquet_file_reader import parquet_file_reader
+
+from src.utils.config_provider import prefetch_config
 
 logger = logging.getLogger("MyLogger")
 logger.setLevel(logging.INFO)
@@ -21,63 +23,27 @@ logger.setLevel(logging.INFO)
 
 def lambda_handler(event, context):
 
+    if "Records" not in event:
+        from src.transform.batch_transform import lambda_handler as batch_lambda_handler
+
+        return batch_lambda_handler(event, context)
+
     file_name = event["Records"][0]["s3"]["object"]["key"]
     formatted_file_name = file_name.replace("%3A", ":")
     logger.info(f"File name is {formatted_file_name}!")
 
-    bucket_name = get_bucket_name("ingestion")
-    df = parquet_file_reader(formatted_file_name, bucket_name)
-    logger.info(f"{formatted_file_name} retrieved from {bucket_name}")
+    if formatted_file_name.startswith("_"):
+        logger.info(f"{formatted_file_name} is not ingested table data - skipping.")
+        return
+
+    prefetch_config(buckets=["ingestion", "processed", "catalog"])
+
+    import pandas as pd
 
-    table_name = formatted_file_name.split("/")[0]
-    logger.info(f"{table_name} data: {df}")
+    from src.transform.transform_registry import run_transform
 
-    match table_name:
-        case "address":
-            transformed_df = dim_location(df)
-            df_to_parquet(
-                transformed_df,
-                formatted_file_name,
-            )
-        case "counterparty":
-            transformed_df = dim_counterparty(df)
-            df_to_parquet(
-                transformed_df,
-                formatted_file_name,
-            )
-        case "currency":
-            transformed_df = dim_currency(df)
-            df_to_parquet(
-                transformed_df,
-                formatted_file_name,
-            )
-        case "design" | "payment_type" | "transaction":
-            transformed_df = drop_created_and_updated(df)
-            df_to_parquet(
-                transformed_df,
-                formatted_file_name,
-            )
-        case "staff":
-            transformed_df = dim_staff(df)
-            df_to_parquet(
-                transformed_df,
-                formatted_file_name,
-            )
-        case "payment":
-            transformed_df = fact_payment(df)
-            df_to_parquet(
-                transformed_df,
-                formatted_file_name,
-            )
-        case "purchase_order":
-            transformed_df = split_created_and_updated(df)
-            df_to_parquet(
-                transformed_df,
-                formatted_file_name,
-            )
-        case "sales_order":
-            transformed_df = fact_sales_order(df)
-            df_to_parquet(
-                transformed_df,
-                formatted_file_name,
-            )
+    # With copy-on-write the transforms' drops, renames and column selections
+    # share the input's data instead of copying it. The option is scoped to the
+    # transform, so it is not reset on every warm invocation or leaked to callers.
+    with pd.option_context("mode.copy_on_write", True):
+        run_transform([formatted_file_name])
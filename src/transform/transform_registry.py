@@ -0,0 +1,754 @@
+"""This module contains the transform registry and the definitions for
+`get_outputs()`, `get_dependent_outputs()`, `get_output_key()`,
+`lazy_transform()`, `check_schema()`, `plan_transform()`, `read_reference_data()`,
+`get_propagated_rows()`, `update_reverse_indexes()`, `combine_rows()` and
+`run_transform()`.
+
+Each output table in the processed bucket declares:
+    - `inputs`: the ingestion tables it is built from. The first input is the
+      table whose new files trigger the output; any others are reference tables
+      read in full from the ingestion bucket.
+    - `transform` and `arrow_transform`: the pandas and Arrow transform functions,
+      called with one argument per input in the order declared. They are
+      declared with `lazy_transform()`, so a module is only imported when one
+      of its transforms first runs.
+    - `output_key`: the key the output is saved to, formatted with the run path
+      (`YYYY-MM-DD/HH:MM:SS.SSSSSS.parquet`) of the triggering file. Outputs
+      that only re-emit rows for new reference table files are saved with
+      `PROPAGATED_SUFFIX` before `.parquet`, so they never overwrite the
+      output of the same run's triggering file when the two are built by
+      separate invocations.
+    - `schema`: the columns the output must contain.
+    - `categorical` (optional): low-cardinality columns emitted as pandas
+      categoricals or Arrow dictionary arrays.
+    - `row_hashes` (optional): if True, rows whose content is unchanged since
+      they were last emitted are dropped, using the row hash state.
+    - `scd2` (optional): if True, the output keeps type 2 history. Emitted rows
+      get `valid_from` (the run timestamp), `valid_to` and `is_current`
+      columns, and the load closes the previous versions.
+    - `foreign_keys` (optional): for each reference table, the column of the
+      first input that references it. New files of a reference table re-emit
+      only the output rows that reference the changed keys, found through the
+      reverse index.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import functools
+import importlib
+import logging
+
+import pandas as pd
+import pyarrow as pa
+
+from src.transform.arrow_transforms import get_transform_engine
+from src.utils.add_scd2_columns import add_scd2_columns
+from src.utils.encode_categoricals import encode_categoricals
+from src.utils.file_catalog import get_primary_key
+from src.utils.get_archived_table_data import get_archived_table_data
+from src.utils.get_bucket_name import get_bucket_name
+from src.utils.get_rows_by_primary_key import get_rows_by_primary_key
+from src.utils.get_table_as_of import get_key_timestamp
+from src.utils.parquet_file_reader import parquet_file_reader, parquet_table_reader
+from src.utils.reverse_index import find_dependent_keys, update_reverse_index
+from src.utils.row_hash import compute_row_hashes, find_changed_rows, update_row_hashes
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+PROPAGATED_SUFFIX = "-propagated"
+
+SPLIT_TIMESTAMP_COLUMNS = [
+    "created_date",
+    "created_time",
+    "last_updated_date",
+    "last_updated_time",
+]
+
+
+def lazy_transform(module_name, function_name):
+    """A function to declare a registry transform without importing its module.
+
+    One invocation usually builds one output, so the transform modules of the other outputs,
+    and the libraries they import, are never loaded.
+
+    Args:
+        module_name (str): the module defining the transform, e.g. `src.transform.dim_staff`.
+        function_name (str): the name of the transform function, e.g. `dim_staff`.
+
+    Returns:
+        transform (function): calls the transform, importing its module on the first call.
+    """
+
+    @functools.cache
+    def load():
+        return getattr(importlib.import_module(module_name), function_name)
+
+    def transform(*args, **kwargs):
+        return load()(*args, **kwargs)
+
+    transform.__name__ = function_name
+    transform.__qualname__ = function_name
+
+    return transform
+
+
+TRANSFORM_REGISTRY = {
+    "dim_location": {
+        "inputs": ["address"],
+        "transform": lazy_transform("src.transform.dim_location", "dim_location"),
+        "arrow_transform": lazy_transform(
+            "src.transform.arrow_transforms", "arrow_dim_location"
+        ),
+        "output_key": "dim_location/{run_path}",
+        "categorical": ["district", "city", "country"],
+        "row_hashes": True,
+        "schema": [
+            "location_id",
+            "address_line_1",
+            "address_line_2",
+            "district",
+            "city",
+            "postal_code",
+            "country",
+            "phone",
+        ],
+    },
+    "dim_counterparty": {
+        "inputs": ["counterparty", "address"],
+        "transform": lazy_transform(
+            "src.transform.dim_counterparty", "dim_counterparty"
+        ),
+        "arrow_transform": lazy_transform(
+            "src.transform.arrow_transforms", "arrow_dim_counterparty"
+        ),
+        "output_key": "dim_counterparty/{run_path}",
+        "categorical": [
+            "counterparty_legal_district",
+            "counterparty_legal_city",
+            "counterparty_legal_country",
+        ],
+        "row_hashes": True,
+        "scd2": True,
+        "foreign_keys": {"address": "legal_address_id"},
+        "schema": [
+            "counterparty_id",
+            "counterparty_legal_name",
+            "counterparty_legal_address_line_1",
+            "counterparty_legal_address_line_2",
+            "counterparty_legal_district",
+            "counterparty_legal_city",
+            "counterparty_legal_postal_code",
+            "counterparty_legal_country",
+            "counterparty_legal_phone_number",
+        ],
+    },
+    "dim_currency": {
+        "inputs": ["currency"],
+        "transform": lazy_transform("src.transform.dim_currency", "dim_currency"),
+        "arrow_transform": lazy_transform(
+            "src.transform.arrow_transforms", "arrow_dim_currency"
+        ),
+        "output_key": "dim_currency/{run_path}",
+        "categorical": ["currency_code", "currency_name"],
+        "row_hashes": True,
+        "schema": ["currency_id", "currency_code", "currency_name"],
+    },
+    "dim_design": {
+        "inputs": ["design"],
+        "transform": lazy_transform(
+            "src.utils.drop_created_and_updated", "drop_created_and_updated"
+        ),
+        "arrow_transform": lazy_transform(
+            "src.transform.arrow_transforms", "arrow_drop_created_and_updated"
+        ),
+        "output_key": "dim_design/{run_path}",
+        "row_hashes": True,
+        "schema": ["design_id", "design_name", "file_location", "file_name"],
+    },
+    "dim_payment_type": {
+        "inputs": ["payment_type"],
+        "transform": lazy_transform(
+            "src.utils.drop_created_and_updated", "drop_created_and_updated"
+        ),
+        "arrow_transform": lazy_transform(
+            "src.transform.arrow_transforms", "arrow_drop_created_and_updated"
+        ),
+        "output_key": "dim_payment_type/{run_path}",
+        "row_hashes": True,
+        "schema": ["payment_type_id", "payment_type_name"],
+    },
+    "dim_staff": {
+        "inputs": ["staff", "department"],
+        "transform": lazy_transform("src.transform.dim_staff", "dim_staff"),
+        "arrow_transform": lazy_transform(
+            "src.transform.arrow_transforms", "arrow_dim_staff"
+        ),
+        "output_key": "dim_staff/{run_path}",
+        "categorical": ["department_name", "location"],
+        "row_hashes": True,
+        "scd2": True,
+        "foreign_keys": {"department": "department_id"},
+        "schema": [
+            "staff_id",
+            "first_name",
+            "last_name",
+            "department_name",
+            "location",
+            "email_address",
+        ],
+    },
+    "dim_transaction": {
+        "inputs": ["transaction"],
+        "transform": lazy_transform(
+            "src.utils.drop_created_and_updated", "drop_created_and_updated"
+        ),
+        "arrow_transform": lazy_transform(
+            "src.transform.arrow_transforms", "arrow_drop_created_and_updated"
+        ),
+        "output_key": "dim_transaction/{run_path}",
+        "row_hashes": True,
+        "schema": [
+            "transaction_id",
+            "transaction_type",
+            "sales_order_id",
+            "purchase_order_id",
+        ],
+    },
+    "fact_payment": {
+        "inputs": ["payment"],
+        "transform": lazy_transform("src.transform.fact_payment", "fact_payment"),
+        "arrow_transform": lazy_transform(
+            "src.transform.arrow_transforms", "arrow_fact_payment"
+        ),
+        "output_key": "fact_payment/{run_path}",
+        "schema": [
+            "payment_id",
+            "transaction_id",
+            "counterparty_id",
+            "payment_amount",
+            "currency_id",
+            "payment_type_id",
+            "paid",
+            "payment_date",
+            *SPLIT_TIMESTAMP_COLUMNS,
+        ],
+    },
+    "fact_purchase_order": {
+        "inputs": ["purchase_order"],
+        "transform": lazy_transform(
+            "src.utils.split_created_and_updated", "split_created_and_updated"
+        ),
+        "arrow_transform": lazy_transform(
+            "src.transform.arrow_transforms", "arrow_split_created_and_updated"
+        ),
+        "output_key": "fact_purchase_order/{run_path}",
+        "schema": [
+            "purchase_order_id",
+            "staff_id",
+            "counterparty_id",
+            "item_code",
+            "item_quantity",
+            "item_unit_price",
+            "currency_id",
+            "agreed_delivery_date",
+            "agreed_payment_date",
+            "agreed_delivery_location_id",
+            *SPLIT_TIMESTAMP_COLUMNS,
+        ],
+    },
+    "fact_sales_order": {
+        "inputs": ["sales_order"],
+        "transform": lazy_transform(
+            "src.transform.fact_sales_order", "fact_sales_order"
+        ),
+        "arrow_transform": lazy_transform(
+            "src.transform.arrow_transforms", "arrow_fact_sales_order"
+        ),
+        "output_key": "fact_sales_order/{run_path}",
+        "schema": [
+            "sales_order_id",
+            "design_id",
+            "sales_staff_id",
+            "counterparty_id",
+            "units_sold",
+            "unit_price",
+            "currency_id",
+            "agreed_delivery_date",
+            "agreed_payment_date",
+            "agreed_delivery_location_id",
+            *SPLIT_TIMESTAMP_COLUMNS,
+        ],
+    },
+}
+
+
+def get_outputs(table_name):
+    """A function to get the output tables triggered by new files of an ingestion table.
+
+    Args:
+        table_name (str): name of the ingestion table, e.g. `address`.
+
+    Returns:
+        outputs (list): names of the output tables whose first input is `table_name`.
+    """
+
+    return [
+        output_table
+        for output_table, entry in TRANSFORM_REGISTRY.items()
+        if entry["inputs"][0] == table_name
+    ]
+
+
+def get_dependent_outputs(table_name):
+    """A function to get the output tables with rows that reference an ingestion table.
+
+    Args:
+        table_name (str): name of the ingestion table, e.g. `address`.
+
+    Returns:
+        outputs (list): names of the output tables with a foreign key to `table_name`.
+    """
+
+    return [
+        output_table
+        for output_table, entry in TRANSFORM_REGISTRY.items()
+        if table_name in entry.get("foreign_keys", {})
+    ]
+
+
+def get_output_key(output_table, file_name, propagated=False):
+    """A function to get the processed bucket key for an output built from an ingestion file.
+
+    Args:
+        output_table (str): name of the output table, e.g. `dim_location`.
+        file_name (str): key of the triggering ingestion file, e.g. `address/2024-02-22/18:00:20.106733.parquet`.
+        propagated (bool, optional): whether the output only re-emits rows for new reference
+        table files, with no triggering file. Defaults to False.
+
+    Returns:
+        output_key (str): e.g. `dim_location/2024-02-22/18:00:20.106733.parquet`, or
+        `dim_counterparty/2024-02-22/18:00:20.106733-propagated.parquet` if propagated.
+    """
+
+    run_path = file_name.split("/", 1)[1]
+
+    if propagated:
+        run_path = run_path.replace(".parquet", f"{PROPAGATED_SUFFIX}.parquet")
+
+    return TRANSFORM_REGISTRY[output_table]["output_key"].format(run_path=run_path)
+
+
+def check_schema(output_table, data):
+    """A function to check transformed data contains every column declared for its output table.
+
+    Args:
+        output_table (str): name of the output table, e.g. `dim_location`.
+        data (data frame or Arrow table): the transformed data.
+
+    Raises:
+        ValueError if any declared column is missing.
+    """
+
+    columns = get_columns(data)
+
+    missing_columns = [
+        column
+        for column in TRANSFORM_REGISTRY[output_table]["schema"]
+        if column not in columns
+    ]
+
+    if missing_columns:
+        raise ValueError(
+            f"Invalid Output: {output_table} data is missing columns {missing_columns}."
+        )
+
+
+def plan_transform(file_names):
+    """A function to plan the outputs to build for a set of new ingestion files.
+
+    A new file of a table triggers the outputs built from it. A new file of a reference table
+    also re-emits the rows of outputs that reference it. This is merged into the output of the
+    same run if the run has a triggering file for it too, otherwise it is saved to the run's
+    propagated output key.
+
+    Args:
+        file_names (list): keys of new files in the ingestion bucket.
+
+    Returns:
+        plan (dict): with
+            - `files`: the new files to read, once each.
+            - `reference_tables`: the reference tables to read in full, once each.
+            - `outputs`: a list of dicts of `output_table`, `output_key`, `file_name` (the
+              triggering file, or None) and `reference_files` (new files of reference tables).
+    """
+
+    plan = {"files": [], "reference_tables": [], "outputs": []}
+    outputs_by_key = {}
+
+    for file_name in file_names:
+        table_name = file_name.split("/")[0]
+        triggered_outputs = get_outputs(table_name)
+        dependent_outputs = get_dependent_outputs(table_name)
+
+        if not triggered_outputs and not dependent_outputs:
+            logger.info(f"{file_name} does not trigger any output - skipping.")
+            continue
+
+        if file_name not in plan["files"]:
+            plan["files"].append(file_name)
+
+        for output_table in triggered_outputs + dependent_outputs:
+            output_key = get_output_key(output_table, file_name)
+
+            if output_key not in outputs_by_key:
+                outputs_by_key[output_key] = {
+                    "output_table": output_table,
+                    "output_key": output_key,
+                    "file_name": None,
+                    "reference_files": [],
+                }
+                plan["outputs"].append(outputs_by_key[output_key])
+
+            output = outputs_by_key[output_key]
+
+            if output_table in triggered_outputs:
+                output["file_name"] = file_name
+            elif file_name not in output["reference_files"]:
+                output["reference_files"].append(file_name)
+
+            for reference_table in TRANSFORM_REGISTRY[output_table]["inputs"][1:]:
+                if reference_table not in plan["reference_tables"]:
+                    plan["reference_tables"].append(reference_table)
+
+    for output in plan["outputs"]:
+        if output["file_name"] is None:
+            output["output_key"] = get_output_key(
+                output["output_table"], output["reference_files"][0], propagated=True
+            )
+
+    return plan
+
+
+def read_reference_data(reference_tables, engine=None):
+    """A function to read the latest version of every row of reference tables from the ingestion bucket.
+
+    Args:
+        reference_tables (list): names of the reference tables, e.g. ["address"].
+        engine (str, optional): `pandas` or `arrow`. Defaults to `get_transform_engine()`.
+
+    Returns:
+        reference_data (dict): a data frame or Arrow table for each reference table.
+    """
+
+    if engine is None:
+        engine = get_transform_engine()
+
+    bucket_name = get_bucket_name("ingestion")
+
+    reference_data = {}
+
+    for reference_table in reference_tables:
+        df = get_archived_table_data(reference_table, bucket_name)
+
+        # Keep only the latest version of each row, so updated rows are not joined twice.
+        if "last_updated" in df.columns:
+            latest_rows = df.sort_values("last_updated", kind="stable").drop_duplicates(
+                subset=get_primary_key(reference_table, df.columns), keep="last"
+            )
+            df = df.loc[latest_rows.index.sort_values()]
+
+        if engine == "arrow":
+            df = pa.Table.from_pandas(df, preserve_index=False)
+
+        reference_data[reference_table] = df
+
+        logger.info(f"{reference_table} reference data retrieved from {bucket_name}")
+
+    return reference_data
+
+
+def get_columns(data):
+    """Returns the column names of a data frame or Arrow table."""
+
+    if isinstance(data, pa.Table):
+        return data.column_names
+
+    return list(data.columns)
+
+
+def get_column_values(data, column):
+    """Returns the values of a column of a data frame or Arrow table as a list."""
+
+    if isinstance(data, pa.Table):
+        return data.column(column).to_pylist()
+
+    return data[column].tolist()
+
+
+def get_propagated_rows(output, input_data, bucket_name):
+    """A function to retrieve the rows of an output's first input that reference changed reference rows.
+
+    Rows in the output's triggering file are excluded, as they are emitted anyway.
+
+    Args:
+        output (dict): an output of `plan_transform()`.
+        input_data (dict): the data read for each of the plan's files.
+        bucket_name (str): name of the ingestion bucket.
+
+    Returns:
+        df (data frame): the latest version of each affected row, or None if no rows are affected.
+    """
+
+    entry = TRANSFORM_REGISTRY[output["output_table"]]
+    table_name = entry["inputs"][0]
+
+    dependent_keys = set()
+
+    for reference_file in output["reference_files"]:
+        reference_table = reference_file.split("/")[0]
+        reference_data = input_data[reference_file]
+        reference_key = get_primary_key(reference_table, get_columns(reference_data))
+
+        dependent_keys.update(
+            find_dependent_keys(
+                table_name,
+                reference_table,
+                entry["foreign_keys"][reference_table],
+                get_column_values(reference_data, reference_key),
+                bucket_name,
+            )
+        )
+
+    if output["file_name"] is not None:
+        data = input_data[output["file_name"]]
+        primary_key = get_primary_key(table_name, get_columns(data))
+        dependent_keys -= set(get_column_values(data, primary_key))
+
+    if not dependent_keys:
+        return None
+
+    logger.info(
+        f"Re-emitting {len(dependent_keys)} {output['output_table']} rows referencing"
+        f" {output['reference_files']}"
+    )
+
+    return get_rows_by_primary_key(table_name, bucket_name, sorted(dependent_keys))
+
+
+def update_reverse_indexes(plan, input_data, bucket_name):
+    """A function to record the references held by a plan's triggering files in the reverse indexes.
+
+    Args:
+        plan (dict): the output of `plan_transform()`.
+        input_data (dict): the data read for the plan's triggering files.
+        bucket_name (str): name of the ingestion bucket.
+    """
+
+    for output in plan["outputs"]:
+        entry = TRANSFORM_REGISTRY[output["output_table"]]
+
+        if output["file_name"] is None or "foreign_keys" not in entry:
+            continue
+
+        data = input_data[output["file_name"]]
+
+        for reference_table, foreign_key in entry["foreign_keys"].items():
+            if isinstance(data, pa.Table):
+                primary_key = get_primary_key(entry["inputs"][0], data.column_names)
+                index_data = data.select([primary_key, foreign_key]).to_pandas()
+            else:
+                index_data = data
+
+            update_reverse_index(
+                index_data, entry["inputs"][0], reference_table, foreign_key, bucket_name
+            )
+
+
+def combine_rows(data, rows, engine):
+    """A function to append re-emitted rows to the data of a triggering file.
+
+    Args:
+        data (data frame or Arrow table): the triggering file's data, or None.
+        rows (data frame): the re-emitted rows.
+        engine (str): `pandas` or `arrow`.
+
+    Returns:
+        data (data frame or Arrow table): the combined rows.
+    """
+
+    if engine == "arrow":
+        if data is None:
+            return pa.Table.from_pandas(rows, preserve_index=False)
+
+        rows = pa.Table.from_pandas(rows[data.column_names], preserve_index=False)
+
+        return pa.concat_tables([data, rows.cast(data.schema)])
+
+    if data is None:
+        return rows
+
+    return pd.concat([data, rows[data.columns]], ignore_index=True)
+
+
+def run_transform(
+    file_names,
+    engine=None,
+    max_workers=None,
+    reference_data=None,
+    output_keys=None,
+    update_indexes=True,
+):
+    """A function to transform new ingestion files and save the outputs to the processed bucket.
+
+    Each triggering file and each reference table is read once and shared by every output that
+    needs it. Outputs are independent of each other, so they are transformed and saved in parallel.
+    Reverse indexes are updated from the triggering files, and new reference table files re-emit
+    the output rows that reference them. Outputs with `row_hashes` only emit new or changed rows,
+    and `scd2` outputs emit them as new versions. `categorical` columns are dictionary encoded.
+
+    Args:
+        file_names (list): keys of new files in the ingestion bucket.
+        engine (str, optional): `pandas` or `arrow`. Defaults to `get_transform_engine()`.
+        max_workers (int, optional): the number of outputs to build at once.
+        reference_data (dict, optional): reference tables already read by `read_reference_data()`.
+        Any reference table the plan needs that is not passed is read from the ingestion bucket.
+        output_keys (list, optional): build only these of the plan's outputs. Defaults to all.
+        update_indexes (bool, optional): whether to update the reverse indexes. Defaults to True.
+
+    Returns:
+        output_keys (list): keys of the files saved to the processed bucket.
+    """
+
+    # Imported here as df_to_parquet looks up output keys in this module's registry.
+    from src.transform.df_to_parquet import df_to_parquet
+
+    if engine is None:
+        engine = get_transform_engine()
+
+    plan = plan_transform(file_names)
+
+    if output_keys is not None:
+        plan["outputs"] = [
+            output for output in plan["outputs"] if output["output_key"] in output_keys
+        ]
+        plan["files"] = [
+            file_name
+            for file_name in plan["files"]
+            if any(
+                file_name == output["file_name"] or file_name in output["reference_files"]
+                for output in plan["outputs"]
+            )
+        ]
+
+    if not plan["outputs"]:
+        return []
+
+    bucket_name = get_bucket_name("ingestion")
+
+    if engine == "arrow":
+        read_file, transform_name = parquet_table_reader, "arrow_transform"
+    else:
+        read_file, transform_name = parquet_file_reader, "transform"
+
+    # Inputs are read up front on this thread so the workers only transform and save.
+    input_data = dict(reference_data or {})
+
+    for file_name in plan["files"]:
+        input_data[file_name] = read_file(file_name, bucket_name)
+        logger.info(f"{file_name} retrieved from {bucket_name}")
+        logger.info(f"{file_name.split('/')[0]} data: {input_data[file_name]}")
+
+    input_data.update(
+        read_reference_data(
+            [table for table in plan["reference_tables"] if table not in input_data],
+            engine,
+        )
+    )
+
+    # Reverse indexes are updated here so concurrent outputs never write the same index.
+    if update_indexes:
+        update_reverse_indexes(plan, input_data, bucket_name)
+
+    def build_output(output):
+        entry = TRANSFORM_REGISTRY[output["output_table"]]
+        data = input_data.get(output["file_name"])
+
+        if output["reference_files"]:
+            propagated_rows = get_propagated_rows(output, input_data, bucket_name)
+
+            if propagated_rows is not None:
+                data = combine_rows(data, propagated_rows, engine)
+
+        if data is None:
+            logger.info(f"No {output['output_table']} rows to re-emit - skipping.")
+            return None
+
+        data = entry[transform_name](
+            data,
+            *[input_data[reference_table] for reference_table in entry["inputs"][1:]],
+        )
+        check_schema(output["output_table"], data)
+        data = encode_categoricals(data, entry.get("categorical", []))
+
+        if entry.get("row_hashes"):
+            df = data.to_pandas() if isinstance(data, pa.Table) else data
+            row_hashes = compute_row_hashes(df)
+            changed = find_changed_rows(df, output["output_table"], row_hashes)
+
+            if not changed.any():
+                logger.info(f"No new or changed {output['output_table']} rows - skipping.")
+                return None
+
+            if not changed.all():
+                logger.info(
+                    f"Dropping {len(changed) - changed.sum()} unchanged"
+                    f" {output['output_table']} rows"
+                )
+                if isinstance(data, pa.Table):
+                    data = data.filter(changed)
+                else:
+                    data = data[changed].reset_index(drop=True)
+
+                df, row_hashes = df[changed], row_hashes[changed]
+
+        if entry.get("scd2"):
+            data = add_scd2_columns(
+                data,
+                get_key_timestamp(output["file_name"] or output["reference_files"][0]),
+            )
+
+        df_to_parquet(
+            data,
+            output["file_name"] or output["reference_files"][0],
+            output_table=output["output_table"],
+            propagated=output["file_name"] is None,
+        )
+
+        if entry.get("row_hashes"):
+            update_row_hashes(df, output["output_table"], row_hashes)
+
+        return output["output_key"]
+
+    # Outputs of the same table are built in run order on one worker, so its row hash state is
+    # never written concurrently.
+    outputs_by_table = {}
+
+    for output in plan["outputs"]:
+        outputs_by_table.setdefault(output["output_table"], []).append(output)
+
+    def build_table_outputs(outputs):
+        outputs = sorted(outputs, key=lambda output: output["output_key"])
+        return [build_output(output) for output in outputs]
+
+    if len(outputs_by_table) == 1:
+        results = [build_table_outputs(*outputs_by_table.values())]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(build_table_outputs, outputs_by_table.values()))
+
+    return [
+        output_key
+        for output_keys in results
+        for output_key in output_keys
+        if output_key is not None
+    ]
@@ -0,0 +1,34 @@
+"""This module contains the definition for `add_scd2_columns()`."""
+
+SCD2_COLUMNS = ["valid_from", "valid_to", "is_current"]
+
+
+def add_scd2_columns(data, valid_from):
+    """A function to add type 2 slowly changing dimension columns to new versions of dimension rows.
+
+    Args:
+        data (data frame or Arrow table): the new or changed dimension rows.
+        valid_from (timestamp): when the new versions became current, e.g. the run timestamp.
+
+    Returns:
+        data (data frame or Arrow table): the rows with `valid_from` set, `valid_to` null and `is_current` True.
+    """
+
+    import pandas as pd
+    import pyarrow as pa
+
+    valid_from = pd.Timestamp(valid_from).as_unit("us")
+
+    if isinstance(data, pa.Table):
+        num_rows = data.num_rows
+        data = data.append_column(
+            "valid_from", pa.array([valid_from] * num_rows, pa.timestamp("us"))
+        )
+        data = data.append_column("valid_to", pa.nulls(num_rows, pa.timestamp("us")))
+        return data.append_column("is_current", pa.array([True] * num_rows))
+
+    return data.assign(
+        valid_from=pd.Series(valid_from, index=data.index, dtype="datetime64[us]"),
+        valid_to=pd.Series(pd.NaT, index=data.index, dtype="datetime64[us]"),
+        is_current=True,
+    )
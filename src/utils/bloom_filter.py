@@ -0,0 +1,60 @@
+"""This module contains the definitions for `create_bloom_filter()` and
+`bloom_filter_may_contain()`."""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+NUM_HASHES = 7
+FALSE_POSITIVE_RATE = 0.01
+
+
+def _bit_positions(values, num_bits):
+    """Returns a (len(values), NUM_HASHES) array of bit positions using double hashing."""
+
+    values = np.asarray(values, dtype="int64")
+    hash_1 = pd.util.hash_array(values)
+    hash_2 = pd.util.hash_array(hash_1) | np.uint64(1)
+    multipliers = np.arange(NUM_HASHES, dtype="uint64")
+
+    return (hash_1[:, None] + multipliers * hash_2[:, None]) % np.uint64(num_bits)
+
+
+def create_bloom_filter(values):
+    """A function to create a bloom filter of integer key values.
+
+    Args:
+        values (list or array): the integer values to add to the filter, e.g. a primary key column.
+
+    Returns:
+        bloom_filter (bytes): the filter's bit array, sized for a 1% false positive rate.
+    """
+
+    num_values = max(len(values), 1)
+    num_bits = math.ceil(
+        -num_values * math.log(FALSE_POSITIVE_RATE) / (math.log(2) ** 2)
+    )
+    num_bits = max(64, math.ceil(num_bits / 8) * 8)
+
+    bits = np.zeros(num_bits, dtype=bool)
+    bits[_bit_positions(values, num_bits).ravel()] = True
+
+    return np.packbits(bits).tobytes()
+
+
+def bloom_filter_may_contain(bloom_filter, values):
+    """A function to check which values may be in a bloom filter.
+
+    Args:
+        bloom_filter (bytes): a filter created by `create_bloom_filter()`.
+        values (list or array): the integer values to check.
+
+    Returns:
+        result (array): boolean array, False where a value is definitely not in the filter.
+    """
+
+    bits = np.unpackbits(np.frombuffer(bloom_filter, dtype="uint8")).astype(bool)
+    positions = _bit_positions(values, len(bits))
+
+    return bits[positions].all(axis=1)
@@ -0,0 +1,88 @@
+"""This module contains the definitions for `get_client()`, `set_client()`
+and `reset_clients()`.
+
+boto3 clients are expensive to build, so each is built once per process, the
+first time it is used, and shared by every module and thread. botocore
+clients are thread-safe once built, but building them from one session is
+not, so building is serialised. Clients share one botocore config: a
+connection pool of `MAX_POOL_CONNECTIONS`, large enough for the parallel S3
+reads and writes of the transform, and standard retries with backoff for
+throttled requests. boto3 itself is only imported when the first client is
+built.
+"""
+
+import os
+import threading
+
+MAX_POOL_CONNECTIONS = int(os.environ.get("AWS_MAX_POOL_CONNECTIONS", 50))
+RETRIES = {"max_attempts": 5, "mode": "standard"}
+
+# Built or injected clients by (service name, region name).
+clients = {}
+session = None
+client_config = None
+clients_lock = threading.Lock()
+
+
+def get_client(service_name, region_name=None):
+    """A function to get the shared boto3 client for a service, building it the first time.
+
+    Args:
+        service_name (str): the AWS service, e.g. `s3`.
+        region_name (str, optional): the region. Defaults to the session's region.
+
+    Returns:
+        client (boto3 client): the shared client.
+    """
+
+    global session, client_config
+
+    client = clients.get((service_name, region_name))
+
+    if client is not None:
+        return client
+
+    with clients_lock:
+        client = clients.get((service_name, region_name))
+
+        if client is None:
+            if session is None:
+                import boto3
+                from botocore.config import Config
+
+                session = boto3.session.Session()
+                client_config = Config(
+                    max_pool_connections=MAX_POOL_CONNECTIONS,
+                    retries=RETRIES,
+                    tcp_keepalive=True,
+                )
+
+            client = session.client(
+                service_name, region_name=region_name, config=client_config
+            )
+            clients[(service_name, region_name)] = client
+
+    return client
+
+
+def set_client(service_name, client, region_name=None):
+    """A function to replace the shared client for a service, e.g. with a stub in tests.
+
+    Args:
+        service_name (str): the AWS service, e.g. `s3`.
+        client (boto3 client): the client to return from `get_client()`.
+        region_name (str, optional): the region the client is returned for.
+    """
+
+    with clients_lock:
+        clients[(service_name, region_name)] = client
+
+
+def reset_clients():
+    """A function to discard every shared client and the session, e.g. between tests."""
+
+    global session
+
+    with clients_lock:
+        clients.clear()
+        session = None
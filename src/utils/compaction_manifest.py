@@ -0,0 +1,99 @@
+"""This module contains the definitions for `get_compaction_manifest()`,
+`put_compaction_manifest()` and `apply_compaction_manifest()`.
+
+The compaction manifest of a table records, for each compacted day, the key of
+the compacted file and the keys of the small files it replaces. It is stored
+in the catalog bucket at `compaction/<data bucket name>/<table name>.json` and
+is replaced with a single put, so readers switch to compacted files atomically.
+"""
+
+import json
+import logging
+
+from src.utils.client_factory import get_client
+from src.utils.get_bucket_name import BucketNotFoundError, get_bucket_name
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+
+def get_compaction_manifest(table_name, bucket_name):
+    """A function to retrieve the compaction manifest of a table.
+
+    Args:
+        table_name (str): name of the table, e.g. `staff`.
+        bucket_name (str): name of the data bucket the table's files are stored in.
+
+    Returns:
+        manifest (dict): e.g. {"days": {"2024-02-22": {"key": ..., "sources": [...]}}}.
+        Empty if the table has not been compacted.
+    """
+
+    try:
+        catalog_bucket = get_bucket_name("catalog")
+    except BucketNotFoundError:
+        return {"days": {}}
+
+    s3 = get_client("s3")
+
+    try:
+        response = s3.get_object(
+            Bucket=catalog_bucket, Key=f"compaction/{bucket_name}/{table_name}.json"
+        )
+    except s3.exceptions.NoSuchKey:
+        return {"days": {}}
+
+    return json.loads(response["Body"].read())
+
+
+def put_compaction_manifest(table_name, bucket_name, manifest):
+    """A function to save the compaction manifest of a table.
+
+    Args:
+        table_name (str): name of the table, e.g. `staff`.
+        bucket_name (str): name of the data bucket the table's files are stored in.
+        manifest (dict): the manifest to save.
+    """
+
+    catalog_bucket = get_bucket_name("catalog")
+
+    s3 = get_client("s3")
+
+    s3.put_object(
+        Bucket=catalog_bucket,
+        Key=f"compaction/{bucket_name}/{table_name}.json",
+        Body=json.dumps(manifest),
+    )
+
+    logger.info(f"Compaction manifest for {table_name} in {bucket_name} updated.")
+
+
+def apply_compaction_manifest(table_name, bucket_name, files):
+    """A function to replace small files with the compacted files that contain them.
+
+    Args:
+        table_name (str): name of the table, e.g. `staff`.
+        bucket_name (str): name of the data bucket the table's files are stored in.
+        files (list): keys of the table's files.
+
+    Returns:
+        files (list): the passed keys with compacted files substituted, without duplicates and in the original order.
+    """
+
+    manifest = get_compaction_manifest(table_name, bucket_name)
+
+    compacted_files = {
+        source: day["key"]
+        for day in manifest["days"].values()
+        for source in day["sources"]
+    }
+
+    resolved_files = []
+
+    for file in files:
+        resolved_file = compacted_files.get(file, file)
+
+        if resolved_file not in resolved_files:
+            resolved_files.append(resolved_file)
+
+    return resolved_files
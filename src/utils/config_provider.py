@@ -0,0 +1,237 @@
+"""This module contains the definitions for `get_config()`, `set_config()`,
+`find_bucket_name()`, `load_secret()`, `load_parameter()`, `put_parameter()`,
+`prefetch_config()` and `clear_config_cache()`.
+
+The configuration provider caches bucket names and secrets in module scope
+for `CONFIG_TTL_SECONDS` (default 300), so warm invocations do not look them
+up again. SSM parameters, e.g. the `last_ingested_timestamp` watermark, are
+state rather than configuration, so they are always read from Parameter
+Store: a cached watermark could be stale if it was written by another
+container, and would make a run extract rows twice. Any value can be
+overridden with an environment
+variable named `CONFIG_<NAME>`, e.g. `CONFIG_INGESTION_BUCKET`,
+`CONFIG_DW_CREDENTIALS` (the secret as JSON) or
+`CONFIG_LAST_INGESTED_TIMESTAMP`; overridden values are never looked up.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import os
+import re
+import threading
+import time
+
+from src.utils.client_factory import get_client
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+DEFAULT_CONFIG_TTL_SECONDS = 300
+
+BUCKET_PATTERNS = {
+    "ingestion": "totesys-etl-ingestion-bucket-*",
+    "processed": "totesys-etl-processed-data-bucket-*",
+    "catalog": "totesys-etl-catalog-bucket-*",
+}
+
+# Cached values by key, e.g. `secret:dw_credentials`, as (value, expiry time) tuples.
+# A bucket that was not found is cached as None, so repeated lookups do not list the buckets.
+config_cache = {}
+config_lock = threading.Lock()
+
+
+def get_ttl():
+    """Returns the number of seconds values are cached for."""
+
+    return int(os.environ.get("CONFIG_TTL_SECONDS", DEFAULT_CONFIG_TTL_SECONDS))
+
+
+def get_env_override(name):
+    """Returns the `CONFIG_<NAME>` environment variable for a value, or None if not set."""
+
+    return os.environ.get("CONFIG_" + re.sub(r"[^A-Z0-9]", "_", name.upper()))
+
+
+def get_config(key, loader, ttl=None):
+    """A function to get a configuration value, loading it if it is not cached or has expired.
+
+    Args:
+        key (str): the cache key, e.g. `secret:dw_credentials`.
+        loader (function): called with no arguments to load the value.
+        ttl (int, optional): seconds to cache the value for. Defaults to `CONFIG_TTL_SECONDS`.
+
+    Returns:
+        value: the cached or loaded value.
+    """
+
+    if ttl is None:
+        ttl = get_ttl()
+
+    with config_lock:
+        cached = config_cache.get(key)
+
+    if cached is not None and cached[1] > time.monotonic():
+        return cached[0]
+
+    value = loader()
+
+    with config_lock:
+        config_cache[key] = (value, time.monotonic() + ttl)
+
+    return value
+
+
+def set_config(key, value):
+    """Stores a value in the cache, e.g. after writing it."""
+
+    with config_lock:
+        config_cache[key] = (value, time.monotonic() + get_ttl())
+
+
+def list_bucket_names():
+    """Returns the names of every s3 bucket, cached."""
+
+    def loader():
+        response = get_client("s3").list_buckets()
+        return [bucket["Name"] for bucket in response["Buckets"]]
+
+    return get_config("buckets", loader)
+
+
+def find_bucket_name(bucket):
+    """A function to find the name of a pipeline s3 bucket.
+
+    The bucket list and the result are cached. If no bucket matches, the list is reloaded once
+    before giving up, so a bucket created since it was cached is still found, and the miss is
+    cached for `CONFIG_TTL_SECONDS` like any other value.
+
+    Args:
+        bucket (str): `ingestion`, `processed` or `catalog`.
+
+    Returns:
+        bucket_name (str): the name of the bucket, or None if there is no such bucket.
+    """
+
+    override = get_env_override(f"{bucket}_bucket")
+
+    if override:
+        return override
+
+    def loader():
+        for reload in [False, True]:
+            if reload:
+                with config_lock:
+                    config_cache.pop("buckets", None)
+
+            bucket_name = ""
+
+            for b in list_bucket_names():
+                if re.search(BUCKET_PATTERNS[bucket], b):
+                    bucket_name = b
+
+            if bucket_name:
+                return bucket_name
+
+        return None
+
+    return get_config(f"bucket:{bucket}", loader)
+
+
+def load_secret(secret_name):
+    """A function to get a secret from AWS Secrets Manager as a dictionary, cached.
+
+    Args:
+        secret_name (str): name of the secret, e.g. `dw_credentials`.
+
+    Returns:
+        secret_dict (dict): dictionary of the secret.
+    """
+
+    override = get_env_override(secret_name)
+
+    if override:
+        return json.loads(override)
+
+    def loader():
+        secret = get_client("secretsmanager").get_secret_value(SecretId=secret_name)
+        return json.loads(secret["SecretString"])
+
+    return dict(get_config(f"secret:{secret_name}", loader))
+
+
+def load_parameter(parameter_name):
+    """A function to get a parameter from AWS System Manager's Parameter Store.
+
+    Parameters are never cached, so the latest value is always returned.
+
+    Args:
+        parameter_name (str): name of the parameter, e.g. `last_ingested_timestamp`.
+
+    Returns:
+        value (str): the value of the parameter.
+    """
+
+    override = get_env_override(parameter_name)
+
+    if override:
+        return override
+
+    parameter = get_client("ssm", region_name="eu-west-2").get_parameter(Name=parameter_name)
+
+    return parameter["Parameter"]["Value"]
+
+
+def put_parameter(parameter_name, value):
+    """A function to save a parameter to AWS System Manager's Parameter Store.
+
+    Args:
+        parameter_name (str): name of the parameter, e.g. `last_ingested_timestamp`.
+        value (str): the value to save.
+    """
+
+    get_client("ssm", region_name="eu-west-2").put_parameter(
+        Name=parameter_name, Type="String", Value=value, Overwrite=True
+    )
+
+
+def prefetch_config(buckets=(), secrets=()):
+    """A function to load configuration values concurrently, e.g. at the start of a cold invocation.
+
+    Values already cached are not loaded again. Values that fail to load are logged and left
+    for the getter to raise when they are used.
+
+    Args:
+        buckets (list, optional): buckets to find, e.g. `["ingestion", "processed"]`.
+        secrets (list, optional): secrets to load, e.g. `["dw_credentials"]`.
+    """
+
+    loads = [
+        *[(find_bucket_name, bucket) for bucket in buckets],
+        *[(load_secret, secret_name) for secret_name in secrets],
+    ]
+
+    def load(function_and_name):
+        function, name = function_and_name
+
+        try:
+            function(name)
+        except Exception as e:
+            logger.warning(f"Could not prefetch {name}: {e}")
+
+    if not loads:
+        return
+
+    # The bucket list is shared by every bucket, so it is loaded before the others.
+    if buckets:
+        load((find_bucket_name, buckets[0]))
+
+    with ThreadPoolExecutor(max_workers=len(loads)) as executor:
+        list(executor.map(load, loads))
+
+
+def clear_config_cache():
+    """A function to empty the configuration cache, e.g. between tests."""
+
+    with config_lock:
+        config_cache.clear()
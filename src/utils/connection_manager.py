@@ -0,0 +1,151 @@
+"""This module contains the definitions for `get_totesys_connection()`,
+`get_warehouse_engine()`, `get_connection_stats()` and `reset_connections()`.
+
+The totesys connection and the warehouse engine are kept in module scope, so
+warm Lambda invocations reuse them instead of fetching credentials and
+repeating the TLS and authentication handshakes on every run. The totesys
+connection is checked with `SELECT 1` before it is reused and replaced if the
+check fails. The warehouse engine pings each pooled connection as it is
+checked out and replaces it if the ping fails. pg8000 and SQLAlchemy are
+imported when the first connection or engine is created, not when this
+module is imported.
+"""
+
+import logging
+import threading
+
+from src.utils.get_secret_dict import get_secret_dict
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+connections = {}
+connection_stats = {
+    "totesys": {"connects": 0, "reuses": 0, "reconnects": 0},
+    "warehouse": {"connects": 0, "reuses": 0},
+}
+connections_lock = threading.Lock()
+
+
+def create_engine(url, **kwargs):
+    """Returns a SQLAlchemy engine from `sqlalchemy.create_engine()`, importing SQLAlchemy."""
+
+    from sqlalchemy import create_engine as sqlalchemy_create_engine
+
+    return sqlalchemy_create_engine(url, **kwargs)
+
+
+def is_alive(connection):
+    """Returns whether a pg8000 connection can still run a query."""
+
+    try:
+        cursor = connection.cursor()
+        cursor.execute("SELECT 1")
+        cursor.fetchall()
+        cursor.close()
+    except Exception as e:
+        logger.warning(f"Connection check failed: {e}")
+        return False
+
+    return True
+
+
+def get_totesys_connection():
+    """A function to get a pg8000 connection to the totesys database, reusing a live one if held.
+
+    Returns:
+        conn (class): Connection to the totesys database.
+    """
+
+    with connections_lock:
+        conn = connections.get("totesys")
+
+        if conn is not None:
+            if is_alive(conn):
+                connection_stats["totesys"]["reuses"] += 1
+                return conn
+
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+            connection_stats["totesys"]["reconnects"] += 1
+            logger.info("Reconnecting to totesys")
+
+        db_dict = get_secret_dict("db_credentials")
+
+        import pg8000
+
+        conn = pg8000.connect(**db_dict)
+        # Extraction only reads, so no transaction is held open between warm invocations.
+        conn.autocommit = True
+        connections["totesys"] = conn
+        connection_stats["totesys"]["connects"] += 1
+
+        return conn
+
+
+def get_warehouse_engine():
+    """A function to get the SQLAlchemy engine for the data warehouse, creating it once per process.
+
+    Returns:
+        engine (engine): the data warehouse engine. Pooled connections are pinged on checkout.
+    """
+
+    with connections_lock:
+        engine = connections.get("warehouse")
+
+        if engine is not None:
+            connection_stats["warehouse"]["reuses"] += 1
+            return engine
+
+        dw_dict = get_secret_dict("dw_credentials")
+
+        engine = create_engine(
+            f'postgresql+pg8000://{dw_dict["user"]}:{dw_dict["password"]}@{dw_dict["host"]}:{dw_dict["port"]}/{dw_dict["database"]}',
+            pool_pre_ping=True,
+        )  # noqa
+        connections["warehouse"] = engine
+        connection_stats["warehouse"]["connects"] += 1
+
+        return engine
+
+
+def get_connection_stats():
+    """A function to get the connection manager's statistics.
+
+    Returns:
+        stats (dict): for `totesys`, the number of `connects`, `reuses` and `reconnects` in this
+        process. For `warehouse`, the number of engines created (`connects`) and `reuses`, and the
+        engine's `pool` status if it has been created.
+    """
+
+    with connections_lock:
+        stats = {name: dict(counts) for name, counts in connection_stats.items()}
+
+        if "warehouse" in connections:
+            stats["warehouse"]["pool"] = connections["warehouse"].pool.status()
+
+    return stats
+
+
+def reset_connections():
+    """A function to close the held connections and dispose of the engine, e.g. between tests."""
+
+    with connections_lock:
+        conn = connections.pop("totesys", None)
+        engine = connections.pop("warehouse", None)
+
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+        if engine is not None:
+            engine.dispose()
+
+        for counts in connection_stats.values():
+            for name in counts:
+                counts[name] = 0
@@ -11,9 +11,4 @@ def drop_created_and_updated(data_frame):
         df (data frame): the new data frame with created_at and last_updated columns removed.
     """
 
-    df = data_frame.copy(deep=True)
-
-    df.drop("created_at", axis=1, inplace=True)
-    df.drop("last_updated", axis=1, inplace=True)
-
-    return df
+    return data_frame.drop(columns=["created_at", "last_updated"])
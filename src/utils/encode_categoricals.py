@@ -0,0 +1,53 @@
+"""This module contains the definition for `encode_categoricals()`.
+
+Low-cardinality string columns, e.g. `country` or `department_name`, repeat a
+few distinct values across every row. Encoding them as pandas categoricals or
+Arrow dictionary arrays stores each distinct value once plus an integer code
+per row. Parquet keeps the encoding, so files written by `df_to_parquet()` are
+read back by `parquet_file_reader()` and `parquet_table_reader()` with the
+same types.
+"""
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def encode_categoricals(data, columns):
+    """A function to encode low-cardinality columns of a data frame or Arrow table.
+
+    Categories are sorted, so both engines produce the same categories in the same order.
+
+    Args:
+        data (data frame or Arrow table): the data to encode.
+        columns (list): names of the columns to encode. Columns not in `data` are ignored.
+
+    Returns:
+        data (data frame or Arrow table): the data with the columns encoded as pandas
+        categoricals or Arrow dictionary arrays.
+    """
+
+    if isinstance(data, pa.Table):
+        for column in columns:
+            if column not in data.column_names:
+                continue
+
+            values = data[column]
+
+            if pa.types.is_dictionary(values.type):
+                continue
+
+            categories = pc.unique(values).drop_null()
+            categories = pc.take(categories, pc.array_sort_indices(categories))
+            indices = pc.index_in(values, value_set=categories).combine_chunks()
+
+            data = data.set_column(
+                data.column_names.index(column),
+                column,
+                pa.DictionaryArray.from_arrays(indices, categories),
+            )
+
+        return data
+
+    columns = [column for column in columns if column in data.columns]
+
+    return data.astype({column: "category" for column in columns})
@@ -0,0 +1,369 @@
+"""This module contains the definitions for `get_primary_key()`,
+`build_catalog_entry()`, `get_catalog()`, `put_catalog()`,
+`add_catalog_entries()`, `backfill_catalog()`, `backfill_catalogs()`,
+`update_catalog()` and `query_catalog()`.
+
+The catalog is a Parquet index with one row per file written to the
+ingestion or processed bucket. It is stored in the catalog bucket (which has
+no lambda triggers) at `<data bucket name>/<table name>.parquet`, so files
+can be located without listing the data buckets.
+
+A catalog only covers the whole archive once the files written before it
+existed have been backfilled into it with `make backfill-catalog`. This is
+recorded in the catalog's `complete` attribute, and catalogs without it are
+ignored by readers, which list the bucket instead.
+"""
+
+import io
+import logging
+
+import pandas as pd
+import pyarrow as pa
+
+from src.utils.bloom_filter import create_bloom_filter
+from src.utils.client_factory import get_client
+from src.utils.get_bucket_name import BucketNotFoundError, get_bucket_name
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+# The number of files a backfill reads between saves of the catalog.
+BACKFILL_BATCH_SIZE = 100
+
+CATALOG_COLUMNS = [
+    "key",
+    "table_name",
+    "run_id",
+    "row_count",
+    "min_last_updated",
+    "max_last_updated",
+    "primary_key",
+    "min_primary_key",
+    "max_primary_key",
+    "primary_key_bloom",
+]
+
+
+def get_primary_key(table_name, columns):
+    """A function to find the primary key column of a table.
+
+    Args:
+        table_name (str): name of the table, e.g. `staff` or `dim_location`.
+        columns (list): column names of the table.
+
+    Returns:
+        primary_key (str): name of the primary key column, or None if the table has no `<table>_id` column.
+    """
+
+    base_name = table_name.removeprefix("dim_").removeprefix("fact_")
+    primary_key = f"{base_name}_id"
+
+    if primary_key in columns:
+        return primary_key
+
+    return None
+
+
+def build_catalog_entry(df, file_path):
+    """A function to build the catalog entry for a data frame written to a bucket.
+
+    Args:
+        df (data frame or Arrow table): the data that was written.
+        file_path (str): key the data frame was written to.
+        e.g. `tablename/YYYY-MM-DD/HH:MM:SS.SSSSSS.parquet`
+
+    Returns:
+        entry (dict): catalog entry with the columns listed in CATALOG_COLUMNS.
+    """
+
+    split_path = file_path.split("/")
+    table_name = split_path[0]
+
+    if isinstance(df, pa.Table):
+        summary_columns = [
+            column
+            for column in [get_primary_key(table_name, df.column_names), "last_updated"]
+            if column in df.column_names
+        ]
+        df = df.select(summary_columns).to_pandas()
+
+    run_id = f"{split_path[1]} {split_path[2].removesuffix('.parquet')}"
+
+    entry = {
+        "key": file_path,
+        "table_name": table_name,
+        "run_id": run_id,
+        "row_count": len(df),
+        "min_last_updated": None,
+        "max_last_updated": None,
+        "primary_key": None,
+        "min_primary_key": None,
+        "max_primary_key": None,
+        "primary_key_bloom": None,
+    }
+
+    if "last_updated" in df.columns and len(df) > 0:
+        last_updated = pd.to_datetime(df["last_updated"])
+        entry["min_last_updated"] = last_updated.min()
+        entry["max_last_updated"] = last_updated.max()
+
+    primary_key = get_primary_key(table_name, df.columns)
+
+    if primary_key is not None and len(df) > 0:
+        entry["primary_key"] = primary_key
+        entry["min_primary_key"] = int(df[primary_key].min())
+        entry["max_primary_key"] = int(df[primary_key].max())
+        entry["primary_key_bloom"] = create_bloom_filter(df[primary_key].to_numpy())
+
+    return entry
+
+
+def get_catalog(table_name, bucket_name, include_incomplete=False):
+    """A function to retrieve the catalog of a table's files in a bucket.
+
+    Args:
+        table_name (str): name of the table, e.g. `staff`.
+        bucket_name (str): name of the data bucket the table's files are stored in.
+        include_incomplete (bool, optional): whether to return a catalog that has not been
+        backfilled, and so may be missing older files. Defaults to False.
+
+    Returns:
+        catalog (data frame): one row per catalogued file, or None if there is no complete catalog for the table.
+    """
+
+    try:
+        catalog_bucket = get_bucket_name("catalog")
+    except BucketNotFoundError:
+        return None
+
+    s3 = get_client("s3")
+
+    try:
+        response = s3.get_object(
+            Bucket=catalog_bucket, Key=f"{bucket_name}/{table_name}.parquet"
+        )
+    except s3.exceptions.NoSuchKey:
+        return None
+
+    catalog = pd.read_parquet(io.BytesIO(response["Body"].read()))
+
+    if not include_incomplete and not catalog.attrs.get("complete", False):
+        logger.info(f"{bucket_name} catalog for {table_name} is not backfilled - ignoring it.")
+        return None
+
+    return catalog
+
+
+def put_catalog(catalog, table_name, bucket_name, complete=True):
+    """A function to write a table's catalog to the catalog bucket.
+
+    Args:
+        catalog (data frame): one row per catalogued file, with the columns listed in CATALOG_COLUMNS.
+        table_name (str): name of the table, e.g. `staff`.
+        bucket_name (str): name of the data bucket the table's files are stored in.
+        complete (bool, optional): whether the catalog covers every file of the table. Defaults to True.
+
+    Returns:
+        catalog (data frame): the catalog as written.
+    """
+
+    catalog = catalog.astype(
+        {
+            "row_count": "int64",
+            "min_last_updated": "datetime64[us]",
+            "max_last_updated": "datetime64[us]",
+            "min_primary_key": "Int64",
+            "max_primary_key": "Int64",
+        }
+    )
+    catalog.attrs = {"complete": complete}
+
+    s3 = get_client("s3")
+
+    s3.put_object(
+        Bucket=get_bucket_name("catalog"),
+        Key=f"{bucket_name}/{table_name}.parquet",
+        Body=catalog.to_parquet(index=False),
+    )
+
+    return catalog
+
+
+def add_catalog_entries(entries, table_name, bucket_name, complete=None):
+    """A function to add entries to a table's catalog, replacing any existing entries for the same keys.
+
+    Args:
+        entries (list): catalog entries from `build_catalog_entry()`.
+        table_name (str): name of the table, e.g. `staff`.
+        bucket_name (str): name of the data bucket the table's files are stored in.
+        complete (bool, optional): whether the catalog now covers every file of the table.
+        Defaults to keeping the current catalog's state. A new catalog is complete if the table
+        has no other files.
+
+    Returns:
+        catalog (data frame): the catalog as written.
+    """
+
+    catalog = get_catalog(table_name, bucket_name, include_incomplete=True)
+    new_entries = pd.DataFrame(entries, columns=CATALOG_COLUMNS)
+
+    if complete is None and catalog is not None:
+        complete = catalog.attrs.get("complete", False)
+    elif complete is None:
+        # A table's first file starts a complete catalog, which one small listing shows.
+        response = get_client("s3").list_objects_v2(
+            Bucket=bucket_name, Prefix=f"{table_name}/", MaxKeys=len(entries) + 1
+        )
+        listed_keys = {item["Key"] for item in response.get("Contents", [])}
+        complete = listed_keys <= set(new_entries["key"])
+
+    if catalog is not None and entries:
+        catalog = pd.concat([catalog, new_entries], ignore_index=True)
+        catalog = catalog.drop_duplicates(subset="key", keep="last")
+    elif catalog is None:
+        catalog = new_entries
+
+    return put_catalog(catalog, table_name, bucket_name, complete=complete)
+
+
+def backfill_catalog(table_name, bucket_name):
+    """A function to add every file of a table missing from its catalog, e.g. files written before the catalog existed.
+
+    Files are read one at a time and the catalog is saved every `BACKFILL_BATCH_SIZE` files, so an
+    interrupted backfill resumes where it stopped. The catalog is marked complete at the end.
+    Run with `make backfill-catalog`, not from the lambdas, as it reads the table's whole history.
+
+    Args:
+        table_name (str): name of the table, e.g. `staff`.
+        bucket_name (str): name of the data bucket the table's files are stored in.
+
+    Returns:
+        backfilled (int): the number of files added to the catalog.
+    """
+
+    from src.utils.parquet_file_reader import parquet_file_reader
+
+    catalog = get_catalog(table_name, bucket_name, include_incomplete=True)
+    catalogued_keys = set() if catalog is None else set(catalog["key"])
+
+    s3 = get_client("s3")
+    paginator = s3.get_paginator("list_objects_v2")
+
+    entries = []
+    backfilled = 0
+
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=f"{table_name}/"):
+        for item in page.get("Contents", []):
+            if item["Key"] in catalogued_keys:
+                continue
+
+            df = parquet_file_reader(item["Key"], bucket_name)
+            entries.append(build_catalog_entry(df, item["Key"]))
+
+            if len(entries) == BACKFILL_BATCH_SIZE:
+                add_catalog_entries(entries, table_name, bucket_name)
+                backfilled += len(entries)
+                entries = []
+
+    add_catalog_entries(entries, table_name, bucket_name, complete=True)
+    backfilled += len(entries)
+
+    logger.info(f"{backfilled} {table_name} files backfilled into {bucket_name} catalog.")
+
+    return backfilled
+
+
+def backfill_catalogs(bucket_name):
+    """A function to backfill the catalog of every table in a bucket with `backfill_catalog()`.
+
+    Prefixes starting with `_`, e.g. compacted files and snapshots, are not tables and are skipped.
+
+    Args:
+        bucket_name (str): name of the data bucket, e.g. the ingestion bucket.
+
+    Returns:
+        backfilled (dict): the number of files added to each table's catalog.
+    """
+
+    s3 = get_client("s3")
+    paginator = s3.get_paginator("list_objects_v2")
+
+    table_names = [
+        common_prefix["Prefix"].rstrip("/")
+        for page in paginator.paginate(Bucket=bucket_name, Delimiter="/")
+        for common_prefix in page.get("CommonPrefixes", [])
+        if not common_prefix["Prefix"].startswith("_")
+    ]
+
+    return {
+        table_name: backfill_catalog(table_name, bucket_name) for table_name in table_names
+    }
+
+
+def update_catalog(df, file_path, bucket_name):
+    """A function to record a newly written file in the catalog.
+
+    Only the new file's entry is added; an existing entry for the same key is replaced, so
+    redelivered writes do not produce duplicate entries. If a table already has files when its
+    first write is catalogued, the catalog is incomplete, and readers ignore it until
+    `backfill_catalog()` has catalogued the older files. Cataloguing never fails the write: if the catalog bucket does not exist or the update
+    fails, it is logged and skipped.
+
+    Args:
+        df (data frame): the data frame that was written.
+        file_path (str): key the data frame was written to.
+        bucket_name (str): name of the data bucket the file was written to.
+    """
+
+    try:
+        get_bucket_name("catalog")
+    except BucketNotFoundError:
+        logger.warning(f"Catalog bucket not found - {file_path} not catalogued.")
+        return
+
+    try:
+        entry = build_catalog_entry(df, file_path)
+        add_catalog_entries([entry], entry["table_name"], bucket_name)
+    except Exception as e:
+        logger.error(f"{file_path} not catalogued: {e}")
+        return
+
+    logger.info(f"{file_path} added to {bucket_name} catalog.")
+
+
+def query_catalog(
+    table_name,
+    bucket_name,
+    updated_after=None,
+    updated_before=None,
+):
+    """A function to find the keys of a table's files from the catalog without listing the bucket.
+
+    Args:
+        table_name (str): name of the table, e.g. `staff`.
+        bucket_name (str): name of the data bucket the table's files are stored in.
+        updated_after (str, optional): only return files containing rows updated after this timestamp.
+        updated_before (str, optional): only return files containing rows updated at or before this timestamp.
+
+    Returns:
+        keys (list): keys of the matching files in run order, or None if there is no complete catalog for the table.
+    """
+
+    catalog = get_catalog(table_name, bucket_name)
+
+    if catalog is None:
+        return None
+
+    if updated_after is not None:
+        catalog = catalog[
+            catalog["max_last_updated"].isna()
+            | (catalog["max_last_updated"] > pd.Timestamp(updated_after))
+        ]
+
+    if updated_before is not None:
+        catalog = catalog[
+            catalog["min_last_updated"].isna()
+            | (catalog["min_last_updated"] <= pd.Timestamp(updated_before))
+        ]
+
+    return catalog.sort_values("run_id")["key"].tolist()
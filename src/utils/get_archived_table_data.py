@@ -1,14 +1,19 @@
 """This module contains the definition for `get_archived_table_data()`."""
 
 import pandas as pd
-import boto3
 
+from src.utils.compaction_manifest import apply_compaction_manifest
+from src.utils.file_catalog import query_catalog
+from src.utils.get_table_as_of import list_table_files
 from src.utils.parquet_file_reader import parquet_file_reader
 
 
 def get_archived_table_data(table_name, bucket_name):
     """A function to retrieve all file data from specified table in an s3 bucket and return it as a joined data frame.
 
+    Files are located using the file catalog where a complete one exists for the table, otherwise by listing the bucket.
+    Small files that have been compacted are read from their compacted file instead.
+
     Args:
         table_name (str): string of the table name that you wish to retrieve data for.
         bucket_name (str): name of the s3 bucket where data is stored
@@ -17,36 +22,32 @@ def get_archived_table_data(table_name, bucket_name):
         df (data frame): a data frame with all of the data from the passed table name combined.
     """
 
-    s3 = boto3.client("s3")
+    files_list = query_catalog(table_name, bucket_name)
 
-    response = s3.list_objects(
-        Bucket=bucket_name,
-        Prefix=f"{table_name}/",
-        Delimiter="/",
-    )
+    if files_list is None:
+        files_list = list_archived_table_files(table_name, bucket_name)
 
-    subfolders = [
-        common_prefix["Prefix"] for common_prefix in response.get("CommonPrefixes", [])
-    ]
+    files_list = apply_compaction_manifest(table_name, bucket_name, files_list)
 
     merged_df = pd.DataFrame()
 
-    files_list = []
-
-    for folder in subfolders:
-        folder_response = s3.list_objects(
-            Bucket=bucket_name,
-            Prefix=folder,
-        )
-        folder_objects = folder_response.get("Contents")
-
-        file = [item["Key"] for item in folder_objects]
-
-        files_list.append(file[0])
-
     for file in files_list:
         file_df = parquet_file_reader(file, bucket_name)
 
         merged_df = pd.concat([merged_df, file_df], ignore_index=True)
 
     return merged_df
+
+
+def list_archived_table_files(table_name, bucket_name):
+    """A function to list the files for a table in an s3 bucket.
+
+    Args:
+        table_name (str): string of the table name that you wish to list files for.
+        bucket_name (str): name of the s3 bucket where data is stored
+
+    Returns:
+        files_list (list): keys of every file found, in run order, as returned by the file catalog.
+    """
+
+    return list_table_files(f"{table_name}/", bucket_name)
@@ -1,16 +1,18 @@
 """This module contains the definition for `get_bucket_name()`."""
 
 import logging
-import re
 
-import boto3
+from src.utils.config_provider import BUCKET_PATTERNS, find_bucket_name
 
 
 def get_bucket_name(bucket):
     """A function to get the name of an s3 bucket.
 
+    The name is cached by the configuration provider and can be overridden with the
+    `CONFIG_<BUCKET>_BUCKET` environment variable, e.g. `CONFIG_INGESTION_BUCKET`.
+
     Args:
-        bucket (str): the bucket that you want to access the name of (either ingestion or processed_data)
+        bucket (str): the bucket that you want to access the name of (either ingestion, processed or catalog)
 
     Returns:
         bucket_name (str): a string of the name of the bucket.
@@ -19,30 +21,16 @@ def get_bucket_name(bucket):
     logger = logging.getLogger("MyLogger")
     logger.setLevel(logging.INFO)
 
-    if bucket == "ingestion":
-        pattern = "totesys-etl-ingestion-bucket-*"
-    elif bucket == "processed":
-        pattern = "totesys-etl-processed-data-bucket-*"
-    else:
+    if bucket not in BUCKET_PATTERNS:
         raise InvalidArgumentError(
             logging.error(
-                f"InvalidArgumentError: {bucket}. Valid arguments are `ingestion` or `processed`."
+                f"InvalidArgumentError: {bucket}. Valid arguments are `ingestion`, `processed` or `catalog`."
             )
         )
 
-    s3 = boto3.client("s3")
-
-    response = s3.list_buckets()
-
-    bucket_names = [bucket["Name"] for bucket in response["Buckets"]]
-
-    bucket_name = ""
-
-    for b in bucket_names:
-        if re.search(pattern, b):
-            bucket_name = b
+    bucket_name = find_bucket_name(bucket)
 
-    if len(bucket_name) == 0:
+    if bucket_name is None:
         raise BucketNotFoundError(
             logging.error(f"BucketNotFoundError: {bucket} bucket not found.")
         )
@@ -51,7 +39,7 @@ def get_bucket_name(bucket):
 
 
 class InvalidArgumentError(Exception):
-    """Catches arguments other than `ingestion` and `processed`."""
+    """Catches arguments other than `ingestion`, `processed` and `catalog`."""
 
 
 class BucketNotFoundError(Exception):
@@ -0,0 +1,103 @@
+"""This module contains the definitions for `find_files_for_keys()` and
+`get_rows_by_primary_key()`."""
+
+import numpy as np
+import pandas as pd
+
+from src.utils.bloom_filter import bloom_filter_may_contain
+from src.utils.file_catalog import get_catalog, get_primary_key
+from src.utils.get_archived_table_data import get_archived_table_data
+from src.utils.parquet_file_reader import parquet_file_reader
+
+
+def find_files_for_keys(table_name, bucket_name, keys):
+    """A function to find the files of a table that may contain any of the passed primary keys.
+
+    Files are ruled out using the primary key range and bloom filter recorded in the file catalog.
+    The small files that remain are read directly, not through the compaction manifest, as a
+    compacted file holds a whole day and has no bloom filter to rule it out.
+
+    Args:
+        table_name (str): name of the table, e.g. `address`.
+        bucket_name (str): name of the s3 bucket where data is stored.
+        keys (list): primary key values to look for.
+
+    Returns:
+        files (list): keys of the files that may contain the passed keys in run order, or None if there is no catalog for the table.
+    """
+
+    catalog = get_catalog(table_name, bucket_name)
+
+    if catalog is None:
+        return None
+
+    keys = np.unique(np.asarray(keys, dtype="int64"))
+    files = []
+
+    for entry in catalog.sort_values("run_id").to_dict("records"):
+        if pd.isna(entry["min_primary_key"]):
+            files.append(entry["key"])
+            continue
+
+        in_range = keys[
+            (keys >= entry["min_primary_key"]) & (keys <= entry["max_primary_key"])
+        ]
+
+        if len(in_range) == 0:
+            continue
+
+        bloom_filter = entry.get("primary_key_bloom")
+
+        if pd.isna(bloom_filter) or bloom_filter_may_contain(bloom_filter, in_range).any():
+            files.append(entry["key"])
+
+    return files
+
+
+def get_rows_by_primary_key(table_name, bucket_name, keys):
+    """A function to retrieve the latest version of each passed primary key from a table's archived files.
+
+    Only the files that may contain the keys are read, so the cost is proportional to the keys requested rather than the table's history.
+
+    Args:
+        table_name (str): name of the table, e.g. `address`.
+        bucket_name (str): name of the s3 bucket where data is stored.
+        keys (list): primary key values to retrieve.
+
+    Returns:
+        df (data frame): one row per key found, the most recently updated version of each.
+
+    Raises:
+        ValueError if the table has no natural key column.
+    """
+
+    files = find_files_for_keys(table_name, bucket_name, keys)
+
+    if files is None:
+        df = get_archived_table_data(table_name, bucket_name)
+    elif len(files) == 0:
+        return pd.DataFrame()
+    else:
+        df = pd.concat(
+            [parquet_file_reader(file, bucket_name) for file in files],
+            ignore_index=True,
+        )
+
+    if df.empty:
+        return df
+
+    primary_key = get_primary_key(table_name, df.columns)
+
+    if primary_key is None:
+        raise ValueError(
+            f"Invalid Input: {table_name} data has no natural key column."
+        )
+
+    df = df[df[primary_key].isin(keys)]
+
+    if "last_updated" in df.columns:
+        df = df.sort_values("last_updated", kind="stable")
+
+    df = df.drop_duplicates(subset=primary_key, keep="last")
+
+    return df.sort_values(primary_key).reset_index(drop=True)
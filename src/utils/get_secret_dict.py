@@ -1,14 +1,14 @@
 """This module contains the definition for `get_secret_dict()`."""
 
-import json
-import logging
-
-import boto3
+from src.utils.config_provider import load_secret
 
 
 def get_secret_dict(secret_name: str) -> dict:
     """A function to retrieve a secret from AWS Secrets Manager and return it as a dictionary.
 
+    The secret is cached by the configuration provider and can be overridden with the
+    `CONFIG_<SECRET_NAME>` environment variable holding the secret as JSON.
+
     Args:
         secret_name (str): string of the name of the secret to be retrieved.
 
@@ -16,9 +16,4 @@ def get_secret_dict(secret_name: str) -> dict:
         secret_dict (dict): dictionary of the retrieved secret.
     """
 
-    sm = boto3.client("secretsmanager")
-    secret = sm.get_secret_value(SecretId=secret_name)
-    secret_string = secret["SecretString"]
-    secret_dict = json.loads(secret_string)
-
-    return secret_dict
+    return load_secret(secret_name)
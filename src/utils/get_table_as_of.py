@@ -0,0 +1,165 @@
+"""This module contains the definitions for `get_table_as_of()`,
+`create_table_snapshot()`, `get_key_timestamp()` and `list_table_files()`.
+
+A snapshot is the full state of a table as of a timestamp, stored in the
+ingestion bucket at `_snapshots/<table name>/<date>/<time>.parquet` by the
+daily compaction job. Keys starting with `_` are ignored by the transform
+lambda.
+"""
+
+import logging
+
+import pandas as pd
+
+from src.utils.client_factory import get_client
+from src.utils.compaction_manifest import apply_compaction_manifest
+from src.utils.file_catalog import get_primary_key, query_catalog
+from src.utils.parquet_file_reader import parquet_file_reader
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+SNAPSHOT_PREFIX = "_snapshots"
+
+
+def get_key_timestamp(file_path):
+    """A function to get the run timestamp encoded in a key.
+
+    Args:
+        file_path (str): key in the format `<prefix>/YYYY-MM-DD/HH:MM:SS.SSSSSS.parquet`
+
+    Returns:
+        timestamp (timestamp): the timestamp the file was written for.
+    """
+
+    split_path = file_path.removesuffix(".parquet").split("/")
+
+    return pd.Timestamp(f"{split_path[-2]} {split_path[-1]}")
+
+
+def list_table_files(prefix, bucket_name):
+    """A function to list every file under a prefix in an s3 bucket.
+
+    Args:
+        prefix (str): the prefix to list, e.g. `counterparty/`.
+        bucket_name (str): name of the s3 bucket.
+
+    Returns:
+        files (list): sorted keys of the files found.
+    """
+
+    s3 = get_client("s3")
+    paginator = s3.get_paginator("list_objects_v2")
+
+    files = []
+
+    for page in paginator.paginate(Bucket=bucket_name, Prefix=prefix):
+        files.extend(item["Key"] for item in page.get("Contents", []))
+
+    return sorted(files)
+
+
+def get_table_as_of(table_name, bucket_name, as_of):
+    """A function to reconstruct the state of a table as of a timestamp.
+
+    The nearest snapshot taken at or before `as_of` is combined with the delta files written after it.
+    Delta files are chosen from the file catalog's last_updated ranges, or from the run timestamp in
+    their keys if the table has no catalog, so files outside the window are never read.
+
+    Args:
+        table_name (str): name of the table, e.g. `counterparty`.
+        bucket_name (str): name of the s3 bucket where data is stored.
+        as_of (str): the timestamp to reconstruct the table at, e.g. `2026-09-01 12:00`.
+
+    Returns:
+        df (data frame): the latest version of each row updated at or before `as_of`.
+    """
+
+    as_of = pd.Timestamp(as_of)
+
+    snapshots = [
+        snapshot
+        for snapshot in list_table_files(f"{SNAPSHOT_PREFIX}/{table_name}/", bucket_name)
+        if get_key_timestamp(snapshot) <= as_of
+    ]
+
+    frames = []
+    snapshot_timestamp = None
+
+    if snapshots:
+        frames.append(parquet_file_reader(snapshots[-1], bucket_name))
+        snapshot_timestamp = get_key_timestamp(snapshots[-1])
+        logger.info(f"Using snapshot {snapshots[-1]}")
+
+    delta_files = query_catalog(
+        table_name,
+        bucket_name,
+        updated_after=snapshot_timestamp,
+        updated_before=as_of,
+    )
+
+    if delta_files is None:
+        delta_files = []
+
+        for file in list_table_files(f"{table_name}/", bucket_name):
+            file_timestamp = get_key_timestamp(file)
+
+            if snapshot_timestamp is not None and file_timestamp <= snapshot_timestamp:
+                continue
+
+            delta_files.append(file)
+
+            # Rows updated before as_of are extracted by the first run after it at the latest.
+            if file_timestamp > as_of:
+                break
+
+    delta_files = apply_compaction_manifest(table_name, bucket_name, delta_files)
+
+    logger.info(f"Reading {len(delta_files)} delta files for {table_name}")
+
+    frames.extend(parquet_file_reader(file, bucket_name) for file in delta_files)
+
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, ignore_index=True)
+
+    last_updated = pd.to_datetime(df["last_updated"])
+    in_window = last_updated[last_updated <= as_of].sort_values(kind="stable")
+    df = df.loc[in_window.index]
+
+    primary_key = get_primary_key(table_name, df.columns)
+    df = df.drop_duplicates(subset=primary_key, keep="last")
+
+    return df.sort_values(primary_key).reset_index(drop=True)
+
+
+def create_table_snapshot(table_name, bucket_name, as_of):
+    """A function to save the state of a table as of a timestamp as a snapshot.
+
+    Args:
+        table_name (str): name of the table, e.g. `counterparty`.
+        bucket_name (str): name of the s3 bucket where data is stored.
+        as_of (str): the timestamp to snapshot the table at.
+
+    Returns:
+        snapshot_key (str): the key the snapshot was saved to, or None if the table had no rows.
+    """
+
+    as_of = pd.Timestamp(as_of)
+    df = get_table_as_of(table_name, bucket_name, as_of)
+
+    if df.empty:
+        logger.info(f"{table_name} has no rows as of {as_of} - no snapshot saved.")
+        return None
+
+    snapshot_key = (
+        f"{SNAPSHOT_PREFIX}/{table_name}/{as_of.strftime('%Y-%m-%d/%H:%M:%S.%f')}.parquet"
+    )
+
+    s3 = get_client("s3")
+    s3.put_object(Bucket=bucket_name, Key=snapshot_key, Body=df.to_parquet(index=False))
+
+    logger.info(f"{snapshot_key} saved to {bucket_name}")
+
+    return snapshot_key
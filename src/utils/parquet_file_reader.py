@@ -1,9 +1,12 @@
-"""This module contains the definition for `parquet_file_reader()`."""
+"""This module contains the definitions for `parquet_file_reader()`,
+`parquet_table_reader()` and `parquet_row_group_reader()`."""
 
 import io
 
-import boto3
 import pandas as pd
+import pyarrow.parquet as pq
+
+from src.utils.client_factory import get_client
 
 
 def parquet_file_reader(file_path, bucket_name):
@@ -23,7 +26,7 @@ def parquet_file_reader(file_path, bucket_name):
 
 
     """
-    s3 = boto3.client("s3")
+    s3 = get_client("s3")
 
     response = s3.get_object(Bucket=bucket_name, Key=file_path)
 
@@ -32,3 +35,45 @@ def parquet_file_reader(file_path, bucket_name):
     df = pd.read_parquet(content_in_bytes)
 
     return df
+
+
+def parquet_table_reader(file_path, bucket_name):
+    """A function to retrieve an Arrow table from a parquet file.
+
+    Args:
+        file_path (str): string of the file path to the required file.
+        e.g. `tablename/YYYY-MM-DD/HH.MM.SS.SSSSSSS`
+
+        bucket_name (str): name of the s3 bucket where the required parquet file is stored.
+
+    Returns:
+        table (pyarrow table): the table from the read parquet file.
+    """
+    s3 = get_client("s3")
+
+    response = s3.get_object(Bucket=bucket_name, Key=file_path)
+
+    file_contents = response["Body"].read()
+
+    return pq.read_table(io.BytesIO(file_contents))
+
+
+def parquet_row_group_reader(file_path, bucket_name):
+    """A function to open a parquet file so its row groups can be read one at a time.
+
+    Args:
+        file_path (str): string of the file path to the required file.
+        e.g. `tablename/YYYY-MM-DD/HH.MM.SS.SSSSSSS`
+
+        bucket_name (str): name of the s3 bucket where the required parquet file is stored.
+
+    Returns:
+        parquet_file (pyarrow parquet file): the opened file. Only its metadata has been decoded.
+    """
+    s3 = get_client("s3")
+
+    response = s3.get_object(Bucket=bucket_name, Key=file_path)
+
+    file_contents = response["Body"].read()
+
+    return pq.ParquetFile(io.BytesIO(file_contents))
@@ -0,0 +1,172 @@
+"""This module contains the definitions for `get_reverse_index()`,
+`put_reverse_index()`, `build_reverse_index()`, `update_reverse_index()` and
+`find_dependent_keys()`.
+
+A reverse index maps the primary keys of a referenced table to the primary
+keys of the rows that reference them, e.g. `address_id` to the
+`counterparty_id`s whose `legal_address_id` is that address. It is stored in
+the catalog bucket at `reverse_index/<referenced table>/<table name>.parquet`.
+"""
+
+import io
+import logging
+
+import pandas as pd
+
+from src.utils.client_factory import get_client
+from src.utils.file_catalog import get_primary_key
+from src.utils.get_archived_table_data import get_archived_table_data
+from src.utils.get_bucket_name import BucketNotFoundError, get_bucket_name
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+
+def get_reverse_index(reference_table, table_name):
+    """A function to retrieve the reverse index from a referenced table to a table.
+
+    Args:
+        reference_table (str): name of the referenced table, e.g. `address`.
+        table_name (str): name of the referencing table, e.g. `counterparty`.
+
+    Returns:
+        index (data frame): the foreign key and primary key of each referencing row, or None if there is no index.
+    """
+
+    try:
+        catalog_bucket = get_bucket_name("catalog")
+    except BucketNotFoundError:
+        return None
+
+    s3 = get_client("s3")
+
+    try:
+        response = s3.get_object(
+            Bucket=catalog_bucket,
+            Key=f"reverse_index/{reference_table}/{table_name}.parquet",
+        )
+    except s3.exceptions.NoSuchKey:
+        return None
+
+    return pd.read_parquet(io.BytesIO(response["Body"].read()))
+
+
+def put_reverse_index(index, reference_table, table_name):
+    """A function to save the reverse index from a referenced table to a table.
+
+    Args:
+        index (data frame): the foreign key and primary key of each referencing row.
+        reference_table (str): name of the referenced table, e.g. `address`.
+        table_name (str): name of the referencing table, e.g. `counterparty`.
+    """
+
+    try:
+        catalog_bucket = get_bucket_name("catalog")
+    except BucketNotFoundError:
+        logger.warning(
+            f"Catalog bucket not found - {reference_table} to {table_name} index not saved."
+        )
+        return
+
+    s3 = get_client("s3")
+
+    s3.put_object(
+        Bucket=catalog_bucket,
+        Key=f"reverse_index/{reference_table}/{table_name}.parquet",
+        Body=index.to_parquet(index=False),
+    )
+
+    logger.info(f"{reference_table} to {table_name} index updated.")
+
+
+def build_reverse_index(table_name, reference_table, foreign_key, bucket_name):
+    """A function to build the reverse index from a referenced table to a table from the table's archived data.
+
+    Args:
+        table_name (str): name of the referencing table, e.g. `counterparty`.
+        reference_table (str): name of the referenced table, e.g. `address`.
+        foreign_key (str): the column holding the reference, e.g. `legal_address_id`.
+        bucket_name (str): name of the s3 bucket the referencing table is stored in.
+
+    Returns:
+        index (data frame): the foreign key and primary key of the latest version of each row.
+    """
+
+    df = get_archived_table_data(table_name, bucket_name)
+    primary_key = get_primary_key(table_name, df.columns)
+
+    if df.empty or primary_key is None:
+        return pd.DataFrame(columns=[foreign_key, f"{table_name}_id"], dtype="int64")
+
+    if "last_updated" in df.columns:
+        df = df.sort_values("last_updated", kind="stable")
+
+    index = (
+        df[[foreign_key, primary_key]]
+        .drop_duplicates(subset=primary_key, keep="last")
+        .astype("int64")
+        .reset_index(drop=True)
+    )
+
+    put_reverse_index(index, reference_table, table_name)
+
+    return index
+
+
+def update_reverse_index(df, table_name, reference_table, foreign_key, bucket_name):
+    """A function to record the references held by new rows of a table in its reverse index.
+
+    Any existing entry for a row is replaced, so rows that change their reference are only
+    indexed under the new one. If the table has no reverse index yet, one is built from its
+    archived data, which includes the new rows.
+
+    Args:
+        df (data frame): the new rows, containing the table's primary key and `foreign_key`.
+        table_name (str): name of the referencing table, e.g. `counterparty`.
+        reference_table (str): name of the referenced table, e.g. `address`.
+        foreign_key (str): the column holding the reference, e.g. `legal_address_id`.
+        bucket_name (str): name of the s3 bucket the referencing table is stored in.
+    """
+
+    index = get_reverse_index(reference_table, table_name)
+
+    if index is None:
+        build_reverse_index(table_name, reference_table, foreign_key, bucket_name)
+        return
+
+    primary_key = get_primary_key(table_name, df.columns)
+
+    index = (
+        pd.concat([index, df[[foreign_key, primary_key]]], ignore_index=True)
+        .drop_duplicates(subset=primary_key, keep="last")
+        .astype("int64")
+        .reset_index(drop=True)
+    )
+
+    put_reverse_index(index, reference_table, table_name)
+
+
+def find_dependent_keys(table_name, reference_table, foreign_key, keys, bucket_name):
+    """A function to find the rows of a table that reference any of the passed keys.
+
+    If the table has no reverse index yet, one is built from its archived data.
+
+    Args:
+        table_name (str): name of the referencing table, e.g. `counterparty`.
+        reference_table (str): name of the referenced table, e.g. `address`.
+        foreign_key (str): the column holding the reference, e.g. `legal_address_id`.
+        keys (list): primary key values of the referenced table.
+        bucket_name (str): name of the s3 bucket the referencing table is stored in.
+
+    Returns:
+        dependent_keys (list): sorted primary key values of the referencing rows.
+    """
+
+    index = get_reverse_index(reference_table, table_name)
+
+    if index is None:
+        index = build_reverse_index(table_name, reference_table, foreign_key, bucket_name)
+
+    dependent_keys = index.loc[index[foreign_key].isin(keys), f"{table_name}_id"]
+
+    return sorted(dependent_keys.tolist())
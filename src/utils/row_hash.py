@@ -0,0 +1,134 @@
+"""This module contains the definitions for `compute_row_hashes()`,
+`get_row_hashes()`, `find_changed_rows()` and `update_row_hashes()`.
+
+The row hash state of a table holds the content hash of the latest emitted
+version of each row, keyed by primary key. It is stored in the catalog bucket
+at `row_hashes/<table name>.parquet`.
+
+Updates read, modify and rewrite the whole state object, so concurrent
+updates of the same table would lose rows. Within an invocation a table's
+outputs are built on one worker, and the per-file and batch transforms run
+in one lambda whose reserved concurrency of one serialises invocations.
+"""
+
+import io
+import logging
+
+import numpy as np
+import pandas as pd
+
+from src.utils.client_factory import get_client
+from src.utils.file_catalog import get_primary_key
+from src.utils.get_bucket_name import BucketNotFoundError, get_bucket_name
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+
+def compute_row_hashes(df):
+    """A function to compute a content hash for each row of a data frame.
+
+    Args:
+        df (data frame): the rows to hash. Every column is hashed.
+
+    Returns:
+        row_hashes (array): one int64 hash per row.
+    """
+
+    return pd.util.hash_pandas_object(df, index=False).to_numpy().view("int64")
+
+
+def get_row_hashes(table_name):
+    """A function to retrieve the row hash state of a table.
+
+    Args:
+        table_name (str): name of the table, e.g. `dim_staff`.
+
+    Returns:
+        row_hashes (data frame): the primary key and row_hash of each emitted row, or None if there is no state.
+    """
+
+    try:
+        catalog_bucket = get_bucket_name("catalog")
+    except BucketNotFoundError:
+        return None
+
+    s3 = get_client("s3")
+
+    try:
+        response = s3.get_object(
+            Bucket=catalog_bucket, Key=f"row_hashes/{table_name}.parquet"
+        )
+    except s3.exceptions.NoSuchKey:
+        return None
+
+    return pd.read_parquet(io.BytesIO(response["Body"].read()))
+
+
+def find_changed_rows(df, table_name, row_hashes=None):
+    """A function to find the rows of a table that are new or have changed since they were last emitted.
+
+    Args:
+        df (data frame): the transformed rows.
+        table_name (str): name of the table, e.g. `dim_staff`.
+        row_hashes (array, optional): the rows' hashes, if already computed.
+
+    Returns:
+        changed (array): a boolean mask, True for each new or changed row.
+    """
+
+    if row_hashes is None:
+        row_hashes = compute_row_hashes(df)
+
+    previous_hashes = get_row_hashes(table_name)
+
+    if previous_hashes is None:
+        return np.ones(len(df), dtype=bool)
+
+    primary_key = get_primary_key(table_name, df.columns)
+
+    emitted = pd.MultiIndex.from_frame(previous_hashes[[primary_key, "row_hash"]])
+    rows = pd.MultiIndex.from_arrays([df[primary_key].to_numpy(), row_hashes])
+
+    return ~rows.isin(emitted)
+
+
+def update_row_hashes(df, table_name, row_hashes=None):
+    """A function to record emitted rows in the row hash state of a table.
+
+    If the catalog bucket does not exist the update is skipped.
+
+    Args:
+        df (data frame): the emitted rows.
+        table_name (str): name of the table, e.g. `dim_staff`.
+        row_hashes (array, optional): the rows' hashes, if already computed.
+    """
+
+    try:
+        catalog_bucket = get_bucket_name("catalog")
+    except BucketNotFoundError:
+        logger.warning(f"Catalog bucket not found - {table_name} row hashes not saved.")
+        return
+
+    if row_hashes is None:
+        row_hashes = compute_row_hashes(df)
+
+    primary_key = get_primary_key(table_name, df.columns)
+
+    state = pd.DataFrame({primary_key: df[primary_key].to_numpy(), "row_hash": row_hashes})
+    previous_hashes = get_row_hashes(table_name)
+
+    if previous_hashes is not None:
+        state = pd.concat([previous_hashes, state], ignore_index=True)
+
+    state = state.drop_duplicates(subset=primary_key, keep="last")
+
+    s3 = get_client("s3")
+
+    s3.put_object(
+        Bucket=catalog_bucket,
+        Key=f"row_hashes/{table_name}.parquet",
+        Body=state.to_parquet(index=False),
+    )
+
+    logger.info(f"{table_name} row hashes updated.")
@@ -1,6 +1,40 @@
-"""This module contains the definition for `split_created_and_updated()`."""
+"""This module contains the definitions for `split_created_and_updated()` and
+`split_timestamp()`."""
 
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+def split_timestamp(timestamps):
+    """A function to split a column of timestamps into a date column and a time column.
+
+    The split is done with Arrow compute casts, so the results are `date32` and `time64[us]`
+    columns rather than one Python object per cell.
+
+    Args:
+        timestamps (series): timestamps or strings in format `YYYY-MM-DD HH:MM:SS.SSSSSS`.
+
+    Returns:
+        dates (series): the date part of each timestamp.
+        times (series): the time part of each timestamp.
+    """
+
+    parsed = pd.to_datetime(timestamps, format="%Y-%m-%d %H:%M:%S.%f")
+    timestamp_array = pc.cast(
+        pa.array(parsed, from_pandas=True), pa.timestamp("us"), safe=False
+    )
+
+    dates = pd.Series(
+        pd.arrays.ArrowExtensionArray(pc.cast(timestamp_array, pa.date32())),
+        index=timestamps.index,
+    )
+    times = pd.Series(
+        pd.arrays.ArrowExtensionArray(pc.cast(timestamp_array, pa.time64("us"))),
+        index=timestamps.index,
+    )
+
+    return dates, times
 
 
 def split_created_and_updated(data_frame):
@@ -13,18 +47,14 @@ def split_created_and_updated(data_frame):
         df (data frame): the new data frame with created_at and last_updated columns split into date and time.
     """
 
-    df = data_frame.copy(deep=True)
+    created_date, created_time = split_timestamp(data_frame["created_at"])
+    last_updated_date, last_updated_time = split_timestamp(data_frame["last_updated"])
 
-    df["created_at"] = pd.to_datetime(df["created_at"], format="%Y-%m-%d %H:%M:%S.%f")
-    df["created_date"] = df["created_at"].dt.date
-    df["created_time"] = df["created_at"].dt.time
-    df.drop("created_at", axis=1, inplace=True)
+    df = data_frame.drop(columns=["created_at", "last_updated"])
 
-    df["last_updated"] = pd.to_datetime(
-        df["last_updated"], format="%Y-%m-%d %H:%M:%S.%f"
-    )
-    df["last_updated_date"] = df["last_updated"].dt.date
-    df["last_updated_time"] = df["last_updated"].dt.time
-    df.drop("last_updated", axis=1, inplace=True)
+    df["created_date"] = created_date
+    df["created_time"] = created_time
+    df["last_updated_date"] = last_updated_date
+    df["last_updated_time"] = last_updated_time
 
     return df
@@ -0,0 +1,110 @@
+"""This module contains the definitions for `build_currency_names()`,
+`get_static_lookup()` and `apply_static_lookup()`.
+
+A static lookup maps codes to values that do not change between runs, e.g.
+ISO 4217 currency codes to currency names. Each lookup is built once per
+process, the first time it is used, and applied to the distinct codes of a
+column only, so the cost does not grow with the number of rows.
+"""
+
+from functools import lru_cache
+import logging
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+logger = logging.getLogger("MyLogger")
+logger.setLevel(logging.INFO)
+
+
+def build_currency_names():
+    """A function to build the ISO 4217 currency code to currency name lookup.
+
+    Returns:
+        currency_names (dict): e.g. {"GBP": "British Pound", ...}.
+    """
+
+    # ccy loads its full currency and country databases on import, so only dim_currency pays for it.
+    import ccy
+
+    return {code: currency.name for code, currency in ccy.currencydb().items()}
+
+
+STATIC_LOOKUPS = {
+    "currency_name": build_currency_names,
+}
+
+
+@lru_cache(maxsize=None)
+def get_static_lookup(lookup_name):
+    """A function to get a static lookup, building it the first time it is used in the process.
+
+    Args:
+        lookup_name (str): name of the lookup, e.g. `currency_name`.
+
+    Returns:
+        lookup (dict): the lookup's code to value mapping.
+
+    Raises:
+        ValueError if `lookup_name` is not a valid lookup.
+    """
+
+    if lookup_name not in STATIC_LOOKUPS:
+        raise ValueError(
+            f"Invalid Input: {lookup_name} is not a valid lookup. Valid lookups are {list(STATIC_LOOKUPS)}."
+        )
+
+    return STATIC_LOOKUPS[lookup_name]()
+
+
+def apply_static_lookup(values, lookup_name, fallback=None):
+    """A function to map a column of codes to values with a static lookup.
+
+    The column is dictionary encoded, only its distinct codes are upper cased and looked up, and
+    the results are taken back out by each row's code, so e.g. `gbp` maps like `GBP`.
+
+    Args:
+        values (series or Arrow array): the codes to map.
+        lookup_name (str): name of the lookup, e.g. `currency_name`.
+        fallback (function, optional): called with each code missing from the lookup to get its
+        value. Missing codes map to None if not passed.
+
+    Returns:
+        mapped (series or Arrow array): the value of each code, of the same type as `values`.
+    """
+
+    lookup = get_static_lookup(lookup_name)
+
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        encoded = pc.dictionary_encode(values)
+
+        if isinstance(encoded, pa.ChunkedArray):
+            encoded = encoded.combine_chunks()
+
+        codes = encoded.dictionary.to_pylist()
+        indices = encoded.indices
+    else:
+        indices, codes = pd.factorize(values)
+
+    lookup_codes = [code.upper() if isinstance(code, str) else code for code in codes]
+
+    missing_codes = [code for code in lookup_codes if code not in lookup]
+
+    if missing_codes:
+        logger.warning(f"Codes {missing_codes} not found in the {lookup_name} lookup.")
+
+    mapped_codes = [
+        lookup[lookup_code]
+        if lookup_code in lookup
+        else (fallback(code) if fallback else None)
+        for code, lookup_code in zip(codes, lookup_codes)
+    ]
+
+    if isinstance(values, (pa.Array, pa.ChunkedArray)):
+        return pc.take(pa.array(mapped_codes), indices)
+
+    mapped = np.array(mapped_codes + [None], dtype=object)[indices]
+
+    return pd.Series(mapped, index=values.index, name=values.name)
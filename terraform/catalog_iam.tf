@@ -0,0 +1,41 @@
+resource "aws_iam_policy" "s3_catalog_policy" {
+  name        = "s3_catalog_policy"
+  description = "Policy for Lambdas to read and update the file catalog"
+
+  policy = jsonencode({
+    Version = "2012-10-17",
+    Statement = [
+      {
+        Action   = ["s3:GetObject", "s3:PutObject", "s3:ListBucket"],
+        Effect   = "Allow",
+        Resource = [
+          "arn:aws:s3:::totesys-etl-catalog-bucket-teamness-120224/*",
+          "arn:aws:s3:::totesys-etl-catalog-bucket-teamness-120224",
+        ],
+      },
+      {
+        Action   = ["s3:ListAllMyBuckets"],
+        Effect   = "Allow",
+        Resource = "*",
+      },
+    ]
+  })
+}
+
+
+resource "aws_iam_role_policy_attachment" "attach_s3_catalog_policy_extract" {
+  policy_arn = aws_iam_policy.s3_catalog_policy.arn
+  role       = aws_iam_role.lambda_extract_role.name
+}
+
+
+resource "aws_iam_role_policy_attachment" "attach_s3_catalog_policy_transform" {
+  policy_arn = aws_iam_policy.s3_catalog_policy.arn
+  role       = aws_iam_role.lambda_transform_role.name
+}
+
+
+resource "aws_iam_role_policy_attachment" "attach_s3_catalog_policy_load" {
+  policy_arn = aws_iam_policy.s3_catalog_policy.arn
+  role       = aws_iam_role.lambda_load_role.name
+}
@@ -0,0 +1,89 @@
+resource "aws_lambda_function" "compact_function" {
+  function_name = var.compact_lambda_name
+  runtime       = "python3.10"
+  handler       = "compact.lambda_handler"
+  role          = aws_iam_role.lambda_compact_role.arn
+  filename      = "../src/compact/compact_deployment_package.zip"
+  timeout       = 900
+  memory_size   = 3008
+}
+
+
+#Compacts the previous day's files once a day
+resource "aws_cloudwatch_event_rule" "compact_trigger_rule" {
+  name                = "lambda_compaction_rule"
+  description         = "Rule to trigger Lambda compaction once a day"
+  schedule_expression = "cron(30 1 * * ? *)"
+}
+
+
+resource "aws_cloudwatch_event_target" "compact_lambda_target" {
+  rule      = aws_cloudwatch_event_rule.compact_trigger_rule.name
+  target_id = "compact_lambda_target"
+
+  arn = aws_lambda_function.compact_function.arn
+}
+
+
+resource "aws_lambda_permission" "compact_eventbridge_permission" {
+  statement_id  = "AllowCompactionFromEventBridge"
+  action        = "lambda:InvokeFunction"
+  function_name = aws_lambda_function.compact_function.function_name
+  principal     = "events.amazonaws.com"
+  source_arn    = aws_cloudwatch_event_rule.compact_trigger_rule.arn
+}
+
+
+resource "aws_iam_role" "lambda_compact_role" {
+  name = "lambda_compact_role"
+
+  assume_role_policy = jsonencode({
+    Version = "2012-10-17",
+    Statement = [
+      {
+        Action = "sts:AssumeRole",
+        Effect = "Allow",
+        Principal = {
+          Service = "lambda.amazonaws.com"
+        }
+      }
+    ]
+  })
+}
+
+
+resource "aws_iam_policy" "s3_compact_policy" {
+  name        = "s3_compact_policy"
+  description = "Policy for Lambda to compact files in the ingestion bucket"
+
+  policy = jsonencode({
+    Version = "2012-10-17",
+    Statement = [
+      {
+        Action   = ["s3:GetObject", "s3:PutObject", "s3:ListBucket"],
+        Effect   = "Allow",
+        Resource = [
+          "arn:aws:s3:::totesys-etl-ingestion-bucket-teamness-120224/*",
+          "arn:aws:s3:::totesys-etl-ingestion-bucket-teamness-120224",
+        ],
+      },
+      {
+        Action   = ["logs:CreateLogGroup", "logs:CreateLogStream", "logs:PutLogEvents"],
+        Effect   = "Allow",
+        Resource = "*",
+      },
+    ]
+  })
+}
+
+
+resource "aws_iam_role_policy_attachment" "attach_s3_compact_policy" {
+  policy_arn = aws_iam_policy.s3_compact_policy.arn
+  role       = aws_iam_role.lambda_compact_role.name
+}
+
+
+resource "aws_iam_role_policy_attachment" "attach_s3_catalog_policy_compact" {
+  policy_arn = aws_iam_policy.s3_catalog_policy.arn
+  role       = aws_iam_role.lambda_compact_role.name
+}
@@ -0,0 +1,10 @@
+#Loads every pending processed file in dependency order in one invocation, e.g. for backfills
+resource "aws_lambda_function" "batch_load_function" {
+  function_name = var.batch_load_lambda_name
+  runtime       = "python3.10"
+  handler       = "batch_load.lambda_handler"
+  role          = aws_iam_role.lambda_load_role.arn
+  filename      = "../src/load/load_deployment_package.zip"
+  timeout       = 900
+  memory_size   = 3008
+}
@@ -31,3 +31,13 @@ resource "aws_s3_bucket" "processed_data_bucket" {
    bucket = aws_s3_bucket.processed_data_bucket.id
 }
 
+
+
+# Holds the file catalog and other metadata about the ingestion and processed
+# buckets. It has no lambda triggers, so writing to it does not start a run.
+resource "aws_s3_bucket" "catalog_bucket" {
+  bucket = "totesys-etl-catalog-bucket-teamness-120224"
+  lifecycle {
+    prevent_destroy = true
+  }
+}
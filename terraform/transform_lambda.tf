@@ -4,7 +4,17 @@ resource "aws_lambda_function" "transform_function" {
   handler       = "lambda_handler.lambda_handler"
   role          = aws_iam_role.lambda_transform_role.arn
   filename      = "../src/transform/transform_deployment_package.zip"
-  timeout       = 60
+  # Also runs the batch transform of a whole run, invoked with a run_id or keys
+  # instead of an S3 event, so it has the batch's timeout and memory.
+  timeout       = 900
+  memory_size   = 10240
+  # The row hash state, reverse indexes and file catalogs in the catalog bucket
+  # are read, modified and rewritten by each invocation, and S3 has no
+  # conditional puts in the deployed boto3, so invocations, per-file and batch,
+  # run one at a time. Reserved concurrency is per function, which is why the
+  # batch transform is not a function of its own. S3 events that are throttled
+  # are retried by Lambda, not dropped.
+  reserved_concurrent_executions = 1
 }
 
 
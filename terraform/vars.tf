@@ -13,4 +13,14 @@ variable "transform_lambda_name" {
 variable "load_lambda_name" {
   type    = string
   default = "load_sql_data"
-}
\ No newline at end of file
+}
+
+variable "compact_lambda_name" {
+  type    = string
+  default = "compact_bucket_data"
+}
+
+variable "batch_load_lambda_name" {
+  type    = string
+  default = "batch_load_sql_data"
+}
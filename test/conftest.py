@@ -0,0 +1,31 @@
+"""This module contains the fixtures shared by every test suite."""
+
+import pytest
+
+from src.utils.client_factory import reset_clients
+from src.utils.config_provider import clear_config_cache
+from src.utils.connection_manager import reset_connections
+
+
+@pytest.fixture(autouse=True)
+def reset_connection_manager():
+    """Stops connections and engines held in module scope leaking between tests."""
+    reset_connections()
+    yield
+    reset_connections()
+
+
+@pytest.fixture(autouse=True)
+def reset_config_cache():
+    """Stops bucket names and secrets cached by one test leaking into the next."""
+    clear_config_cache()
+    yield
+    clear_config_cache()
+
+
+@pytest.fixture(autouse=True)
+def reset_client_factory():
+    """Stops clients built with one test's mocked credentials being shared with the next."""
+    reset_clients()
+    yield
+    reset_clients()
@@ -0,0 +1,152 @@
+"""This module contains the test suite for `compact_table_day()` and the
+compaction `lambda_handler()`."""
+
+import io
+import json
+import os
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+import pytest
+
+from src.compact.compact import compact_table_day, lambda_handler
+from src.utils.compaction_manifest import get_compaction_manifest
+from src.utils.file_catalog import update_catalog
+from src.utils.get_archived_table_data import get_archived_table_data
+from src.utils.get_table_as_of import get_table_as_of
+from src.utils.parquet_file_reader import parquet_file_reader
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client."""
+    with mock_aws():
+        yield boto3.client("s3", region_name="eu-west-2")
+
+
+@pytest.fixture
+def department_files():
+    """Sets up two runs of department data on the same day."""
+    frames = []
+    for file in ["test_department_data2.json", "test_department_data1.json"]:
+        with open(f"test/test_transform/test_data/{file}") as f:
+            frames.append(pd.DataFrame.from_records(json.loads(f.read())["department"]))
+    return [
+        ("department/2022-11-03/14:20:51.563000.parquet", frames[0]),
+        ("department/2022-11-03/14:25:51.563000.parquet", frames[1]),
+    ]
+
+
+@pytest.fixture
+def buckets(s3, department_files):
+    """Create mock ingestion and catalog buckets with catalogued department files."""
+    for bucket in [
+        "totesys-etl-ingestion-bucket-teamness-120224",
+        "totesys-etl-catalog-bucket-teamness-120224",
+    ]:
+        s3.create_bucket(
+            Bucket=bucket,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+    for key, df in department_files:
+        s3.put_object(
+            Body=df.to_parquet(),
+            Bucket="totesys-etl-ingestion-bucket-teamness-120224",
+            Key=key,
+        )
+        update_catalog(df, key, "totesys-etl-ingestion-bucket-teamness-120224")
+
+
+@pytest.mark.describe("compact_table_day()")
+@pytest.mark.it("should write one compacted file sorted by primary key")
+def test_writes_sorted_compacted_file(s3, buckets, department_files):
+    """compact_table_day() should merge the day's files into one sorted file."""
+    bucket_name = "totesys-etl-ingestion-bucket-teamness-120224"
+    key = compact_table_day("department", bucket_name, "2022-11-03")
+    assert key.startswith("_compacted/department/2022-11-03/")
+    body = s3.get_object(Bucket=bucket_name, Key=key)["Body"].read()
+    df = pd.read_parquet(io.BytesIO(body))
+    assert len(df) == sum(len(file_df) for _, file_df in department_files)
+    assert df["department_id"].is_monotonic_increasing
+
+
+@pytest.mark.describe("compact_table_day()")
+@pytest.mark.it("should record the compacted file and its sources in the manifest")
+def test_updates_manifest(buckets, department_files):
+    """compact_table_day() should switch readers over with the manifest."""
+    bucket_name = "totesys-etl-ingestion-bucket-teamness-120224"
+    key = compact_table_day("department", bucket_name, "2022-11-03")
+    manifest = get_compaction_manifest("department", bucket_name)
+    assert manifest["days"]["2022-11-03"] == {
+        "key": key,
+        "sources": [file for file, _ in department_files],
+    }
+
+
+@pytest.mark.describe("compact_table_day()")
+@pytest.mark.it("should not compact the same files twice")
+def test_skips_compacted_day(buckets):
+    """compact_table_day() should return None for an already compacted day."""
+    bucket_name = "totesys-etl-ingestion-bucket-teamness-120224"
+    assert compact_table_day("department", bucket_name, "2022-11-03") is not None
+    assert compact_table_day("department", bucket_name, "2022-11-03") is None
+
+
+@pytest.mark.describe("compact_table_day()")
+@pytest.mark.it("should leave readers' results unchanged")
+def test_readers_use_compacted_file(buckets):
+    """get_archived_table_data() should return the same rows after compaction."""
+    bucket_name = "totesys-etl-ingestion-bucket-teamness-120224"
+    before = get_archived_table_data("department", bucket_name)
+    compact_table_day("department", bucket_name, "2022-11-03")
+    after = get_archived_table_data("department", bucket_name)
+    sort_by_id = ["department_id"]
+    assert after.sort_values(sort_by_id, ignore_index=True).equals(
+        before.sort_values(sort_by_id, ignore_index=True)
+    )
+
+
+@pytest.mark.describe("lambda_handler()")
+@pytest.mark.it("should compact the passed day for each table")
+def test_lambda_handler(buckets):
+    """lambda_handler() should return the keys of the compacted files."""
+    result = lambda_handler(
+        {"date": "2022-11-03", "tables": ["department"]},
+        {},
+    )
+    assert len(result) == 1
+
+
+@pytest.mark.describe("lambda_handler()")
+@pytest.mark.it("should snapshot each table for get_table_as_of() to start from")
+def test_lambda_handler_snapshots(s3, buckets):
+    """get_table_as_of() should read the day's snapshot instead of the day's files."""
+    bucket_name = "totesys-etl-ingestion-bucket-teamness-120224"
+    expected = get_table_as_of("department", bucket_name, "2022-11-04")
+
+    lambda_handler({"date": "2022-11-03", "tables": ["department"]}, {})
+
+    snapshot_key = "_snapshots/department/2022-11-03/23:59:59.999999.parquet"
+    assert s3.list_objects_v2(Bucket=bucket_name, Prefix="_snapshots/")["Contents"][0][
+        "Key"
+    ] == snapshot_key
+
+    with patch(
+        "src.utils.get_table_as_of.parquet_file_reader", wraps=parquet_file_reader
+    ) as reader_mock:
+        result = get_table_as_of("department", bucket_name, "2022-11-04")
+
+    assert [call.args[0] for call in reader_mock.call_args_list] == [snapshot_key]
+    assert result.equals(expected)
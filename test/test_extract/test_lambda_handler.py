@@ -62,7 +62,7 @@ def test_lambda_handler_runtime_error():
     """lamda_handler should sucessfully raise runtime errors."""
     with patch(
         "src.extract.lambda_handler.retrieve_data_from_totesys"
-    ) as mock_main:  # noqa
+    ) as mock_main, patch("src.extract.lambda_handler.prefetch_config"):  # noqa
         mock_main.side_effect = Exception("test runtime error")
 
         with pytest.raises(RuntimeError):
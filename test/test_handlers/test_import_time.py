@@ -0,0 +1,82 @@
+"""This module contains the cold import time tests for the lambda handlers.
+
+Each handler is imported in a fresh interpreter with `python -X importtime`,
+which writes the self and cumulative import time of every module to stderr.
+Wall-clock import times depend on the machine and its load, so the budget
+check only runs when `IMPORT_TIME_BUDGET_MS` is set, e.g. with
+`make import-time-budget`. The check that heavy libraries are imported lazily
+always runs.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+ROOT_DIRECTORY = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+HANDLERS = [
+    "src.extract.lambda_handler",
+    "src.transform.lambda_handler",
+    "src.transform.batch_transform",
+    "src.load.load",
+    "src.load.batch_load",
+    "src.compact.compact",
+]
+
+# Imported on first use by every handler, never when the handler is loaded.
+LAZY_MODULES = ["pandas", "pyarrow", "sqlalchemy", "boto3", "botocore", "ccy"]
+
+
+def profile_import(module_name):
+    """Imports a module in a new interpreter and returns the cumulative time in
+    microseconds of each module it imported, by module name."""
+
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module_name}"],
+        cwd=ROOT_DIRECTORY,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+
+    # Lines look like `import time:       663 |      19556 |   src.utils.client_factory`.
+    import_times = {}
+
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+
+        self_time, cumulative_time, name = line[len("import time:") :].split("|")
+
+        if cumulative_time.strip().isdigit():
+            import_times[name.strip()] = int(cumulative_time)
+
+    return import_times
+
+
+@pytest.mark.describe("lambda handlers")
+@pytest.mark.it("should import within the cold start budget")
+@pytest.mark.skipif(
+    "IMPORT_TIME_BUDGET_MS" not in os.environ,
+    reason="set IMPORT_TIME_BUDGET_MS to check import times",
+)
+@pytest.mark.parametrize("handler", HANDLERS)
+def test_import_time_budget(handler):
+    budget_ms = int(os.environ["IMPORT_TIME_BUDGET_MS"])
+
+    import_times = profile_import(handler)
+
+    assert import_times[handler] / 1000 < budget_ms
+
+
+@pytest.mark.describe("lambda handlers")
+@pytest.mark.it("should not import heavy libraries until they are used")
+@pytest.mark.parametrize("handler", HANDLERS)
+def test_heavy_imports_are_lazy(handler):
+    import_times = profile_import(handler)
+
+    assert [module for module in LAZY_MODULES if module in import_times] == []
@@ -0,0 +1,212 @@
+"""This module contains the test suite for `get_pending_files()`,
+`batch_load()` and the batch load `lambda_handler()`."""
+
+import os
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine
+
+from src.load.batch_load import (
+    TABLE_DEPENDENCIES,
+    batch_load,
+    get_pending_files,
+    lambda_handler,
+)
+from src.load.load_ledger import claim_load, get_loaded_files
+
+PROCESSED_BUCKET = "totesys-etl-processed-data-bucket-teamness-120224"
+
+RUN_PATH = "2024-02-22/18:00:20.106733.parquet"
+KEYS = [
+    f"dim_counterparty/{RUN_PATH}",
+    f"dim_staff/{RUN_PATH}",
+    f"fact_payment/{RUN_PATH}",
+    f"fact_sales_order/{RUN_PATH}",
+    "fact_sales_order/2024-02-22/19:00:00.000000.parquet",
+]
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client."""
+    with mock_aws():
+        yield boto3.client("s3", region_name="eu-west-2")
+
+
+@pytest.fixture
+def bucket(s3):
+    """Create a mock processed bucket holding a file for each key."""
+    s3.create_bucket(
+        Bucket=PROCESSED_BUCKET,
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    for i, key in enumerate(KEYS):
+        s3.put_object(
+            Bucket=PROCESSED_BUCKET,
+            Key=key,
+            Body=pd.DataFrame({"id": range(i + 1)}).to_parquet(),
+        )
+    s3.put_object(
+        Bucket=PROCESSED_BUCKET,
+        Key=f"_compacted/fact_sales_order/{RUN_PATH}",
+        Body=b"",
+    )
+
+
+@pytest.fixture
+def engine(tmp_path):
+    """Create a warehouse shared by every thread, used as the warehouse engine."""
+    engine = create_engine(f"sqlite:///{tmp_path}/warehouse.db")
+    with patch(
+        "src.utils.connection_manager.get_secret_dict",
+        return_value={
+            "user": "user",
+            "password": "password",
+            "host": "host",
+            "port": "5432",
+            "database": "database",
+        },
+    ), patch("src.utils.connection_manager.create_engine", return_value=engine):
+        yield engine
+
+
+def get_etags(s3):
+    """Returns the ETag of each table file in the processed bucket by key."""
+    response = s3.list_objects_v2(Bucket=PROCESSED_BUCKET)
+    return {
+        item["Key"]: item["ETag"].strip('"')
+        for item in response["Contents"]
+        if not item["Key"].startswith("_")
+    }
+
+
+@pytest.mark.describe("TABLE_DEPENDENCIES")
+@pytest.mark.it("should make facts depend only on dimensions")
+def test_table_dependencies():
+    for table_name, dependencies in TABLE_DEPENDENCIES.items():
+        for dependency in dependencies:
+            assert dependency.startswith("dim_")
+            assert TABLE_DEPENDENCIES[dependency] == []
+
+
+@pytest.mark.describe("get_pending_files()")
+@pytest.mark.it("should list table files that are not in the load ledger")
+def test_get_pending_files(s3, bucket, engine):
+    etags = get_etags(s3)
+
+    with engine.begin() as connection:
+        claim_load(KEYS[0], etags[KEYS[0]], "dim_counterparty", connection)
+        claim_load(KEYS[1], "old-etag", "dim_staff", connection)
+
+    with engine.begin() as connection:
+        pending_files = get_pending_files(PROCESSED_BUCKET, connection)
+
+    assert pending_files == {key: etags[key] for key in KEYS[1:]}
+
+
+@pytest.mark.describe("get_pending_files()")
+@pytest.mark.it("should only list files from the lookback before the latest loaded file")
+def test_get_pending_files_lookback(s3, bucket, engine):
+    old_key = "fact_sales_order/2024-02-20/18:00:00.000000.parquet"
+    s3.put_object(Bucket=PROCESSED_BUCKET, Key=old_key, Body=b"")
+    etags = get_etags(s3)
+
+    with engine.begin() as connection:
+        claim_load(KEYS[3], etags[KEYS[3]], "fact_sales_order", connection)
+
+    with engine.begin() as connection:
+        pending_files = get_pending_files(PROCESSED_BUCKET, connection, "fact_sales_order/")
+        assert list(pending_files) == [KEYS[4]]
+
+        pending_files = get_pending_files(
+            PROCESSED_BUCKET, connection, "fact_sales_order/", lookback_days=None
+        )
+        assert list(pending_files) == [old_key, KEYS[4]]
+
+
+@pytest.mark.describe("batch_load()")
+@pytest.mark.it("should load dimensions before the facts that reference them")
+@patch("src.load.load.load_file")
+def test_batch_load_order(load_file_mock, s3, bucket, engine):
+    loaded_tables = []
+    load_file_mock.side_effect = lambda parquet_file, table_name, connection: loaded_tables.append(
+        table_name
+    )
+
+    loaded_keys = batch_load(get_etags(s3), PROCESSED_BUCKET)
+
+    assert sorted(loaded_keys) == sorted(KEYS)
+    assert sorted(loaded_tables[:2]) == ["dim_counterparty", "dim_staff"]
+    assert sorted(loaded_tables[2:]) == [
+        "fact_payment",
+        "fact_sales_order",
+        "fact_sales_order",
+    ]
+
+
+@pytest.mark.describe("batch_load()")
+@pytest.mark.it("should load each table's files in run order and record them in the ledger")
+@patch("src.load.load.load_file")
+def test_batch_load_ledger(load_file_mock, s3, bucket, engine):
+    batch_load(get_etags(s3), PROCESSED_BUCKET, max_workers=1)
+
+    fact_rows = [
+        call.args[0].metadata.num_rows
+        for call in load_file_mock.call_args_list
+        if call.args[1] == "fact_sales_order"
+    ]
+    assert fact_rows == [4, 5]
+
+    with engine.connect() as connection:
+        assert [key for key, etag in get_loaded_files(connection)] == sorted(KEYS)
+
+    load_file_mock.reset_mock()
+    assert batch_load(get_etags(s3), PROCESSED_BUCKET) == []
+    load_file_mock.assert_not_called()
+
+
+@pytest.mark.describe("batch_load()")
+@pytest.mark.it("should roll back a failed table and not load the facts that depend on it")
+@patch("src.load.load.load_file")
+def test_batch_load_failure(load_file_mock, s3, bucket, engine):
+    def load_file(parquet_file, table_name, connection):
+        if table_name == "dim_staff":
+            raise RuntimeError("dim_staff failed")
+
+    load_file_mock.side_effect = load_file
+
+    with pytest.raises(RuntimeError):
+        batch_load(get_etags(s3), PROCESSED_BUCKET)
+
+    assert {call.args[1] for call in load_file_mock.call_args_list} == {
+        "dim_counterparty",
+        "dim_staff",
+    }
+    with engine.connect() as connection:
+        assert get_loaded_files(connection) == [(KEYS[0], get_etags(s3)[KEYS[0]])]
+
+
+@pytest.mark.describe("lambda_handler()")
+@pytest.mark.it("should load the pending files named in the event")
+@patch("src.load.load.load_file")
+def test_lambda_handler_keys(load_file_mock, s3, bucket, engine):
+    loaded_keys = lambda_handler(
+        {"keys": [KEYS[1].replace(":", "%3A"), KEYS[3]]}, {}
+    )
+
+    assert sorted(loaded_keys) == [KEYS[1], KEYS[3]]
+    assert lambda_handler({}, {}) == [KEYS[0], KEYS[2], KEYS[4]]
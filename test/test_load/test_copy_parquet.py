@@ -0,0 +1,68 @@
+"""This module contains the test suite for `iter_copy_data()` and `copy_parquet()`."""
+
+import csv
+import datetime
+import io
+from unittest.mock import MagicMock
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.load.copy_parquet import copy_parquet, iter_copy_data
+
+
+@pytest.fixture
+def parquet_file():
+    """Create a parquet file of 5 rows in row groups of 2."""
+    table = pa.table(
+        {
+            "sales_order_id": [1, 2, 3, 4, 5],
+            "design_name": ["Wooden", None, "", 'Say "hi", world', "Steel"],
+            "agreed_delivery_date": [datetime.date(2024, 2, 22)] * 5,
+            "created_time": [datetime.time(18, 0, 20, 106733)] * 5,
+        }
+    )
+    buffer = io.BytesIO()
+    pq.write_table(table, buffer, row_group_size=2)
+    return pq.ParquetFile(io.BytesIO(buffer.getvalue()))
+
+
+@pytest.mark.describe("iter_copy_data()")
+@pytest.mark.it("should yield one CSV chunk per batch without crossing row groups")
+def test_iter_copy_data_batches(parquet_file):
+    chunks = list(iter_copy_data(parquet_file, batch_size=10))
+    assert len(chunks) == 3
+    assert [len(chunk.splitlines()) for chunk in chunks] == [2, 2, 1]
+
+
+@pytest.mark.describe("iter_copy_data()")
+@pytest.mark.it("should encode rows as Postgres CSV, telling nulls from empty strings")
+def test_iter_copy_data_encoding(parquet_file):
+    copy_data = b"".join(iter_copy_data(parquet_file)).decode()
+    lines = copy_data.splitlines()
+    assert lines[0] == '1,"Wooden",2024-02-22,18:00:20.106733'
+    assert lines[1] == "2,,2024-02-22,18:00:20.106733"
+    assert lines[2] == '3,"",2024-02-22,18:00:20.106733'
+    assert list(csv.reader(io.StringIO(lines[3])))[0][1] == 'Say "hi", world'
+
+
+@pytest.mark.describe("copy_parquet()")
+@pytest.mark.it("should stream the file to COPY FROM STDIN on the driver connection")
+def test_copy_parquet(parquet_file):
+    connection = MagicMock()
+    cursor = connection.connection.cursor.return_value
+    streamed = []
+    cursor.execute.side_effect = lambda sql, stream: streamed.extend(stream)
+
+    rows = copy_parquet(parquet_file, "fact_sales_order", connection, batch_size=2)
+
+    assert rows == 5
+    sql = cursor.execute.call_args.args[0]
+    assert sql == (
+        "COPY fact_sales_order (sales_order_id, design_name, agreed_delivery_date,"
+        " created_time) FROM STDIN WITH (FORMAT csv)"
+    )
+    assert len(streamed) == 3
+    assert b"".join(streamed) == b"".join(iter_copy_data(parquet_file))
+    cursor.close.assert_called_once()
@@ -0,0 +1,265 @@
+"""This module contains the test suite for the fact table partition functions."""
+
+import datetime
+import io
+from unittest.mock import MagicMock, patch
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.load.fact_partitions import (
+    count_null_dates,
+    get_file_months,
+    get_month_bounds,
+    get_partition_name,
+    load_partitioned,
+)
+
+
+def sales_file(dates, row_group_size=None, write_statistics=True):
+    """Creates a fact_sales_order parquet file with a row per created date."""
+    table = pa.table(
+        {
+            "sales_order_id": list(range(len(dates))),
+            "created_date": pa.array(dates, pa.date32()),
+        }
+    )
+    buffer = io.BytesIO()
+    pq.write_table(
+        table,
+        buffer,
+        row_group_size=row_group_size,
+        write_statistics=write_statistics,
+    )
+    return pq.ParquetFile(io.BytesIO(buffer.getvalue()))
+
+
+def warehouse(partitions, month_rows=(), partitioned=True, partition_rows=None):
+    """Creates a mock warehouse connection that records the SQL it runs.
+
+    Args:
+        partitions (list): names of the existing partitions.
+        month_rows (list): (month, row count) tuples of the staged rows.
+        partitioned (bool, optional): whether the table is partitioned.
+        partition_rows (dict, optional): the row count of existing partitions by name.
+    """
+    connection = MagicMock()
+    connection.statements = []
+    rows_by_month = dict(month_rows)
+
+    def execute(statement, parameters=None):
+        sql = str(statement)
+        connection.statements.append(sql)
+        result = MagicMock()
+        result.scalar.return_value = int(partitioned)
+        if "reltuples" in sql:
+            result.scalar.return_value = (partition_rows or {}).get(
+                parameters["partition_name"], 0
+            )
+        result.__iter__.return_value = [(partition,) for partition in partitions]
+        result.fetchall.return_value = list(month_rows)
+        result.rowcount = 0
+        # Inserts of one month's staged rows, e.g. `... WHERE created_date >= '2024-01-01' ...`.
+        if "FROM staging" in sql and ">= '" in sql:
+            month = datetime.date.fromisoformat(sql.split(">= '")[1][:10])
+            result.rowcount = rows_by_month[month]
+        if "FROM staging" in sql and "IS NULL" in sql:
+            result.rowcount = rows_by_month[None]
+        return result
+
+    connection.execute.side_effect = execute
+    return connection
+
+
+@pytest.mark.describe("get_partition_name()")
+@pytest.mark.it("should name a partition by table and month")
+def test_get_partition_name():
+    assert (
+        get_partition_name("fact_sales_order", datetime.date(2024, 2, 1))
+        == "fact_sales_order_2024_02"
+    )
+
+
+@pytest.mark.describe("get_month_bounds()")
+@pytest.mark.it("should bound a month from its first day to the next month's first day")
+def test_get_month_bounds():
+    assert get_month_bounds(datetime.date(2024, 2, 14)) == (
+        datetime.date(2024, 2, 1),
+        datetime.date(2024, 3, 1),
+    )
+    assert get_month_bounds(datetime.date(2024, 12, 31)) == (
+        datetime.date(2024, 12, 1),
+        datetime.date(2025, 1, 1),
+    )
+
+
+@pytest.mark.describe("get_file_months()")
+@pytest.mark.it("should find every month between a file's earliest and latest dates")
+def test_get_file_months():
+    parquet_file = sales_file(
+        [datetime.date(2024, 3, 5), datetime.date(2023, 12, 30), datetime.date(2024, 1, 2)],
+        row_group_size=1,
+    )
+    assert get_file_months(parquet_file, "created_date") == [
+        datetime.date(2023, 12, 1),
+        datetime.date(2024, 1, 1),
+        datetime.date(2024, 2, 1),
+        datetime.date(2024, 3, 1),
+    ]
+
+
+@pytest.mark.describe("get_file_months()")
+@pytest.mark.it("should read the column when the file has no statistics")
+def test_get_file_months_without_statistics():
+    parquet_file = sales_file(
+        [datetime.date(2024, 2, 22), None], write_statistics=False
+    )
+    assert get_file_months(parquet_file, "created_date") == [datetime.date(2024, 2, 1)]
+
+
+@pytest.mark.describe("load_partitioned()")
+@pytest.mark.it("should create missing partitions and copy small files into the table")
+@patch("src.load.fact_partitions.copy_parquet", return_value=2)
+def test_load_partitioned_copy(copy_parquet_mock):
+    parquet_file = sales_file([datetime.date(2024, 1, 31), datetime.date(2024, 2, 1)])
+    connection = warehouse(["fact_sales_order_2024_01"])
+
+    assert load_partitioned(parquet_file, "fact_sales_order", connection) == 2
+
+    created = [sql for sql in connection.statements if "PARTITION OF" in sql]
+    assert created == [
+        "CREATE TABLE IF NOT EXISTS fact_sales_order_2024_02 PARTITION OF fact_sales_order"
+        " FOR VALUES FROM ('2024-02-01') TO ('2024-03-01')"
+    ]
+    copy_parquet_mock.assert_called_once_with(parquet_file, "fact_sales_order", connection)
+
+
+@pytest.mark.describe("load_partitioned()")
+@pytest.mark.it("should copy into tables that are not partitioned")
+@patch("src.load.fact_partitions.copy_parquet", return_value=1)
+def test_load_partitioned_not_partitioned(copy_parquet_mock):
+    parquet_file = sales_file([datetime.date(2024, 1, 31)])
+    connection = warehouse([], partitioned=False)
+
+    load_partitioned(parquet_file, "fact_sales_order", connection)
+
+    assert not [sql for sql in connection.statements if "PARTITION" in sql]
+    copy_parquet_mock.assert_called_once_with(parquet_file, "fact_sales_order", connection)
+
+
+@pytest.mark.describe("load_partitioned()")
+@pytest.mark.it("should swap in bulk loaded months and insert small months into the table")
+@patch("src.load.fact_partitions.copy_parquet")
+def test_load_partitioned_swap(copy_parquet_mock, monkeypatch):
+    monkeypatch.setenv("PARTITION_SWAP_MIN_ROWS", "2")
+    parquet_file = sales_file(
+        [
+            datetime.date(2024, 1, 3),
+            datetime.date(2024, 2, 3),
+            datetime.date(2024, 2, 4),
+            datetime.date(2024, 3, 5),
+        ]
+    )
+    connection = warehouse(
+        ["fact_sales_order_2024_01", "fact_sales_order_2024_02"],
+        month_rows=[
+            (datetime.date(2024, 1, 1), 1),
+            (datetime.date(2024, 2, 1), 2),
+            (datetime.date(2024, 3, 1), 1),
+        ],
+    )
+
+    assert load_partitioned(parquet_file, "fact_sales_order", connection) == 4
+
+    copy_parquet_mock.assert_called_once_with(
+        parquet_file, "staging_fact_sales_order", connection
+    )
+    statements = connection.statements
+
+    # January has a partition and too few rows, so its rows are inserted.
+    assert (
+        "INSERT INTO fact_sales_order SELECT * FROM staging_fact_sales_order"
+        " WHERE created_date >= '2024-01-01' AND created_date < '2024-02-01'"
+    ) in statements
+    # February is rebuilt with its existing rows and swapped in.
+    assert statements.index(
+        "INSERT INTO fact_sales_order_2024_02_load SELECT * FROM fact_sales_order_2024_02"
+    ) < statements.index("ALTER TABLE fact_sales_order DETACH PARTITION fact_sales_order_2024_02")
+    # March has no partition, so it is built and attached.
+    assert (
+        "ALTER TABLE fact_sales_order ATTACH PARTITION fact_sales_order_2024_03"
+        " FOR VALUES FROM ('2024-03-01') TO ('2024-04-01')"
+    ) in statements
+    assert "ALTER TABLE fact_sales_order DETACH PARTITION fact_sales_order_2024_03" not in statements
+    assert statements[-1] == "DROP TABLE staging_fact_sales_order"
+
+
+@pytest.mark.describe("count_null_dates()")
+@pytest.mark.it("should count the rows with no date")
+def test_count_null_dates():
+    parquet_file = sales_file([datetime.date(2024, 2, 22), None, None], row_group_size=2)
+    assert count_null_dates(parquet_file, "created_date") == 2
+    assert count_null_dates(sales_file([None], write_statistics=False), "created_date") == 1
+
+
+@pytest.mark.describe("load_partitioned()")
+@pytest.mark.it("should insert rather than rewrite months with more existing rows than new")
+@patch("src.load.fact_partitions.copy_parquet")
+def test_load_partitioned_keeps_large_months(copy_parquet_mock, monkeypatch):
+    monkeypatch.setenv("PARTITION_SWAP_MIN_ROWS", "2")
+    parquet_file = sales_file([datetime.date(2024, 2, 3), datetime.date(2024, 2, 4)])
+    connection = warehouse(
+        ["fact_sales_order_2024_02"],
+        month_rows=[(datetime.date(2024, 2, 1), 2)],
+        partition_rows={"fact_sales_order_2024_02": 1_000},
+    )
+
+    assert load_partitioned(parquet_file, "fact_sales_order", connection) == 2
+
+    statements = connection.statements
+    assert (
+        "INSERT INTO fact_sales_order SELECT * FROM staging_fact_sales_order"
+        " WHERE created_date >= '2024-02-01' AND created_date < '2024-03-01'"
+    ) in statements
+    assert not [sql for sql in statements if "DETACH PARTITION" in sql]
+
+
+@pytest.mark.describe("load_partitioned()")
+@pytest.mark.it("should load rows with no date into the default partition")
+@patch("src.load.fact_partitions.copy_parquet")
+def test_load_partitioned_null_dates(copy_parquet_mock, monkeypatch):
+    monkeypatch.setenv("PARTITION_SWAP_MIN_ROWS", "2")
+    parquet_file = sales_file([datetime.date(2024, 2, 3), None])
+    connection = warehouse(
+        ["fact_sales_order_2024_02"],
+        month_rows=[(datetime.date(2024, 2, 1), 1), (None, 1)],
+    )
+
+    assert load_partitioned(parquet_file, "fact_sales_order", connection) == 2
+
+    statements = connection.statements
+    assert (
+        "CREATE TABLE IF NOT EXISTS fact_sales_order_default"
+        " PARTITION OF fact_sales_order DEFAULT"
+    ) in statements
+    assert (
+        "INSERT INTO fact_sales_order SELECT * FROM staging_fact_sales_order"
+        " WHERE created_date IS NULL"
+    ) in statements
+
+
+@pytest.mark.describe("load_partitioned()")
+@pytest.mark.it("should create the default partition before copying small files with no dates")
+@patch("src.load.fact_partitions.copy_parquet", return_value=2)
+def test_load_partitioned_copy_null_dates(copy_parquet_mock):
+    parquet_file = sales_file([datetime.date(2024, 1, 31), None])
+    connection = warehouse(["fact_sales_order_2024_01"])
+
+    load_partitioned(parquet_file, "fact_sales_order", connection)
+
+    assert (
+        "CREATE TABLE IF NOT EXISTS fact_sales_order_default"
+        " PARTITION OF fact_sales_order DEFAULT"
+    ) in connection.statements
+    copy_parquet_mock.assert_called_once_with(parquet_file, "fact_sales_order", connection)
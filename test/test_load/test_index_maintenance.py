@@ -0,0 +1,127 @@
+"""This module contains the test suite for the index maintenance functions."""
+
+import json
+import logging
+from unittest.mock import MagicMock
+
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.load.index_maintenance import (
+    analyze_table,
+    create_indexes,
+    drop_indexes,
+    get_secondary_indexes,
+    log_load_timings,
+    timed,
+)
+
+INDEXES = {
+    "fact_sales_order_design_id_idx": (
+        "CREATE INDEX fact_sales_order_design_id_idx"
+        " ON public.fact_sales_order USING btree (design_id)"
+    ),
+    "fact_sales_order_staff_id_idx": (
+        "CREATE INDEX fact_sales_order_staff_id_idx"
+        " ON public.fact_sales_order USING btree (sales_staff_id)"
+    ),
+}
+
+
+@pytest.fixture
+def connection():
+    """Create a mock Postgres connection that records the SQL it runs."""
+    connection = MagicMock()
+    connection.dialect.name = "postgresql"
+    connection.execution_options.return_value = connection
+    connection.statements = []
+
+    def execute(statement, parameters=None):
+        connection.statements.append(str(statement))
+        result = MagicMock()
+        result.__iter__.return_value = list(INDEXES.items())
+        return result
+
+    connection.execute.side_effect = execute
+    return connection
+
+
+@pytest.mark.describe("timed()")
+@pytest.mark.it("should record the run time of a step, even if it fails")
+def test_timed():
+    timings = {}
+    with timed(timings, "load"):
+        pass
+    with pytest.raises(ValueError):
+        with timed(timings, "analyze"):
+            raise ValueError
+    assert set(timings) == {"load", "analyze"}
+    assert all(seconds >= 0 for seconds in timings.values())
+
+
+@pytest.mark.describe("get_secondary_indexes()")
+@pytest.mark.it("should find no indexes to drop outside Postgres")
+def test_get_secondary_indexes_sqlite():
+    engine = create_engine("sqlite://")
+    with engine.begin() as sqlite_connection:
+        sqlite_connection.execute(text("CREATE TABLE fact_sales_order (design_id INTEGER)"))
+        sqlite_connection.execute(
+            text("CREATE INDEX fact_sales_order_design_id_idx ON fact_sales_order (design_id)")
+        )
+        assert get_secondary_indexes("fact_sales_order", sqlite_connection) == {}
+
+
+@pytest.mark.describe("drop_indexes()")
+@pytest.mark.it("should drop the secondary indexes and return their definitions")
+def test_drop_indexes(connection):
+    assert drop_indexes("fact_sales_order", connection) == INDEXES
+    assert connection.statements[1:] == [
+        "DROP INDEX fact_sales_order_design_id_idx",
+        "DROP INDEX fact_sales_order_staff_id_idx",
+    ]
+
+
+@pytest.mark.describe("create_indexes()")
+@pytest.mark.it("should recreate dropped indexes")
+def test_create_indexes(connection):
+    create_indexes(INDEXES, connection)
+    assert connection.statements == list(INDEXES.values())
+    connection.execution_options.assert_not_called()
+
+
+@pytest.mark.describe("create_indexes()")
+@pytest.mark.it("should build concurrently outside a transaction")
+def test_create_indexes_concurrently(connection):
+    create_indexes(INDEXES, connection, concurrently=True)
+    connection.execution_options.assert_called_once_with(isolation_level="AUTOCOMMIT")
+    assert connection.statements == [
+        definition.replace("CREATE INDEX", "CREATE INDEX CONCURRENTLY")
+        for definition in INDEXES.values()
+    ]
+
+
+@pytest.mark.describe("analyze_table()")
+@pytest.mark.it("should analyze the table on Postgres only")
+def test_analyze_table(connection):
+    analyze_table("fact_sales_order", connection)
+    assert connection.statements == ["ANALYZE fact_sales_order"]
+
+    engine = create_engine("sqlite://")
+    with engine.connect() as sqlite_connection:
+        analyze_table("fact_sales_order", sqlite_connection)
+
+
+@pytest.mark.describe("log_load_timings()")
+@pytest.mark.it("should log a table's timings as one JSON line")
+def test_log_load_timings(caplog):
+    with caplog.at_level(logging.INFO):
+        log_load_timings("fact_sales_order", 10, {"load": 1.5, "analyze": 0.25})
+
+    message = caplog.records[-1].getMessage()
+    assert message.startswith("fact_sales_order load timings: ")
+    assert json.loads(message.split(": ", 1)[1]) == {
+        "table_name": "fact_sales_order",
+        "rows": 10,
+        "load": 1.5,
+        "analyze": 0.25,
+    }
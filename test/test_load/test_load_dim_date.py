@@ -0,0 +1,132 @@
+"""This module contains the test suite for `get_dim_date()` and `load_dim_date()`."""
+
+import io
+import os
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.load.load_dim_date import get_dim_date, load_dim_date
+from src.transform.create_dim_date import create_dim_date
+
+CATALOG_BUCKET = "totesys-etl-catalog-bucket-teamness-120224"
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client with a catalog bucket."""
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="eu-west-2")
+        s3.create_bucket(
+            Bucket=CATALOG_BUCKET,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+        yield s3
+
+
+@pytest.fixture
+def engine():
+    """Create an in-memory warehouse with an empty dim_date table."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE dim_date (date_id TIMESTAMP, year INTEGER, month INTEGER,"
+                " day INTEGER, day_of_week INTEGER, day_name TEXT, month_name TEXT,"
+                " quarter INTEGER, last_updated_date TEXT, last_updated_time TEXT)"
+            )
+        )
+    return engine
+
+
+def read_date_ids(engine):
+    """Reads the loaded date_ids in order."""
+    return pd.read_sql(
+        "SELECT date_id FROM dim_date ORDER BY date_id", engine, parse_dates=["date_id"]
+    )["date_id"]
+
+
+@pytest.mark.describe("create_dim_date()")
+@pytest.mark.it("should use compact integer types for the date parts")
+def test_create_dim_date_types():
+    df = create_dim_date("2024-02-28", "2024-03-01")
+    assert df["year"].dtype == "int16"
+    assert [str(df[column].dtype) for column in ["month", "day", "day_of_week", "quarter"]] == [
+        "int8"
+    ] * 4
+    assert df["day_name"].tolist() == ["Wednesday", "Thursday", "Friday"]
+    assert df["month_name"].tolist() == ["February", "February", "March"]
+    assert df["day_of_week"].tolist() == [3, 4, 5]
+
+
+@pytest.mark.describe("get_dim_date()")
+@pytest.mark.it("should generate the artifact once and read it back with its types")
+def test_get_dim_date_artifact(s3):
+    with patch(
+        "src.load.load_dim_date.create_dim_date", wraps=create_dim_date
+    ) as mock_create:
+        first = get_dim_date("2024-01-01", "2024-12-31")
+        second = get_dim_date("2024-01-01", "2024-12-31")
+
+    assert mock_create.call_count == 1
+    response = s3.get_object(
+        Bucket=CATALOG_BUCKET, Key="dim_date/2024-01-01_2024-12-31.parquet"
+    )
+    saved = pd.read_parquet(io.BytesIO(response["Body"].read()))
+    pd.testing.assert_frame_equal(saved, first)
+    pd.testing.assert_frame_equal(second, first)
+    assert second["month_name"].dtype == "category"
+
+
+@pytest.mark.describe("load_dim_date()")
+@pytest.mark.it("should insert every date of the range into an empty table")
+def test_load_dim_date_inserts_range(s3, engine):
+    with engine.begin() as connection:
+        inserted = load_dim_date("2024-01-01", "2024-01-31", connection=connection)
+
+    assert inserted == 31
+    assert read_date_ids(engine).tolist() == list(
+        pd.date_range("2024-01-01", "2024-01-31")
+    )
+
+
+@pytest.mark.describe("load_dim_date()")
+@pytest.mark.it("should insert nothing and not read the artifact when re-run")
+def test_load_dim_date_is_idempotent(s3, engine):
+    with engine.begin() as connection:
+        load_dim_date("2024-01-01", "2024-01-31", connection=connection)
+
+    with patch("src.load.load_dim_date.get_dim_date") as mock_get_dim_date:
+        with engine.begin() as connection:
+            inserted = load_dim_date("2024-01-01", "2024-01-31", connection=connection)
+
+    assert inserted == 0
+    mock_get_dim_date.assert_not_called()
+    assert len(read_date_ids(engine)) == 31
+
+
+@pytest.mark.describe("load_dim_date()")
+@pytest.mark.it("should only insert the dates missing from the table")
+def test_load_dim_date_inserts_missing_dates(s3, engine):
+    with engine.begin() as connection:
+        load_dim_date("2024-01-10", "2024-01-20", connection=connection)
+        inserted = load_dim_date("2024-01-01", "2024-01-31", connection=connection)
+
+    assert inserted == 20
+    date_ids = read_date_ids(engine)
+    assert date_ids.is_unique
+    assert date_ids.tolist() == list(pd.date_range("2024-01-01", "2024-01-31"))
@@ -0,0 +1,95 @@
+"""This module contains the test suite for the load ledger."""
+
+import pytest
+from sqlalchemy import create_engine, inspect
+
+from src.load.load_ledger import (
+    LOAD_LEDGER_TABLE,
+    claim_load,
+    create_load_ledger,
+    get_last_loaded_key,
+    get_loaded_files,
+)
+
+KEY = "fact_sales_order/2024-02-22/18:00:20.106733.parquet"
+
+
+@pytest.fixture
+def engine():
+    """Create an in-memory warehouse."""
+    return create_engine("sqlite://")
+
+
+@pytest.mark.describe("create_load_ledger()")
+@pytest.mark.it("should create the ledger keyed on object key and ETag, once")
+def test_create_load_ledger(engine):
+    with engine.begin() as connection:
+        create_load_ledger(connection)
+        create_load_ledger(connection)
+
+    primary_key = inspect(engine).get_pk_constraint(LOAD_LEDGER_TABLE)
+    assert primary_key["constrained_columns"] == ["object_key", "etag"]
+
+
+@pytest.mark.describe("claim_load()")
+@pytest.mark.it("should claim a file once")
+def test_claim_load(engine):
+    with engine.begin() as connection:
+        assert claim_load(KEY, "etag-1", "fact_sales_order", connection)
+    with engine.begin() as connection:
+        assert not claim_load(KEY, "etag-1", "fact_sales_order", connection)
+
+    with engine.connect() as connection:
+        assert get_loaded_files(connection, "fact_sales_order") == [(KEY, "etag-1")]
+
+
+@pytest.mark.describe("claim_load()")
+@pytest.mark.it("should claim a file rewritten under the same key")
+def test_claim_load_new_etag(engine):
+    with engine.begin() as connection:
+        assert claim_load(KEY, "etag-1", "fact_sales_order", connection)
+    with engine.begin() as connection:
+        assert claim_load(KEY, "etag-2", "fact_sales_order", connection)
+
+    with engine.connect() as connection:
+        assert get_loaded_files(connection, "fact_sales_order") == [
+            (KEY, "etag-1"),
+            (KEY, "etag-2"),
+        ]
+
+
+@pytest.mark.describe("claim_load()")
+@pytest.mark.it("should release the claim when the load is rolled back")
+def test_claim_load_rolled_back(engine):
+    with engine.begin() as connection:
+        create_load_ledger(connection)
+
+    with engine.connect() as connection:
+        connection.begin()
+        assert claim_load(KEY, "etag-1", "fact_sales_order", connection)
+        connection.rollback()
+
+    with engine.begin() as connection:
+        assert claim_load(KEY, "etag-1", "fact_sales_order", connection)
+
+
+@pytest.mark.describe("get_last_loaded_key()")
+@pytest.mark.it("should return the latest key loaded into a table and limit reads to later keys")
+def test_get_last_loaded_key(engine):
+    later_key = "fact_sales_order/2024-02-23/09:00:00.000000.parquet"
+
+    with engine.begin() as connection:
+        assert get_last_loaded_key(connection, "fact_sales_order") is None
+        claim_load(later_key, "etag-2", "fact_sales_order", connection)
+        claim_load(KEY, "etag-1", "fact_sales_order", connection)
+        claim_load(
+            "fact_payment/2024-02-24/09:00:00.000000.parquet",
+            "etag-3",
+            "fact_payment",
+            connection,
+        )
+
+        assert get_last_loaded_key(connection, "fact_sales_order") == later_key
+        assert get_loaded_files(
+            connection, "fact_sales_order", start_after="fact_sales_order/2024-02-23/"
+        ) == [(later_key, "etag-2")]
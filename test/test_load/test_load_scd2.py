@@ -0,0 +1,157 @@
+"""This module contains the test suite for `load_scd2()`."""
+
+import io
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.load.load_scd2 import load_scd2
+from src.utils.add_scd2_columns import add_scd2_columns
+
+
+@pytest.fixture
+def engine():
+    """Create an in-memory warehouse with an empty dim_staff table."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE dim_staff (staff_record_id INTEGER PRIMARY KEY,"
+                " staff_id INTEGER, first_name TEXT,"
+                " department_name TEXT, valid_from TIMESTAMP, valid_to TIMESTAMP,"
+                " is_current BOOLEAN)"
+            )
+        )
+    return engine
+
+
+def staff_versions(staff_ids, department_names, valid_from):
+    """Creates new versions of dim_staff rows."""
+    df = pd.DataFrame(
+        {
+            "staff_id": staff_ids,
+            "first_name": [f"Name {staff_id}" for staff_id in staff_ids],
+            "department_name": department_names,
+        }
+    )
+    return add_scd2_columns(df, valid_from)
+
+
+def staff_file(staff_ids, department_names, valid_from):
+    """Creates a parquet file of new versions of dim_staff rows."""
+    df = staff_versions(staff_ids, department_names, valid_from)
+    return pq.ParquetFile(io.BytesIO(df.to_parquet(index=False)))
+
+
+def read_dim_staff(engine):
+    """Reads dim_staff ordered by key and version."""
+    return pd.read_sql(
+        "SELECT staff_id, department_name, valid_from, valid_to, is_current"
+        " FROM dim_staff ORDER BY staff_id, valid_from",
+        engine,
+        parse_dates=["valid_from", "valid_to"],
+    )
+
+
+@pytest.mark.describe("add_scd2_columns()")
+@pytest.mark.it("should add current versions valid from the passed timestamp")
+def test_add_scd2_columns():
+    df = staff_versions([1, 2], ["Sales", "Dispatch"], "2024-02-22 18:00:20.106733")
+    assert df["valid_from"].dtype == "datetime64[us]"
+    assert df["valid_from"].tolist() == [pd.Timestamp("2024-02-22 18:00:20.106733")] * 2
+    assert df["valid_to"].isna().all()
+    assert df["is_current"].tolist() == [True, True]
+
+
+@pytest.mark.describe("load_scd2()")
+@pytest.mark.it("should close the current versions of changed keys and insert the new ones")
+def test_load_scd2_close_and_insert(engine):
+    with engine.begin() as connection:
+        load_scd2(
+            staff_file([1, 2], ["Sales", "Dispatch"], "2024-02-22 18:00:00"),
+            "dim_staff",
+            connection,
+        )
+    with engine.begin() as connection:
+        load_scd2(
+            staff_file([2, 3], ["Finance", "Sales"], "2024-02-23 09:00:00"),
+            "dim_staff",
+            connection,
+        )
+
+    df = read_dim_staff(engine)
+    assert df["staff_id"].tolist() == [1, 2, 2, 3]
+    assert df["department_name"].tolist() == ["Sales", "Dispatch", "Finance", "Sales"]
+    assert df["is_current"].astype(bool).tolist() == [True, False, True, True]
+    assert df.loc[1, "valid_to"] == pd.Timestamp("2024-02-23 09:00:00")
+    assert df.loc[[0, 2, 3], "valid_to"].isna().all()
+
+
+@pytest.mark.describe("load_scd2()")
+@pytest.mark.it("should insert versions loaded out of order already closed")
+def test_load_scd2_out_of_order(engine):
+    for department_name, valid_from in [
+        ("Finance", "2024-02-22 18:05:00"),
+        ("Sales", "2024-02-22 18:00:00"),
+        ("Dispatch", "2024-02-22 18:10:00"),
+        ("Purchasing", "2024-02-22 18:07:00"),
+    ]:
+        with engine.begin() as connection:
+            load_scd2(
+                staff_file([1], [department_name], valid_from), "dim_staff", connection
+            )
+
+    df = read_dim_staff(engine)
+    assert df["department_name"].tolist() == ["Sales", "Finance", "Purchasing", "Dispatch"]
+    assert df["is_current"].astype(bool).tolist() == [False, False, False, True]
+    assert df["valid_to"].tolist()[:3] == [
+        pd.Timestamp("2024-02-22 18:05:00"),
+        pd.Timestamp("2024-02-22 18:07:00"),
+        pd.Timestamp("2024-02-22 18:10:00"),
+    ]
+    assert pd.isna(df.loc[3, "valid_to"])
+
+
+@pytest.mark.describe("load_scd2()")
+@pytest.mark.it("should drop its staging table")
+def test_load_scd2_drops_staging_table(engine):
+    with engine.begin() as connection:
+        load_scd2(
+            staff_file([1], ["Sales"], "2024-02-22 18:00:00"), "dim_staff", connection
+        )
+        tables = connection.execute(
+            text("SELECT name FROM sqlite_temp_master WHERE type = 'table'")
+        ).fetchall()
+
+    assert tables == []
+
+
+@pytest.mark.describe("load_scd2()")
+@pytest.mark.it("should raise ValueError when the data has no SCD2 columns")
+def test_load_scd2_raises(engine):
+    df = pd.DataFrame({"staff_id": [1], "first_name": ["A"], "department_name": ["B"]})
+    parquet_file = pq.ParquetFile(io.BytesIO(df.to_parquet(index=False)))
+    with engine.begin() as connection:
+        with pytest.raises(ValueError):
+            load_scd2(parquet_file, "dim_staff", connection)
+
+
+@pytest.mark.describe("load_scd2()")
+@pytest.mark.it("should stage rows in a temporary table with COPY on Postgres")
+@patch("src.load.staging_table.copy_parquet")
+def test_load_scd2_copies_on_postgres(copy_parquet_mock):
+    connection = MagicMock()
+    connection.dialect.name = "postgresql"
+    parquet_file = staff_file([1], ["Sales"], "2024-02-22 18:00:00")
+
+    load_scd2(parquet_file, "dim_staff", connection)
+
+    copy_parquet_mock.assert_called_once_with(parquet_file, "staging_dim_staff", connection)
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert statements[0] == (
+        "CREATE TEMPORARY TABLE staging_dim_staff AS SELECT staff_id, first_name,"
+        " department_name, valid_from, valid_to, is_current FROM dim_staff WHERE false"
+    )
@@ -0,0 +1,112 @@
+"""This module contains the test suite for `load_upsert()`."""
+
+import io
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.load.load_upsert import load_upsert
+
+
+@pytest.fixture
+def engine():
+    """Create an in-memory warehouse with an empty dim_currency table."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE dim_currency (currency_id INTEGER PRIMARY KEY,"
+                " currency_code TEXT, currency_name TEXT)"
+            )
+        )
+    return engine
+
+
+def currency_file(currency_ids, currency_names):
+    """Creates a dim_currency parquet file."""
+    df = pd.DataFrame(
+        {
+            "currency_id": currency_ids,
+            "currency_code": [f"C{currency_id}" for currency_id in currency_ids],
+            "currency_name": currency_names,
+        }
+    )
+    return pq.ParquetFile(io.BytesIO(df.to_parquet(index=False)))
+
+
+def read_dim_currency(engine):
+    """Reads dim_currency ordered by key."""
+    return pd.read_sql("SELECT * FROM dim_currency ORDER BY currency_id", engine)
+
+
+@pytest.mark.describe("load_upsert()")
+@pytest.mark.it("should insert new keys and update existing keys in place")
+def test_load_upsert(engine):
+    with engine.begin() as connection:
+        load_upsert(currency_file([1, 2], ["Pound", "Dollar"]), "dim_currency", connection)
+    with engine.begin() as connection:
+        load_upsert(currency_file([2, 3], ["US Dollar", "Euro"]), "dim_currency", connection)
+
+    df = read_dim_currency(engine)
+    assert df["currency_id"].tolist() == [1, 2, 3]
+    assert df["currency_name"].tolist() == ["Pound", "US Dollar", "Euro"]
+
+
+@pytest.mark.describe("load_upsert()")
+@pytest.mark.it("should leave the table unchanged when re-run with the same rows")
+def test_load_upsert_is_idempotent(engine):
+    for _ in range(2):
+        with engine.begin() as connection:
+            load_upsert(
+                currency_file([1, 2], ["Pound", "Dollar"]), "dim_currency", connection
+            )
+
+    assert len(read_dim_currency(engine)) == 2
+
+
+@pytest.mark.describe("load_upsert()")
+@pytest.mark.it("should drop the staging table")
+def test_load_upsert_drops_staging_table(engine):
+    with engine.begin() as connection:
+        load_upsert(currency_file([1], ["Pound"]), "dim_currency", connection)
+        tables = connection.execute(
+            text("SELECT name FROM sqlite_temp_master WHERE type = 'table'")
+        ).fetchall()
+
+    assert tables == []
+
+
+@pytest.mark.describe("load_upsert()")
+@pytest.mark.it("should stage rows with COPY on Postgres")
+@patch("src.load.staging_table.copy_parquet")
+def test_load_upsert_copies_on_postgres(copy_parquet_mock):
+    connection = MagicMock()
+    connection.dialect.name = "postgresql"
+    parquet_file = currency_file([1], ["Pound"])
+
+    load_upsert(parquet_file, "dim_currency", connection)
+
+    copy_parquet_mock.assert_called_once_with(
+        parquet_file, "staging_dim_currency", connection
+    )
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert statements[1] == (
+        "INSERT INTO dim_currency (currency_id, currency_code, currency_name)"
+        " SELECT currency_id, currency_code, currency_name FROM staging_dim_currency"
+        " WHERE true ON CONFLICT (currency_id) DO UPDATE SET"
+        " currency_code = excluded.currency_code, currency_name = excluded.currency_name"
+    )
+
+
+@pytest.mark.describe("load_upsert()")
+@pytest.mark.it("should raise ValueError when the rows have no natural key")
+def test_load_upsert_raises_without_key(engine):
+    parquet_file = pq.ParquetFile(
+        io.BytesIO(pd.DataFrame({"name": ["Pound"]}).to_parquet(index=False))
+    )
+    with engine.begin() as connection:
+        with pytest.raises(ValueError):
+            load_upsert(parquet_file, "dim_currency", connection)
@@ -0,0 +1,78 @@
+"""This module contains the test suite for `staging_table()`."""
+
+import io
+from unittest.mock import MagicMock, patch
+
+import pandas as pd
+import pyarrow.parquet as pq
+import pytest
+from sqlalchemy import create_engine, text
+
+from src.load.staging_table import staging_table
+
+
+@pytest.fixture
+def engine():
+    """Create an in-memory warehouse with an empty dim_currency table."""
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(
+            text(
+                "CREATE TABLE dim_currency (currency_id INTEGER PRIMARY KEY,"
+                " currency_code TEXT, currency_name TEXT)"
+            )
+        )
+    return engine
+
+
+@pytest.fixture
+def currency_file():
+    """Creates a dim_currency parquet file."""
+    df = pd.DataFrame({"currency_id": [1, 2], "currency_code": ["GBP", "USD"]})
+    return pq.ParquetFile(io.BytesIO(df.to_parquet(index=False)))
+
+
+def list_temporary_tables(connection):
+    """Lists the temporary tables of a sqlite connection."""
+    return [
+        row[0]
+        for row in connection.execute(
+            text("SELECT name FROM sqlite_temp_master WHERE type = 'table'")
+        )
+    ]
+
+
+@pytest.mark.describe("staging_table()")
+@pytest.mark.it("should stage the file's rows for the block, then drop the table")
+def test_staging_table(engine, currency_file):
+    with engine.begin() as connection:
+        with staging_table(currency_file, "dim_currency", connection) as staging_table_name:
+            assert staging_table_name == "staging_dim_currency"
+            staged = pd.read_sql(f"SELECT * FROM {staging_table_name}", connection)
+            assert staged.to_dict("records") == [
+                {"currency_id": 1, "currency_code": "GBP"},
+                {"currency_id": 2, "currency_code": "USD"},
+            ]
+
+        assert list_temporary_tables(connection) == []
+
+
+@pytest.mark.describe("staging_table()")
+@pytest.mark.it("should stage rows with COPY on Postgres")
+@patch("src.load.staging_table.copy_parquet")
+def test_staging_table_copies_on_postgres(copy_parquet_mock, currency_file):
+    connection = MagicMock()
+    connection.dialect.name = "postgresql"
+
+    with staging_table(currency_file, "dim_currency", connection):
+        pass
+
+    copy_parquet_mock.assert_called_once_with(
+        currency_file, "staging_dim_currency", connection
+    )
+    statements = [str(call.args[0]) for call in connection.execute.call_args_list]
+    assert statements == [
+        "CREATE TEMPORARY TABLE staging_dim_currency AS"
+        " SELECT currency_id, currency_code FROM dim_currency WHERE false",
+        "DROP TABLE staging_dim_currency",
+    ]
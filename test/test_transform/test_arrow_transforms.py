@@ -0,0 +1,121 @@
+"""This module contains the parity test suite for the Arrow-native transform
+functions and `get_transform_engine()`."""
+
+import json
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.transform.arrow_transforms import (
+    arrow_dim_counterparty,
+    arrow_dim_staff,
+    get_transform_engine,
+)
+from src.transform.dim_counterparty import dim_counterparty
+from src.transform.dim_currency import dim_currency
+from src.transform.dim_location import dim_location
+from src.transform.dim_staff import dim_staff
+from src.transform.fact_payment import fact_payment
+from src.transform.fact_sales_order import fact_sales_order
+from src.transform.transform_registry import TRANSFORM_REGISTRY, get_outputs
+from src.utils.drop_created_and_updated import drop_created_and_updated
+from src.utils.split_created_and_updated import split_created_and_updated
+
+
+def load_test_data(file_name, table_name):
+    """Loads a test data file into a data frame."""
+    with open(f"test/test_transform/test_data/{file_name}") as f:
+        return pd.DataFrame.from_records(json.loads(f.read())[table_name])
+
+
+def assert_parity(pandas_result, arrow_result):
+    """Asserts the pandas and Arrow results hold identical data and types."""
+    expected = pa.Table.from_pandas(pandas_result, preserve_index=False)
+    assert arrow_result.column_names == expected.column_names
+    assert arrow_result.schema.equals(expected.schema, check_metadata=False)
+    assert arrow_result.equals(expected)
+
+
+@pytest.mark.describe("Arrow transforms")
+@pytest.mark.it("should match the pandas transforms for every single-input table")
+@pytest.mark.parametrize(
+    "table_name, file_name, pandas_transform",
+    [
+        ("address", "test_address_data.json", dim_location),
+        ("currency", "test_currency_data.json", dim_currency),
+        ("design", "test_design_data.json", drop_created_and_updated),
+        ("payment_type", "test_payment_type_data2.json", drop_created_and_updated),
+        ("transaction", "test_transaction_data2.json", drop_created_and_updated),
+        ("payment", "test_payment_data.json", fact_payment),
+        ("purchase_order", "test_purchase_order_data2.json", split_created_and_updated),
+        ("sales_order", "test_sales_order_data.json", fact_sales_order),
+    ],
+)
+def test_single_input_parity(table_name, file_name, pandas_transform):
+    """Arrow transforms should produce identical output to the pandas ones."""
+    df = load_test_data(file_name, table_name)
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    arrow_transform = TRANSFORM_REGISTRY[get_outputs(table_name)[0]]["arrow_transform"]
+    assert_parity(pandas_transform(df), arrow_transform(table))
+
+
+@pytest.mark.describe("Arrow transforms")
+@pytest.mark.it("arrow_dim_counterparty() should match dim_counterparty()")
+def test_dim_counterparty_parity():
+    """arrow_dim_counterparty() should join in the same row order as pd.merge."""
+    counterparty_df = load_test_data("test_counterparty_data.json", "counterparty")
+    address_df = pd.concat(
+        [
+            load_test_data("test_address_data.json", "address"),
+            load_test_data("test_address_data2.json", "address"),
+        ],
+        ignore_index=True,
+    )
+    assert_parity(
+        dim_counterparty(counterparty_df, address_data=address_df),
+        arrow_dim_counterparty(
+            pa.Table.from_pandas(counterparty_df, preserve_index=False),
+            address_table=pa.Table.from_pandas(address_df, preserve_index=False),
+        ),
+    )
+
+
+@pytest.mark.describe("Arrow transforms")
+@pytest.mark.it("arrow_dim_staff() should match dim_staff()")
+def test_dim_staff_parity():
+    """arrow_dim_staff() should join in the same row order as pd.merge."""
+    staff_df = load_test_data("test_staff_data.json", "staff")
+    department_df = pd.concat(
+        [
+            load_test_data("test_department_data1.json", "department"),
+            load_test_data("test_department_data2.json", "department"),
+        ],
+        ignore_index=True,
+    )
+    assert_parity(
+        dim_staff(staff_df, department_data=department_df),
+        arrow_dim_staff(
+            pa.Table.from_pandas(staff_df, preserve_index=False),
+            department_table=pa.Table.from_pandas(department_df, preserve_index=False),
+        ),
+    )
+
+
+@pytest.mark.describe("get_transform_engine()")
+@pytest.mark.it("should default to pandas and accept arrow")
+def test_get_transform_engine(monkeypatch):
+    """get_transform_engine() should read the TRANSFORM_ENGINE environment variable."""
+    monkeypatch.delenv("TRANSFORM_ENGINE", raising=False)
+    assert get_transform_engine() == "pandas"
+    monkeypatch.setenv("TRANSFORM_ENGINE", "Arrow")
+    assert get_transform_engine() == "arrow"
+
+
+@pytest.mark.describe("get_transform_engine()")
+@pytest.mark.it("should raise ValueError for an unknown engine")
+def test_get_transform_engine_invalid(monkeypatch):
+    """get_transform_engine() should reject unknown engines."""
+    monkeypatch.setenv("TRANSFORM_ENGINE", "spark")
+    with pytest.raises(ValueError):
+        get_transform_engine()
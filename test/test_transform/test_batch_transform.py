@@ -0,0 +1,173 @@
+"""This module contains the test suite for `get_run_files()`,
+`batch_transform()` and the batch transform `lambda_handler()`."""
+
+import json
+import multiprocessing
+import os
+from unittest.mock import call, patch
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+import pytest
+
+from src.transform.batch_transform import (
+    batch_transform,
+    get_run_files,
+    lambda_handler,
+    set_worker_reference_data,
+    worker_reference_data,
+)
+from src.transform.transform_registry import read_reference_data
+from src.utils.client_factory import get_client
+
+INGESTION_BUCKET = "totesys-etl-ingestion-bucket-teamness-120224"
+PROCESSED_BUCKET = "totesys-etl-processed-data-bucket-teamness-120224"
+
+TEST_DATA = {
+    "address": "test_address_data.json",
+    "counterparty": "test_counterparty_data.json",
+    "department": "test_department_data1.json",
+    "staff": "test_staff_data.json",
+    "transaction": "test_transaction_data.json",
+}
+
+RUN_FILES = [
+    "address/2024-02-22/18:00:20.106733.parquet",
+    "counterparty/2024-02-22/18:00:20.106733.parquet",
+    "staff/2024-02-22/18:00:20.106733.parquet",
+    "transaction/2024-02-22/18:00:20.106733.parquet",
+]
+
+OUTPUT_KEYS = [
+    "dim_counterparty/2024-02-22/18:00:20.106733.parquet",
+    "dim_location/2024-02-22/18:00:20.106733.parquet",
+    "dim_staff/2024-02-22/18:00:20.106733.parquet",
+    "dim_transaction/2024-02-22/18:00:20.106733.parquet",
+]
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client."""
+    with mock_aws():
+        yield boto3.client("s3", region_name="eu-west-2")
+
+
+@pytest.fixture
+def buckets(s3):
+    """Create mock buckets with one extraction run, plus an older department file."""
+    for bucket_name in [INGESTION_BUCKET, PROCESSED_BUCKET]:
+        s3.create_bucket(
+            Bucket=bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+
+    for table_name, file_name in TEST_DATA.items():
+        with open(f"test/test_transform/test_data/{file_name}") as f:
+            df = pd.DataFrame.from_records(json.loads(f.read())[table_name])
+
+        run_time = "17:00:00.000000" if table_name == "department" else "18:00:20.106733"
+        s3.put_object(
+            Bucket=INGESTION_BUCKET,
+            Key=f"{table_name}/2024-02-22/{run_time}.parquet",
+            Body=df.to_parquet(),
+        )
+
+
+def list_processed_keys(s3):
+    """Lists the keys saved to the processed bucket."""
+    response = s3.list_objects_v2(Bucket=PROCESSED_BUCKET)
+    return [item["Key"] for item in response.get("Contents", [])]
+
+
+@pytest.mark.describe("get_run_files()")
+@pytest.mark.it("should list the files written by a run")
+def test_get_run_files(s3, buckets):
+    assert get_run_files("2024-02-22 18:00:20.106733", INGESTION_BUCKET) == RUN_FILES
+    assert get_run_files("2024-02-22 19:00:00.000000", INGESTION_BUCKET) == []
+
+
+@pytest.mark.describe("batch_transform()")
+@pytest.mark.it("should transform every file of a run and read reference data once")
+def test_batch_transform_threads(s3, buckets):
+    with patch(
+        "src.transform.transform_registry.read_reference_data",
+        wraps=read_reference_data,
+    ) as mock_read_reference_data:
+        output_keys = batch_transform(RUN_FILES, engine="pandas", max_workers=4)
+
+    # run_transform() is passed the reference data, so it has no tables left to read.
+    assert [
+        reference_call
+        for reference_call in mock_read_reference_data.call_args_list
+        if reference_call.args[0]
+    ] == [call(["address", "department"], "pandas")]
+    assert sorted(output_keys) == OUTPUT_KEYS
+    assert list_processed_keys(s3) == OUTPUT_KEYS
+
+
+@pytest.mark.describe("batch_transform()")
+@pytest.mark.it("should transform every file of a run on a process pool")
+@pytest.mark.skipif(
+    multiprocessing.get_start_method() != "fork",
+    reason="the moto mock only reaches forked worker processes",
+)
+def test_batch_transform_processes(s3, buckets):
+    output_keys = batch_transform(
+        RUN_FILES, executor="process", max_workers=2, engine="arrow"
+    )
+    assert sorted(output_keys) == OUTPUT_KEYS
+
+
+@pytest.mark.describe("batch_transform()")
+@pytest.mark.it("should raise ValueError when passed an invalid executor")
+def test_batch_transform_invalid_executor():
+    with pytest.raises(ValueError):
+        batch_transform(RUN_FILES, executor="gpu")
+
+
+@pytest.mark.describe("lambda_handler()")
+@pytest.mark.it("should transform a run given its run_id or keys")
+def test_batch_lambda_handler(s3, buckets):
+    lambda_handler({"run_id": "2024-02-22 18:00:20.106733"}, {})
+    assert list_processed_keys(s3) == OUTPUT_KEYS
+
+    output_keys = lambda_handler(
+        {"keys": ["staff/2024-02-22/18%3A00%3A20.106733.parquet"]}, {}
+    )
+    assert output_keys == ["dim_staff/2024-02-22/18:00:20.106733.parquet"]
+
+
+@pytest.mark.describe("set_worker_reference_data()")
+@pytest.mark.it("should discard the boto3 clients a worker inherits")
+def test_set_worker_reference_data(s3):
+    inherited_client = get_client("s3")
+
+    set_worker_reference_data({"dim_date": "reference data"})
+
+    assert get_client("s3") is not inherited_client
+    assert worker_reference_data["dim_date"] == "reference data"
+    worker_reference_data.clear()
+
+
+@pytest.mark.describe("lambda_handler()")
+@pytest.mark.it("should transform with copy-on-write enabled")
+def test_batch_lambda_handler_copy_on_write(s3, buckets):
+    with patch(
+        "src.transform.batch_transform.batch_transform",
+        side_effect=lambda *args, **kwargs: pd.get_option("mode.copy_on_write"),
+    ):
+        assert lambda_handler({"keys": RUN_FILES}, {}) is True
+
+    assert pd.get_option("mode.copy_on_write") is False
@@ -0,0 +1,109 @@
+"""This module contains the memory tests for the transform functions with
+copy-on-write enabled."""
+
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.transform.dim_location import dim_location
+from src.transform.fact_payment import fact_payment
+from src.transform.fact_sales_order import fact_sales_order
+
+NUM_ROWS = 500_000
+
+
+@pytest.fixture
+def timestamps():
+    """Sets up a column of timestamps."""
+    return np.datetime64("2022-11-03T14:20:49.962") + np.arange(NUM_ROWS).astype(
+        "timedelta64[ms]"
+    )
+
+
+@pytest.fixture
+def address_df(timestamps):
+    """Sets up a large address-like data frame."""
+    return pd.DataFrame(
+        {
+            "address_id": np.arange(NUM_ROWS),
+            "postal_code": np.arange(NUM_ROWS),
+            "phone": np.arange(NUM_ROWS),
+            "created_at": timestamps,
+            "last_updated": timestamps,
+        }
+    )
+
+
+@pytest.fixture
+def payment_df(timestamps):
+    """Sets up a large payment-like data frame."""
+    return pd.DataFrame(
+        {
+            "payment_id": np.arange(NUM_ROWS),
+            "payment_amount": np.random.default_rng(0).random(NUM_ROWS),
+            "company_ac_number": np.arange(NUM_ROWS),
+            "counterparty_ac_number": np.arange(NUM_ROWS),
+            "created_at": timestamps,
+            "last_updated": timestamps,
+        }
+    )
+
+
+@pytest.fixture
+def sales_order_df(timestamps):
+    """Sets up a large sales_order-like data frame."""
+    return pd.DataFrame(
+        {
+            "sales_order_id": np.arange(NUM_ROWS),
+            "staff_id": np.arange(NUM_ROWS),
+            "units_sold": np.arange(NUM_ROWS),
+            "created_at": timestamps,
+            "last_updated": timestamps,
+        }
+    )
+
+
+def peak_memory(function, df):
+    """Returns the peak memory allocated while running function(df)."""
+    with pd.option_context("mode.copy_on_write", True):
+        tracemalloc.start()
+        function(df)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return peak
+
+
+@pytest.mark.describe("copy-on-write transforms")
+@pytest.mark.it("dim_location() should drop and rename without copying the data")
+def test_dim_location_peak_memory(address_df):
+    """dim_location() should allocate a small fraction of its input."""
+    input_size = address_df.memory_usage(deep=True).sum()
+    assert peak_memory(dim_location, address_df) < 0.1 * input_size
+
+
+@pytest.mark.describe("copy-on-write transforms")
+@pytest.mark.it("fact_payment() should only allocate its new date and time columns")
+def test_fact_payment_peak_memory(payment_df):
+    """fact_payment() should allocate less than its input."""
+    input_size = payment_df.memory_usage(deep=True).sum()
+    assert peak_memory(fact_payment, payment_df) < 0.5 * input_size
+
+
+@pytest.mark.describe("copy-on-write transforms")
+@pytest.mark.it("fact_sales_order() should only allocate its new date and time columns")
+def test_fact_sales_order_peak_memory(sales_order_df):
+    """fact_sales_order() should allocate less than its input."""
+    input_size = sales_order_df.memory_usage(deep=True).sum()
+    assert peak_memory(fact_sales_order, sales_order_df) < 0.5 * input_size
+
+
+@pytest.mark.describe("copy-on-write transforms")
+@pytest.mark.it("should not mutate the input when the output is modified")
+def test_output_changes_do_not_reach_input(address_df):
+    """dim_location() output should be independent of its input under copy-on-write."""
+    with pd.option_context("mode.copy_on_write", True):
+        result = dim_location(address_df)
+        result.loc[0, "postal_code"] = -1
+    assert address_df.loc[0, "postal_code"] == 0
@@ -32,3 +32,13 @@ def test_should_return_correct_columns():
         "last_updated_time",
     ]  # noqa
     assert result_columns == expected_columns
+
+
+@pytest.mark.describe("create_dim_date()")
+@pytest.mark.it("should encode day and month names as categoricals")
+def test_should_encode_names_as_categoricals():
+    result = create_dim_date("2020-01-01", "2024-12-31")
+    assert result["day_name"].dtype == "category"
+    assert result["month_name"].dtype == "category"
+    assert len(result["day_name"].cat.categories) == 7
+    assert result["day_name"].iloc[0] == "Wednesday"
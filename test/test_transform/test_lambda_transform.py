@@ -5,6 +5,7 @@ import io
 import json
 import logging
 import os
+from unittest.mock import patch
 
 import boto3
 from moto import mock_aws
@@ -155,3 +156,50 @@ def test_logs_on_completion(valid_event, bucket, proc_bucket, caplog):
             "dim_transaction/2024-02-22/18:00:20.106733.parquet successfully saved to totesys-etl-processed-data-bucket-teamness-120224"
             in caplog.text
         )
+
+
+@pytest.mark.describe("lambda_handler()")
+@pytest.mark.it("should skip keys that are not ingested table data")
+def test_skips_reserved_keys(s3, valid_event, bucket, proc_bucket):
+    valid_event["Records"][0]["s3"]["object"][
+        "key"
+    ] = "_snapshots/transaction/2024-02-22/18:00:20.106733.parquet"
+    lambda_handler(valid_event, {})
+    bucket_name = "totesys-etl-processed-data-bucket-teamness-120224"
+    assert s3.list_objects_v2(Bucket=bucket_name)["KeyCount"] == 0
+
+
+@pytest.mark.describe("lambda_handler()")
+@pytest.mark.it("should save the same data with the arrow engine")
+def test_arrow_engine_saves_same_data(
+    s3, valid_event, bucket, proc_bucket, control_df, monkeypatch
+):
+    monkeypatch.setenv("TRANSFORM_ENGINE", "arrow")
+    lambda_handler(valid_event, {})
+    bucket_name = "totesys-etl-processed-data-bucket-teamness-120224"
+    file_name = "dim_transaction/2024-02-22/18:00:20.106733.parquet"
+    file = s3.get_object(Bucket=bucket_name, Key=file_name)
+    df = pd.read_parquet(io.BytesIO(file["Body"].read()))
+    assert df.equals(control_df)
+
+
+@pytest.mark.describe("lambda_handler()")
+@pytest.mark.it("should only enable copy-on-write while the transform runs")
+def test_copy_on_write_is_scoped(valid_event, bucket, proc_bucket, monkeypatch):
+    modes = []
+    monkeypatch.setattr(
+        "src.transform.transform_registry.run_transform",
+        lambda file_names: modes.append(pd.get_option("mode.copy_on_write")),
+    )
+    lambda_handler(valid_event, {})
+    assert modes == [True]
+    assert pd.get_option("mode.copy_on_write") is False
+
+
+@pytest.mark.describe("lambda_handler()")
+@pytest.mark.it("should run the batch transform for events without Records")
+@patch("src.transform.batch_transform.lambda_handler", return_value=["output key"])
+def test_runs_batch_transform(batch_lambda_handler_mock):
+    event = {"run_id": "2024-02-22 18:00:20.106733"}
+    assert lambda_handler(event, {}) == ["output key"]
+    batch_lambda_handler_mock.assert_called_once_with(event, {})
@@ -0,0 +1,333 @@
+"""This module contains the test suite for the transform registry,
+`plan_transform()` and `run_transform()`."""
+
+import io
+import json
+import os
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+import pytest
+
+from src.transform.transform_registry import (
+    TRANSFORM_REGISTRY,
+    check_schema,
+    get_output_key,
+    get_outputs,
+    plan_transform,
+    run_transform,
+)
+from src.utils.get_archived_table_data import get_archived_table_data
+
+INGESTION_BUCKET = "totesys-etl-ingestion-bucket-teamness-120224"
+PROCESSED_BUCKET = "totesys-etl-processed-data-bucket-teamness-120224"
+
+TEST_DATA = {
+    "address": "test_address_data.json",
+    "counterparty": "test_counterparty_data.json",
+    "currency": "test_currency_data.json",
+    "department": "test_department_data1.json",
+    "design": "test_design_data.json",
+    "payment_type": "test_payment_type_data.json",
+    "staff": "test_staff_data.json",
+    "transaction": "test_transaction_data.json",
+    "payment": "test_payment_data.json",
+    "purchase_order": "test_purchase_order_data1.json",
+    "sales_order": "test_sales_order_data.json",
+}
+
+
+def load_test_data(table_name):
+    """Loads the test data file for a table into a data frame."""
+    with open(f"test/test_transform/test_data/{TEST_DATA[table_name]}") as f:
+        return pd.DataFrame.from_records(json.loads(f.read())[table_name])
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client."""
+    with mock_aws():
+        yield boto3.client("s3", region_name="eu-west-2")
+
+
+@pytest.fixture
+def buckets(s3):
+    """Create mock ingestion and processed buckets holding one file per table."""
+    for bucket_name in [INGESTION_BUCKET, PROCESSED_BUCKET]:
+        s3.create_bucket(
+            Bucket=bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+
+    for table_name in TEST_DATA:
+        s3.put_object(
+            Bucket=INGESTION_BUCKET,
+            Key=f"{table_name}/2024-02-22/18:00:20.106733.parquet",
+            Body=load_test_data(table_name).to_parquet(),
+        )
+
+
+@pytest.mark.describe("TRANSFORM_REGISTRY")
+@pytest.mark.it("should declare a schema the pandas transform output satisfies")
+@pytest.mark.parametrize("output_table", list(TRANSFORM_REGISTRY))
+def test_registry_schemas(output_table):
+    entry = TRANSFORM_REGISTRY[output_table]
+    data = entry["transform"](*[load_test_data(table) for table in entry["inputs"]])
+    assert sorted(data.columns) == sorted(entry["schema"])
+
+
+@pytest.mark.describe("get_outputs()")
+@pytest.mark.it("should return the outputs triggered by an ingestion table")
+def test_get_outputs():
+    assert get_outputs("address") == ["dim_location"]
+    assert get_outputs("sales_order") == ["fact_sales_order"]
+    assert get_outputs("department") == []
+
+
+@pytest.mark.describe("get_output_key()")
+@pytest.mark.it("should format the output key with the run path of the file")
+def test_get_output_key():
+    output_key = get_output_key(
+        "dim_location", "address/2024-02-22/18:00:20.106733.parquet"
+    )
+    assert output_key == "dim_location/2024-02-22/18:00:20.106733.parquet"
+
+
+@pytest.mark.describe("get_output_key()")
+@pytest.mark.it("should suffix the output key of propagated rows")
+def test_get_output_key_propagated():
+    output_key = get_output_key(
+        "dim_counterparty", "address/2024-02-22/18:00:20.106733.parquet", propagated=True
+    )
+    assert output_key == "dim_counterparty/2024-02-22/18:00:20.106733-propagated.parquet"
+
+
+@pytest.mark.describe("check_schema()")
+@pytest.mark.it("should raise ValueError when a declared column is missing")
+def test_check_schema_raises():
+    df = load_test_data("payment_type").drop(columns=["payment_type_name"])
+    with pytest.raises(ValueError, match="payment_type_name"):
+        check_schema("dim_payment_type", df)
+
+
+@pytest.mark.describe("plan_transform()")
+@pytest.mark.it("should read each file and reference table once and skip untriggered files")
+def test_plan_transform():
+    file_names = [
+        "counterparty/2024-02-22/18:00:20.106733.parquet",
+        "counterparty/2024-02-22/18:00:20.106733.parquet",
+        "counterparty/2024-02-22/18:30:20.106733.parquet",
+        "staff/2024-02-22/18:00:20.106733.parquet",
+        "cars/2024-02-22/18:00:20.106733.parquet",
+    ]
+    plan = plan_transform(file_names)
+    assert plan["files"] == [
+        "counterparty/2024-02-22/18:00:20.106733.parquet",
+        "counterparty/2024-02-22/18:30:20.106733.parquet",
+        "staff/2024-02-22/18:00:20.106733.parquet",
+    ]
+    assert plan["reference_tables"] == ["address", "department"]
+    assert [output["output_key"] for output in plan["outputs"]] == [
+        "dim_counterparty/2024-02-22/18:00:20.106733.parquet",
+        "dim_counterparty/2024-02-22/18:30:20.106733.parquet",
+        "dim_staff/2024-02-22/18:00:20.106733.parquet",
+    ]
+
+
+@pytest.mark.describe("plan_transform()")
+@pytest.mark.it("should re-emit dependent outputs for new reference table files")
+def test_plan_transform_dependent_outputs():
+    file_names = [
+        "address/2024-02-22/18:00:20.106733.parquet",
+        "department/2024-02-22/18:00:20.106733.parquet",
+        "staff/2024-02-22/18:00:20.106733.parquet",
+    ]
+    outputs = plan_transform(file_names)["outputs"]
+    assert outputs == [
+        {
+            "output_table": "dim_location",
+            "output_key": "dim_location/2024-02-22/18:00:20.106733.parquet",
+            "file_name": "address/2024-02-22/18:00:20.106733.parquet",
+            "reference_files": [],
+        },
+        {
+            "output_table": "dim_counterparty",
+            "output_key": "dim_counterparty/2024-02-22/18:00:20.106733-propagated.parquet",
+            "file_name": None,
+            "reference_files": ["address/2024-02-22/18:00:20.106733.parquet"],
+        },
+        {
+            "output_table": "dim_staff",
+            "output_key": "dim_staff/2024-02-22/18:00:20.106733.parquet",
+            "file_name": "staff/2024-02-22/18:00:20.106733.parquet",
+            "reference_files": ["department/2024-02-22/18:00:20.106733.parquet"],
+        },
+    ]
+
+
+@pytest.mark.describe("run_transform()")
+@pytest.mark.it("should save every output and read shared reference data once")
+@pytest.mark.parametrize("engine", ["pandas", "arrow"])
+def test_run_transform(s3, buckets, engine):
+    file_names = [
+        f"{table_name}/2024-02-22/18:00:20.106733.parquet"
+        for table_name in TEST_DATA
+    ]
+    with patch(
+        "src.transform.transform_registry.get_archived_table_data",
+        wraps=get_archived_table_data,
+    ) as mock_archived_data, patch(
+        "src.transform.arrow_transforms.get_archived_table_data",
+        wraps=get_archived_table_data,
+    ) as mock_arrow_archived_data:
+        output_keys = run_transform(file_names, engine=engine, max_workers=4)
+
+    reads = mock_archived_data.call_count + mock_arrow_archived_data.call_count
+    assert reads == 2
+
+    expected_keys = sorted(
+        f"{output_table}/2024-02-22/18:00:20.106733.parquet"
+        for output_table in TRANSFORM_REGISTRY
+    )
+    assert sorted(output_keys) == expected_keys
+
+    saved_keys = [
+        item["Key"] for item in s3.list_objects_v2(Bucket=PROCESSED_BUCKET)["Contents"]
+    ]
+    assert saved_keys == expected_keys
+
+    response = s3.get_object(
+        Bucket=PROCESSED_BUCKET, Key="dim_staff/2024-02-22/18:00:20.106733.parquet"
+    )
+    df = pd.read_parquet(io.BytesIO(response["Body"].read()))
+    assert list(df.columns) == TRANSFORM_REGISTRY["dim_staff"]["schema"] + [
+        "valid_from",
+        "valid_to",
+        "is_current",
+    ]
+    assert df["valid_from"].unique().tolist() == [
+        pd.Timestamp("2024-02-22 18:00:20.106733")
+    ]
+    assert df["valid_to"].isna().all()
+    assert df["is_current"].all()
+    assert df["department_name"].dtype == "category"
+    assert df["location"].dtype == "category"
+
+
+@pytest.mark.describe("run_transform()")
+@pytest.mark.it("should re-emit only the dimension rows referencing updated rows")
+@pytest.mark.parametrize("engine", ["pandas", "arrow"])
+def test_run_transform_propagates_updates(s3, buckets, engine):
+    s3.create_bucket(
+        Bucket="totesys-etl-catalog-bucket-teamness-120224",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    run_transform(
+        [
+            "counterparty/2024-02-22/18:00:20.106733.parquet",
+            "staff/2024-02-22/18:00:20.106733.parquet",
+        ],
+        engine=engine,
+    )
+
+    address_update = load_test_data("address").iloc[[1]]
+    address_update = address_update.assign(
+        city="Updated City", last_updated="2024-02-23 09:00:00.000"
+    )
+    s3.put_object(
+        Bucket=INGESTION_BUCKET,
+        Key="address/2024-02-23/09:00:00.000000.parquet",
+        Body=address_update.to_parquet(),
+    )
+
+    output_keys = run_transform(
+        ["address/2024-02-23/09:00:00.000000.parquet"], engine=engine
+    )
+    assert output_keys == [
+        "dim_location/2024-02-23/09:00:00.000000.parquet",
+        "dim_counterparty/2024-02-23/09:00:00.000000-propagated.parquet",
+    ]
+
+    response = s3.get_object(
+        Bucket=PROCESSED_BUCKET,
+        Key="dim_counterparty/2024-02-23/09:00:00.000000-propagated.parquet",
+    )
+    df = pd.read_parquet(io.BytesIO(response["Body"].read()))
+    assert df["counterparty_id"].tolist() == [2]
+    assert df["counterparty_legal_city"].tolist() == ["Updated City"]
+
+
+@pytest.mark.describe("run_transform()")
+@pytest.mark.it("should not overwrite a run's output with rows propagated by a separate invocation")
+def test_run_transform_separate_invocations(s3, buckets):
+    run_transform(["counterparty/2024-02-22/18:00:20.106733.parquet"])
+    run_transform(["address/2024-02-22/18:00:20.106733.parquet"])
+
+    saved_keys = [
+        item["Key"]
+        for item in s3.list_objects_v2(Bucket=PROCESSED_BUCKET, Prefix="dim_counterparty/")[
+            "Contents"
+        ]
+    ]
+    assert saved_keys == [
+        "dim_counterparty/2024-02-22/18:00:20.106733-propagated.parquet",
+        "dim_counterparty/2024-02-22/18:00:20.106733.parquet",
+    ]
+
+
+@pytest.mark.describe("run_transform()")
+@pytest.mark.it("should not re-emit dimension rows whose content is unchanged")
+@pytest.mark.parametrize("engine", ["pandas", "arrow"])
+def test_run_transform_suppresses_unchanged_rows(s3, buckets, engine):
+    s3.create_bucket(
+        Bucket="totesys-etl-catalog-bucket-teamness-120224",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    run_transform(["payment_type/2024-02-22/18:00:20.106733.parquet"], engine=engine)
+
+    bumped_df = load_test_data("payment_type").assign(
+        last_updated="2024-02-23 09:00:00.000"
+    )
+    bumped_df.loc[0, "payment_type_name"] = "CHANGED"
+    s3.put_object(
+        Bucket=INGESTION_BUCKET,
+        Key="payment_type/2024-02-23/09:00:00.000000.parquet",
+        Body=bumped_df.to_parquet(),
+    )
+    s3.put_object(
+        Bucket=INGESTION_BUCKET,
+        Key="payment_type/2024-02-23/10:00:00.000000.parquet",
+        Body=bumped_df.to_parquet(),
+    )
+
+    output_keys = run_transform(
+        [
+            "payment_type/2024-02-23/09:00:00.000000.parquet",
+            "payment_type/2024-02-23/10:00:00.000000.parquet",
+        ],
+        engine=engine,
+    )
+    assert output_keys == ["dim_payment_type/2024-02-23/09:00:00.000000.parquet"]
+
+    response = s3.get_object(
+        Bucket=PROCESSED_BUCKET,
+        Key="dim_payment_type/2024-02-23/09:00:00.000000.parquet",
+    )
+    df = pd.read_parquet(io.BytesIO(response["Body"].read()))
+    assert df.to_dict("list") == {
+        "payment_type_id": [1],
+        "payment_type_name": ["CHANGED"],
+    }
+    assert df.index.tolist() == [0]
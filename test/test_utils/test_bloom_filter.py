@@ -0,0 +1,41 @@
+"""This module contains the test suite for `create_bloom_filter()` and
+`bloom_filter_may_contain()`."""
+
+import numpy as np
+import pytest
+
+from src.utils.bloom_filter import bloom_filter_may_contain, create_bloom_filter
+
+
+@pytest.mark.describe("create_bloom_filter()")
+@pytest.mark.it("should return the filter as bytes")
+def test_returns_bytes():
+    """create_bloom_filter() should return bytes that can be stored in Parquet."""
+    result = create_bloom_filter([1, 2, 3])
+    assert isinstance(result, bytes)
+
+
+@pytest.mark.describe("bloom_filter_may_contain()")
+@pytest.mark.it("should never report a false negative")
+def test_no_false_negatives():
+    """bloom_filter_may_contain() should be True for every value added to the filter."""
+    values = np.arange(0, 20000, 7)
+    bloom_filter = create_bloom_filter(values)
+    assert bloom_filter_may_contain(bloom_filter, values).all()
+
+
+@pytest.mark.describe("bloom_filter_may_contain()")
+@pytest.mark.it("should have a false positive rate close to 1%")
+def test_false_positive_rate():
+    """bloom_filter_may_contain() should rule out almost all values not in the filter."""
+    bloom_filter = create_bloom_filter(np.arange(5000))
+    result = bloom_filter_may_contain(bloom_filter, np.arange(100000, 200000))
+    assert result.mean() < 0.02
+
+
+@pytest.mark.describe("bloom_filter_may_contain()")
+@pytest.mark.it("should rule out every value for an empty filter")
+def test_empty_filter():
+    """bloom_filter_may_contain() should be False for all values of an empty filter."""
+    bloom_filter = create_bloom_filter([])
+    assert not bloom_filter_may_contain(bloom_filter, [1, 2, 3]).any()
@@ -0,0 +1,84 @@
+"""This module contains the test suite for `get_client()`, `set_client()` and
+`reset_clients()`."""
+
+from concurrent.futures import ThreadPoolExecutor
+import os
+from unittest.mock import MagicMock
+
+import boto3
+from moto import mock_aws
+import pytest
+
+from src.utils.client_factory import (
+    MAX_POOL_CONNECTIONS,
+    get_client,
+    reset_clients,
+    set_client,
+)
+from src.utils.parquet_file_reader import parquet_file_reader
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.mark.describe("get_client()")
+@pytest.mark.it("should build each client once and share it between threads")
+def test_get_client_is_shared(aws_credentials):
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        s3_clients = list(executor.map(lambda _: get_client("s3"), range(32)))
+
+    assert all(client is s3_clients[0] for client in s3_clients)
+    assert get_client("ssm") is not s3_clients[0]
+    assert get_client("ssm", region_name="us-east-1") is not get_client("ssm")
+
+
+@pytest.mark.describe("get_client()")
+@pytest.mark.it("should build clients with the tuned pool size and retries")
+def test_get_client_config(aws_credentials):
+    config = get_client("s3").meta.config
+    assert config.max_pool_connections == MAX_POOL_CONNECTIONS == 50
+    assert config.retries["mode"] == "standard"
+    assert config.retries["total_max_attempts"] == 6
+
+
+@pytest.mark.describe("reset_clients()")
+@pytest.mark.it("should build new clients after a reset")
+def test_reset_clients(aws_credentials):
+    client = get_client("s3")
+    reset_clients()
+    assert get_client("s3") is not client
+
+
+@pytest.mark.describe("set_client()")
+@pytest.mark.it("should inject a client used by every module")
+def test_set_client_injects(aws_credentials):
+    s3 = MagicMock()
+    s3.get_object.side_effect = FileNotFoundError("injected")
+    set_client("s3", s3)
+
+    with pytest.raises(FileNotFoundError, match="injected"):
+        parquet_file_reader("table/2024-02-22/18:00:20.106733.parquet", "bucket")
+
+    s3.get_object.assert_called_once_with(
+        Bucket="bucket", Key="table/2024-02-22/18:00:20.106733.parquet"
+    )
+
+
+@pytest.mark.describe("get_client()")
+@pytest.mark.it("should work with moto mocked services")
+def test_get_client_with_moto(aws_credentials):
+    with mock_aws():
+        boto3.client("s3", region_name="eu-west-2").create_bucket(
+            Bucket="test-bucket",
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+        buckets = get_client("s3").list_buckets()["Buckets"]
+
+    assert [bucket["Name"] for bucket in buckets] == ["test-bucket"]
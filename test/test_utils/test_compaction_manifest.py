@@ -0,0 +1,87 @@
+"""This module contains the test suite for `get_compaction_manifest()`,
+`put_compaction_manifest()` and `apply_compaction_manifest()`."""
+
+import os
+
+import boto3
+from moto import mock_aws
+import pytest
+
+from src.utils.compaction_manifest import (
+    apply_compaction_manifest,
+    get_compaction_manifest,
+    put_compaction_manifest,
+)
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client."""
+    with mock_aws():
+        yield boto3.client("s3", region_name="eu-west-2")
+
+
+@pytest.fixture
+def catalog_bucket(s3):
+    """Create mock catalog bucket."""
+    s3.create_bucket(
+        Bucket="totesys-etl-catalog-bucket-teamness-120224",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+
+
+@pytest.fixture
+def manifest():
+    """Sets up a manifest with one compacted day."""
+    return {
+        "days": {
+            "2024-01-01": {
+                "key": "_compacted/staff/2024-01-01/01:00:00.000000.parquet",
+                "sources": [
+                    "staff/2024-01-01/10:00:00.000000.parquet",
+                    "staff/2024-01-01/10:05:00.000000.parquet",
+                ],
+            }
+        }
+    }
+
+
+@pytest.mark.describe("get_compaction_manifest()")
+@pytest.mark.it("should return an empty manifest for an uncompacted table")
+def test_empty_manifest(catalog_bucket):
+    """get_compaction_manifest() should return no days if there is no manifest."""
+    assert get_compaction_manifest("staff", "b") == {"days": {}}
+
+
+@pytest.mark.describe("put_compaction_manifest()")
+@pytest.mark.it("should save a manifest that can be retrieved")
+def test_put_and_get(catalog_bucket, manifest):
+    """put_compaction_manifest() should save the manifest in the catalog bucket."""
+    put_compaction_manifest("staff", "b", manifest)
+    assert get_compaction_manifest("staff", "b") == manifest
+
+
+@pytest.mark.describe("apply_compaction_manifest()")
+@pytest.mark.it("should replace compacted files with their compacted file once")
+def test_apply_manifest(catalog_bucket, manifest):
+    """apply_compaction_manifest() should keep uncompacted files and order."""
+    put_compaction_manifest("staff", "b", manifest)
+    files = [
+        "staff/2024-01-01/10:00:00.000000.parquet",
+        "staff/2024-01-01/10:05:00.000000.parquet",
+        "staff/2024-01-02/10:00:00.000000.parquet",
+    ]
+    assert apply_compaction_manifest("staff", "b", files) == [
+        "_compacted/staff/2024-01-01/01:00:00.000000.parquet",
+        "staff/2024-01-02/10:00:00.000000.parquet",
+    ]
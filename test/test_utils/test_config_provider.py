@@ -0,0 +1,186 @@
+"""This module contains the test suite for the configuration provider."""
+
+import os
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+import pytest
+
+from src.utils.config_provider import (
+    find_bucket_name,
+    get_config,
+    load_parameter,
+    load_secret,
+    prefetch_config,
+    put_parameter,
+)
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def aws(aws_credentials):
+    """Create mock s3 buckets, a secret and a parameter."""
+    with mock_aws():
+        s3 = boto3.client("s3", region_name="eu-west-2")
+        s3.create_bucket(
+            Bucket="totesys-etl-ingestion-bucket-teamness-120224",
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+        boto3.client("secretsmanager", region_name="eu-west-2").create_secret(
+            Name="dw_credentials", SecretString='{"user": "test_user"}'
+        )
+        boto3.client("ssm", region_name="eu-west-2").put_parameter(
+            Name="last_ingested_timestamp",
+            Type="String",
+            Value="1970-01-01 00:00:00.000000",
+        )
+        yield s3
+
+
+@pytest.mark.describe("get_config()")
+@pytest.mark.it("should load a value once and reload it after its TTL")
+def test_get_config_ttl():
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return len(loads)
+
+    assert get_config("test:value", loader, ttl=60) == 1
+    assert get_config("test:value", loader, ttl=60) == 1
+
+    with patch("src.utils.config_provider.time.monotonic", return_value=1e12):
+        assert get_config("test:value", loader, ttl=60) == 2
+
+
+@pytest.mark.describe("find_bucket_name()")
+@pytest.mark.it("should list the buckets once for every bucket looked up")
+def test_find_bucket_name_caches(aws):
+    aws.create_bucket(
+        Bucket="totesys-etl-processed-data-bucket-teamness-120224",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    with patch.object(
+        aws, "list_buckets", wraps=aws.list_buckets
+    ) as list_buckets_mock, patch(
+        "src.utils.config_provider.get_client", return_value=aws
+    ):
+        assert find_bucket_name("ingestion") == "totesys-etl-ingestion-bucket-teamness-120224"
+        assert find_bucket_name("processed") == (
+            "totesys-etl-processed-data-bucket-teamness-120224"
+        )
+        assert find_bucket_name("ingestion") == "totesys-etl-ingestion-bucket-teamness-120224"
+
+    assert list_buckets_mock.call_count == 1
+
+
+@pytest.mark.describe("find_bucket_name()")
+@pytest.mark.it("should find a bucket created after the bucket list was cached")
+def test_find_bucket_name_reloads_on_miss(aws):
+    assert find_bucket_name("ingestion") == "totesys-etl-ingestion-bucket-teamness-120224"
+    aws.create_bucket(
+        Bucket="totesys-etl-catalog-bucket-teamness-120224",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    assert find_bucket_name("catalog") == "totesys-etl-catalog-bucket-teamness-120224"
+
+
+@pytest.mark.describe("find_bucket_name()")
+@pytest.mark.it("should cache a bucket that was not found until its TTL expires")
+def test_find_bucket_name_caches_miss(aws):
+    with patch.object(
+        aws, "list_buckets", wraps=aws.list_buckets
+    ) as list_buckets_mock, patch(
+        "src.utils.config_provider.get_client", return_value=aws
+    ):
+        assert find_bucket_name("catalog") is None
+        assert find_bucket_name("catalog") is None
+        assert find_bucket_name("ingestion") == "totesys-etl-ingestion-bucket-teamness-120224"
+
+        assert list_buckets_mock.call_count == 2
+
+        aws.create_bucket(
+            Bucket="totesys-etl-catalog-bucket-teamness-120224",
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+        with patch("src.utils.config_provider.time.monotonic", return_value=1e12):
+            assert find_bucket_name("catalog") == (
+                "totesys-etl-catalog-bucket-teamness-120224"
+            )
+
+
+@pytest.mark.describe("find_bucket_name()")
+@pytest.mark.it("should prefer the environment variable override")
+def test_find_bucket_name_override(monkeypatch):
+    monkeypatch.setenv("CONFIG_PROCESSED_BUCKET", "my-processed-bucket")
+    assert find_bucket_name("processed") == "my-processed-bucket"
+
+
+@pytest.mark.describe("load_secret()")
+@pytest.mark.it("should cache the secret and return a copy")
+def test_load_secret_caches(aws):
+    secret = load_secret("dw_credentials")
+    secret["user"] = "changed"
+
+    with patch("src.utils.config_provider.get_client") as get_client_mock:
+        assert load_secret("dw_credentials") == {"user": "test_user"}
+
+    get_client_mock.assert_not_called()
+
+
+@pytest.mark.describe("load_secret()")
+@pytest.mark.it("should read the secret as JSON from the environment variable override")
+def test_load_secret_override(monkeypatch):
+    monkeypatch.setenv("CONFIG_DW_CREDENTIALS", '{"user": "env_user"}')
+    assert load_secret("dw_credentials") == {"user": "env_user"}
+
+
+@pytest.mark.describe("load_parameter()")
+@pytest.mark.it("should not cache the parameter")
+def test_load_parameter_not_cached(aws):
+    assert load_parameter("last_ingested_timestamp") == "1970-01-01 00:00:00.000000"
+
+    boto3.client("ssm", region_name="eu-west-2").put_parameter(
+        Name="last_ingested_timestamp",
+        Type="String",
+        Value="2024-02-22 18:00:20.106733",
+        Overwrite=True,
+    )
+
+    assert load_parameter("last_ingested_timestamp") == "2024-02-22 18:00:20.106733"
+
+
+@pytest.mark.describe("put_parameter()")
+@pytest.mark.it("should save the parameter")
+def test_put_parameter_writes_through(aws):
+    assert load_parameter("last_ingested_timestamp") == "1970-01-01 00:00:00.000000"
+
+    put_parameter("last_ingested_timestamp", "2024-02-22 18:00:20.106733")
+
+    assert load_parameter("last_ingested_timestamp") == "2024-02-22 18:00:20.106733"
+    ssm = boto3.client("ssm", region_name="eu-west-2")
+    saved = ssm.get_parameter(Name="last_ingested_timestamp")["Parameter"]["Value"]
+    assert saved == "2024-02-22 18:00:20.106733"
+
+
+@pytest.mark.describe("prefetch_config()")
+@pytest.mark.it("should load every value so later lookups make no calls")
+def test_prefetch_config(aws):
+    prefetch_config(buckets=["ingestion", "catalog"], secrets=["dw_credentials"])
+
+    with patch("src.utils.config_provider.get_client") as get_client_mock:
+        assert find_bucket_name("ingestion") == "totesys-etl-ingestion-bucket-teamness-120224"
+        assert find_bucket_name("catalog") is None
+        assert load_secret("dw_credentials") == {"user": "test_user"}
+
+    get_client_mock.assert_not_called()
@@ -0,0 +1,60 @@
+"""This module contains the test suite for `encode_categoricals()`."""
+
+import io
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+
+from src.utils.encode_categoricals import encode_categoricals
+
+
+@pytest.fixture
+def df():
+    return pd.DataFrame(
+        {
+            "location_id": [1, 2, 3, 4],
+            "country": ["United Kingdom", "France", "United Kingdom", None],
+        }
+    )
+
+
+@pytest.mark.describe("encode_categoricals()")
+@pytest.mark.it("should encode the passed columns of a data frame as sorted categoricals")
+def test_encode_categoricals_data_frame(df):
+    result = encode_categoricals(df, ["country", "city"])
+    assert result["country"].dtype == "category"
+    assert result["country"].cat.categories.tolist() == ["France", "United Kingdom"]
+    assert result["location_id"].dtype == "int64"
+    assert result["country"].tolist()[:3] == df["country"].tolist()[:3]
+    assert result["country"].isna().tolist() == [False, False, False, True]
+
+
+@pytest.mark.describe("encode_categoricals()")
+@pytest.mark.it("should not mutate the passed data frame")
+def test_encode_categoricals_does_not_mutate(df):
+    encode_categoricals(df, ["country"])
+    assert df["country"].dtype == "object"
+
+
+@pytest.mark.describe("encode_categoricals()")
+@pytest.mark.it("should encode Arrow columns as dictionary arrays matching the pandas categories")
+def test_encode_categoricals_arrow(df):
+    table = encode_categoricals(pa.Table.from_pandas(df), ["country"])
+    assert pa.types.is_dictionary(table.schema.field("country").type)
+    pd.testing.assert_frame_equal(
+        table.to_pandas(), encode_categoricals(df, ["country"])
+    )
+
+
+@pytest.mark.describe("encode_categoricals()")
+@pytest.mark.it("should keep the encoding through a parquet round trip")
+def test_encode_categoricals_parquet_round_trip(df):
+    result = pd.read_parquet(io.BytesIO(encode_categoricals(df, ["country"]).to_parquet()))
+    assert result["country"].dtype == "category"
+
+    buffer = io.BytesIO()
+    pq.write_table(encode_categoricals(pa.Table.from_pandas(df), ["country"]), buffer)
+    table = pq.read_table(io.BytesIO(buffer.getvalue()))
+    assert pa.types.is_dictionary(table.schema.field("country").type)
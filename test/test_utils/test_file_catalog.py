@@ -0,0 +1,247 @@
+"""This module contains the test suite for `get_primary_key()`,
+`build_catalog_entry()`, `update_catalog()`, `get_catalog()`,
+`backfill_catalog()`, `backfill_catalogs()` and `query_catalog()`."""
+
+import json
+import os
+
+from unittest.mock import patch
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+import pytest
+
+from src.utils.file_catalog import (
+    backfill_catalog,
+    backfill_catalogs,
+    build_catalog_entry,
+    get_catalog,
+    get_primary_key,
+    put_catalog,
+    query_catalog,
+    update_catalog,
+)
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client."""
+    with mock_aws():
+        yield boto3.client("s3", region_name="eu-west-2")
+
+
+@pytest.fixture
+def catalog_bucket(s3):
+    """Create mock catalog bucket and an empty data bucket."""
+    for bucket in ["totesys-etl-catalog-bucket-teamness-120224", "test_bucket"]:
+        s3.create_bucket(
+            Bucket=bucket,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+
+
+@pytest.fixture
+def department_df_1():
+    """Sets up a test data frame."""
+    with open("test/test_transform/test_data/test_department_data1.json") as f:
+        json_data = json.loads(f.read())
+        return pd.DataFrame.from_records(json_data["department"])
+
+
+@pytest.fixture
+def department_df_2():
+    """Sets up a test data frame."""
+    with open("test/test_transform/test_data/test_department_data2.json") as f:
+        json_data = json.loads(f.read())
+        return pd.DataFrame.from_records(json_data["department"])
+
+
+@pytest.mark.describe("get_primary_key()")
+@pytest.mark.it("should return the `<table>_id` column for source and warehouse tables")
+def test_get_primary_key():
+    """get_primary_key() should strip dim_/fact_ prefixes to find the id column."""
+    assert get_primary_key("staff", ["staff_id", "first_name"]) == "staff_id"
+    assert get_primary_key("dim_location", ["location_id", "city"]) == "location_id"
+    assert get_primary_key("fact_sales_order", ["sales_order_id"]) == "sales_order_id"
+    assert get_primary_key("cars", ["id", "make"]) is None
+
+
+@pytest.mark.describe("build_catalog_entry()")
+@pytest.mark.it("should record table, run id, row count and key ranges")
+def test_build_catalog_entry(department_df_1):
+    """build_catalog_entry() should summarise the written data frame."""
+    file_path = "department/2022-11-03/14:20:51.563.parquet"
+    result = build_catalog_entry(department_df_1, file_path)
+    assert result["key"] == file_path
+    assert result["table_name"] == "department"
+    assert result["run_id"] == "2022-11-03 14:20:51.563"
+    assert result["row_count"] == len(department_df_1)
+    assert result["primary_key"] == "department_id"
+    assert result["min_primary_key"] == department_df_1["department_id"].min()
+    assert result["max_primary_key"] == department_df_1["department_id"].max()
+    assert result["max_last_updated"] == pd.to_datetime(
+        department_df_1["last_updated"]
+    ).max()
+
+
+@pytest.mark.describe("update_catalog()")
+@pytest.mark.it("should skip cataloguing when there is no catalog bucket")
+def test_update_catalog_no_bucket(s3, department_df_1):
+    """update_catalog() should not raise if the catalog bucket does not exist."""
+    update_catalog(department_df_1, "department/2022-11-03/14:20:51.563.parquet", "test_bucket")
+    assert get_catalog("department", "test_bucket") is None
+
+
+@pytest.mark.describe("update_catalog()")
+@pytest.mark.it("should append entries to the table's catalog")
+def test_update_catalog_appends(catalog_bucket, department_df_1, department_df_2):
+    """update_catalog() should add one row per written file."""
+    update_catalog(department_df_1, "department/2022-11-03/14:20:51.563.parquet", "test_bucket")
+    update_catalog(department_df_2, "department/2022-11-04/14:20:51.563.parquet", "test_bucket")
+    result = get_catalog("department", "test_bucket")
+    assert result["key"].tolist() == [
+        "department/2022-11-03/14:20:51.563.parquet",
+        "department/2022-11-04/14:20:51.563.parquet",
+    ]
+    assert result["row_count"].tolist() == [len(department_df_1), len(department_df_2)]
+
+
+@pytest.mark.describe("update_catalog()")
+@pytest.mark.it("should not duplicate entries for a rewritten key")
+def test_update_catalog_replaces(catalog_bucket, department_df_1):
+    """update_catalog() should replace the entry for an already catalogued key."""
+    update_catalog(department_df_1, "department/2022-11-03/14:20:51.563.parquet", "test_bucket")
+    update_catalog(department_df_1, "department/2022-11-03/14:20:51.563.parquet", "test_bucket")
+    assert len(get_catalog("department", "test_bucket")) == 1
+
+
+@pytest.mark.describe("query_catalog()")
+@pytest.mark.it("should return None when the table has no catalog")
+def test_query_catalog_no_catalog(catalog_bucket):
+    """query_catalog() should return None so callers can fall back to listing."""
+    assert query_catalog("department", "test_bucket") is None
+
+
+@pytest.mark.describe("query_catalog()")
+@pytest.mark.it("should filter files by last_updated range")
+def test_query_catalog_filters(catalog_bucket, department_df_1, department_df_2):
+    """query_catalog() should only return files whose rows fall in the range."""
+    department_df_2["last_updated"] = "2024-01-01 09:00:00.000000"
+    update_catalog(department_df_1, "department/2022-11-03/14:20:51.563.parquet", "test_bucket")
+    update_catalog(department_df_2, "department/2024-01-01/09:05:00.000000.parquet", "test_bucket")
+    assert query_catalog("department", "test_bucket", updated_after="2023-01-01") == [
+        "department/2024-01-01/09:05:00.000000.parquet"
+    ]
+    assert query_catalog("department", "test_bucket", updated_before="2023-01-01") == [
+        "department/2022-11-03/14:20:51.563.parquet"
+    ]
+
+
+@pytest.mark.describe("update_catalog()")
+@pytest.mark.it("should leave the catalog incomplete when older files were never catalogued")
+def test_update_catalog_incomplete(s3, catalog_bucket, department_df_1, department_df_2):
+    """update_catalog() should only add the new file, and readers should list until a backfill."""
+    old_key = "department/2022-11-03/14:20:51.563.parquet"
+    new_key = "department/2022-11-04/14:20:51.563.parquet"
+    s3.put_object(Body=department_df_1.to_parquet(), Bucket="test_bucket", Key=old_key)
+    s3.put_object(Body=department_df_2.to_parquet(), Bucket="test_bucket", Key=new_key)
+
+    update_catalog(department_df_2, new_key, "test_bucket")
+
+    assert query_catalog("department", "test_bucket") is None
+    catalog = get_catalog("department", "test_bucket", include_incomplete=True)
+    assert catalog["key"].tolist() == [new_key]
+
+    assert backfill_catalog("department", "test_bucket") == 1
+    assert query_catalog("department", "test_bucket") == [old_key, new_key]
+
+
+@pytest.mark.describe("update_catalog()")
+@pytest.mark.it("should log and continue when the catalog update fails")
+def test_update_catalog_failure(catalog_bucket, department_df_1, caplog):
+    """update_catalog() should never fail the write it catalogues."""
+    with patch(
+        "src.utils.file_catalog.add_catalog_entries", side_effect=Exception("S3 down")
+    ):
+        update_catalog(department_df_1, "department/2022-11-03/14:20:51.563.parquet", "b")
+    assert "not catalogued: S3 down" in caplog.text
+
+
+@pytest.mark.describe("get_catalog()")
+@pytest.mark.it("should ignore a catalog that has not been backfilled")
+def test_get_catalog_incomplete(s3, catalog_bucket, department_df_1):
+    """get_catalog() should return None so callers list the bucket instead."""
+    key = "department/2022-11-03/14:20:51.563.parquet"
+    incomplete_catalog = pd.DataFrame([build_catalog_entry(department_df_1, key)])
+    s3.put_object(
+        Body=incomplete_catalog.to_parquet(index=False),
+        Bucket="totesys-etl-catalog-bucket-teamness-120224",
+        Key="test_bucket/department.parquet",
+    )
+
+    assert get_catalog("department", "test_bucket") is None
+    assert query_catalog("department", "test_bucket") is None
+    assert len(get_catalog("department", "test_bucket", include_incomplete=True)) == 1
+
+
+@pytest.mark.describe("backfill_catalog()")
+@pytest.mark.it("should add the files missing from an incomplete catalog")
+def test_backfill_catalog(s3, catalog_bucket, department_df_1, department_df_2):
+    """backfill_catalog() should keep existing entries and catalog uncatalogued files."""
+    old_key = "department/2022-11-03/14:20:51.563.parquet"
+    new_key = "department/2022-11-04/14:20:51.563.parquet"
+    s3.put_object(Body=department_df_1.to_parquet(), Bucket="test_bucket", Key=old_key)
+    s3.put_object(
+        Body=pd.DataFrame([build_catalog_entry(department_df_2, new_key)]).to_parquet(
+            index=False
+        ),
+        Bucket="totesys-etl-catalog-bucket-teamness-120224",
+        Key="test_bucket/department.parquet",
+    )
+
+    assert backfill_catalog("department", "test_bucket") == 1
+
+    result = get_catalog("department", "test_bucket")
+    assert sorted(result["key"].tolist()) == [old_key, new_key]
+    assert query_catalog("department", "test_bucket") == [old_key, new_key]
+
+
+@pytest.mark.describe("backfill_catalogs()")
+@pytest.mark.it("should backfill every table, saving progress as it goes")
+def test_backfill_catalogs(s3, catalog_bucket, department_df_1, department_df_2, monkeypatch):
+    """backfill_catalogs() should skip `_` prefixes and save the catalog between batches."""
+    monkeypatch.setattr("src.utils.file_catalog.BACKFILL_BATCH_SIZE", 1)
+    keys = [
+        "department/2022-11-03/14:20:51.563.parquet",
+        "department/2022-11-04/14:20:51.563.parquet",
+    ]
+    for key, df in zip(keys, [department_df_1, department_df_2]):
+        s3.put_object(Body=df.to_parquet(), Bucket="test_bucket", Key=key)
+    s3.put_object(
+        Body=department_df_1.to_parquet(),
+        Bucket="test_bucket",
+        Key="_compacted/department/2022-11-03/15:00:00.000000.parquet",
+    )
+
+    with patch(
+        "src.utils.file_catalog.put_catalog", wraps=put_catalog
+    ) as put_catalog_mock:
+        assert backfill_catalogs("test_bucket") == {"department": 2}
+
+    assert [call.kwargs["complete"] for call in put_catalog_mock.call_args_list] == [
+        False,
+        False,
+        True,
+    ]
+    assert query_catalog("department", "test_bucket") == keys
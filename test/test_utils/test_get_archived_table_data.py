@@ -8,6 +8,7 @@ from moto import mock_aws
 import pandas as pd
 import pytest
 
+from src.utils.file_catalog import update_catalog
 from src.utils.get_archived_table_data import get_archived_table_data
 
 
@@ -92,3 +93,70 @@ def test_returns_correct_data(bucket, test_df_1, test_df_2):
     merged_df = pd.concat([test_df_1, test_df_2], ignore_index=True)
     result = get_archived_table_data("department", "test_bucket")
     assert result.equals(merged_df)
+
+
+@pytest.fixture
+def catalogued_bucket(s3, test_df_1, test_df_2):
+    """Create mock s3 bucket with catalogued parquet files."""
+    for bucket in ["test_bucket", "totesys-etl-catalog-bucket-teamness-120224"]:
+        s3.create_bucket(
+            Bucket=bucket,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+    for key, df in [
+        ("department/2022-11-03/14:20:51.563.parquet", test_df_1),
+        ("department/2022-11-03/14:25:51.563.parquet", test_df_2),
+    ]:
+        s3.put_object(Body=df.to_parquet(), Bucket="test_bucket", Key=key)
+        update_catalog(df, key, "test_bucket")
+
+
+@pytest.mark.describe("get_archived_table_data()")
+@pytest.mark.it("should use the file catalog to find every file when one exists")
+def test_uses_catalog(catalogued_bucket, test_df_1, test_df_2):
+    """get_archived_table_data() should read all catalogued files, including several per day."""
+    merged_df = pd.concat([test_df_1, test_df_2], ignore_index=True)
+    result = get_archived_table_data("department", "test_bucket")
+    assert result.equals(merged_df)
+
+
+@pytest.mark.describe("get_archived_table_data()")
+@pytest.mark.it("should read every file in a date folder when listing the bucket")
+def test_lists_every_file(s3, test_df_1, test_df_2):
+    """get_archived_table_data() should not drop files when there is no catalog."""
+    s3.create_bucket(
+        Bucket="test_bucket",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    for key, df in [
+        ("department/2022-11-03/14:20:51.563.parquet", test_df_1),
+        ("department/2022-11-03/14:25:51.563.parquet", test_df_2),
+    ]:
+        s3.put_object(Body=df.to_parquet(), Bucket="test_bucket", Key=key)
+
+    merged_df = pd.concat([test_df_1, test_df_2], ignore_index=True)
+    result = get_archived_table_data("department", "test_bucket")
+    assert result.equals(merged_df)
+
+
+@pytest.mark.describe("get_archived_table_data()")
+@pytest.mark.it("should read files written before the catalog was created")
+def test_reads_files_written_before_catalog(s3, test_df_1, test_df_2):
+    """get_archived_table_data() should include uncatalogued files once a catalog exists."""
+    for bucket in ["test_bucket", "totesys-etl-catalog-bucket-teamness-120224"]:
+        s3.create_bucket(
+            Bucket=bucket,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+    s3.put_object(
+        Body=test_df_1.to_parquet(),
+        Bucket="test_bucket",
+        Key="department/2022-11-03/14:20:51.563.parquet",
+    )
+    new_key = "department/2022-11-04/14:20:51.563.parquet"
+    s3.put_object(Body=test_df_2.to_parquet(), Bucket="test_bucket", Key=new_key)
+    update_catalog(test_df_2, new_key, "test_bucket")
+
+    merged_df = pd.concat([test_df_1, test_df_2], ignore_index=True)
+    result = get_archived_table_data("department", "test_bucket")
+    assert result.equals(merged_df)
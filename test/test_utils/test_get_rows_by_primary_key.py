@@ -0,0 +1,155 @@
+"""This module contains the test suite for `find_files_for_keys()` and
+`get_rows_by_primary_key()`."""
+
+import json
+import os
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+import pytest
+
+from src.utils.compaction_manifest import put_compaction_manifest
+from src.utils.file_catalog import update_catalog
+from src.utils.get_rows_by_primary_key import (
+    find_files_for_keys,
+    get_rows_by_primary_key,
+)
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client."""
+    with mock_aws():
+        yield boto3.client("s3", region_name="eu-west-2")
+
+
+@pytest.fixture
+def address_df_1():
+    """Sets up a test data frame with address_ids 1 and 2."""
+    with open("test/test_transform/test_data/test_address_data.json") as f:
+        json_data = json.loads(f.read())
+        return pd.DataFrame.from_records(json_data["address"])
+
+
+@pytest.fixture
+def address_df_2():
+    """Sets up a test data frame with address_id 3."""
+    with open("test/test_transform/test_data/test_address_data2.json") as f:
+        json_data = json.loads(f.read())
+        return pd.DataFrame.from_records(json_data["address"])
+
+
+@pytest.fixture
+def address_update_df(address_df_1):
+    """Sets up a later version of address_id 2."""
+    df = address_df_1[address_df_1["address_id"] == 2].copy()
+    df["city"] = "Updated City"
+    df["last_updated"] = "2022-11-05 10:00:00.000"
+    return df
+
+
+@pytest.fixture
+def bucket(s3, address_df_1, address_df_2, address_update_df):
+    """Create mock data and catalog buckets with catalogued address files."""
+    for bucket in ["test_bucket", "totesys-etl-catalog-bucket-teamness-120224"]:
+        s3.create_bucket(
+            Bucket=bucket,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+    for key, df in [
+        ("address/2022-11-03/14:20:51.563.parquet", address_df_1),
+        ("address/2022-11-04/14:20:51.563.parquet", address_df_2),
+        ("address/2022-11-05/10:05:00.000.parquet", address_update_df),
+    ]:
+        s3.put_object(Body=df.to_parquet(), Bucket="test_bucket", Key=key)
+        update_catalog(df, key, "test_bucket")
+
+
+@pytest.mark.describe("find_files_for_keys()")
+@pytest.mark.it("should only return files that may contain the keys")
+def test_finds_only_relevant_files(bucket):
+    """find_files_for_keys() should skip files whose key range or bloom filter rules them out."""
+    assert find_files_for_keys("address", "test_bucket", [3]) == [
+        "address/2022-11-04/14:20:51.563.parquet"
+    ]
+    assert find_files_for_keys("address", "test_bucket", [2]) == [
+        "address/2022-11-03/14:20:51.563.parquet",
+        "address/2022-11-05/10:05:00.000.parquet",
+    ]
+    assert find_files_for_keys("address", "test_bucket", [99]) == []
+
+
+@pytest.mark.describe("find_files_for_keys()")
+@pytest.mark.it("should not swap pruned files for compacted files")
+def test_ignores_compaction_manifest(bucket):
+    """find_files_for_keys() should keep its pruning when the table's days are compacted."""
+    put_compaction_manifest(
+        "address",
+        "test_bucket",
+        {
+            "days": {
+                "2022-11-04": {
+                    "key": "_compacted/address/2022-11-04/00:00:00.000000.parquet",
+                    "sources": [
+                        "address/2022-11-04/14:20:51.563.parquet",
+                        "address/2022-11-04/18:00:00.000.parquet",
+                    ],
+                }
+            }
+        },
+    )
+    assert find_files_for_keys("address", "test_bucket", [3]) == [
+        "address/2022-11-04/14:20:51.563.parquet"
+    ]
+
+
+@pytest.mark.describe("find_files_for_keys()")
+@pytest.mark.it("should return None when the table has no catalog")
+def test_no_catalog(s3):
+    """find_files_for_keys() should return None so callers can fall back to a full read."""
+    assert find_files_for_keys("address", "test_bucket", [1]) is None
+
+
+@pytest.mark.describe("get_rows_by_primary_key()")
+@pytest.mark.it("should return the latest version of each requested key")
+def test_returns_latest_rows(bucket):
+    """get_rows_by_primary_key() should keep the most recently updated row per key."""
+    result = get_rows_by_primary_key("address", "test_bucket", [2, 3])
+    assert result["address_id"].tolist() == [2, 3]
+    assert result["city"].tolist()[0] == "Updated City"
+
+
+@pytest.mark.describe("get_rows_by_primary_key()")
+@pytest.mark.it("should return an empty data frame when no file contains the keys")
+def test_returns_empty(bucket):
+    """get_rows_by_primary_key() should not read any file for unknown keys."""
+    result = get_rows_by_primary_key("address", "test_bucket", [99])
+    assert result.empty
+
+
+@pytest.mark.describe("get_rows_by_primary_key()")
+@pytest.mark.it("should raise a ValueError when the table has no natural key column")
+def test_no_natural_key(s3, address_df_1):
+    """get_rows_by_primary_key() should not fail with a KeyError for tables without `<table>_id`."""
+    s3.create_bucket(
+        Bucket="test_bucket",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    s3.put_object(
+        Body=address_df_1.to_parquet(),
+        Bucket="test_bucket",
+        Key="location/2022-11-03/14:20:51.563.parquet",
+    )
+    with pytest.raises(ValueError, match="location data has no natural key column"):
+        get_rows_by_primary_key("location", "test_bucket", [1])
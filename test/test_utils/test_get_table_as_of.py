@@ -0,0 +1,130 @@
+"""This module contains the test suite for `get_table_as_of()`,
+`create_table_snapshot()`, `get_key_timestamp()` and `list_table_files()`."""
+
+import json
+import os
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+import pytest
+
+from src.utils.file_catalog import update_catalog
+from src.utils.get_table_as_of import (
+    create_table_snapshot,
+    get_key_timestamp,
+    get_table_as_of,
+    list_table_files,
+)
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client."""
+    with mock_aws():
+        yield boto3.client("s3", region_name="eu-west-2")
+
+
+@pytest.fixture
+def address_files():
+    """Sets up three runs of address data: the initial load, a new address and an update."""
+    with open("test/test_transform/test_data/test_address_data.json") as f:
+        initial_df = pd.DataFrame.from_records(json.loads(f.read())["address"])
+    with open("test/test_transform/test_data/test_address_data2.json") as f:
+        new_df = pd.DataFrame.from_records(json.loads(f.read())["address"])
+    update_df = initial_df[initial_df["address_id"] == 2].copy()
+    update_df["city"] = "Updated City"
+    update_df["last_updated"] = "2022-11-05 10:00:00.000"
+    return [
+        ("address/2022-11-03/14:25:00.000000.parquet", initial_df),
+        ("address/2022-11-04/14:25:00.000000.parquet", new_df),
+        ("address/2022-11-05/10:05:00.000000.parquet", update_df),
+    ]
+
+
+@pytest.fixture
+def bucket(s3, address_files):
+    """Create mock s3 bucket with uncatalogued address files."""
+    s3.create_bucket(
+        Bucket="test_bucket",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    for key, df in address_files:
+        s3.put_object(Body=df.to_parquet(), Bucket="test_bucket", Key=key)
+
+
+@pytest.fixture
+def catalogued_bucket(s3, bucket, address_files):
+    """Catalogue the address files."""
+    s3.create_bucket(
+        Bucket="totesys-etl-catalog-bucket-teamness-120224",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+    for key, df in address_files:
+        update_catalog(df, key, "test_bucket")
+
+
+@pytest.mark.describe("get_key_timestamp()")
+@pytest.mark.it("should return the run timestamp from a key")
+def test_get_key_timestamp():
+    """get_key_timestamp() should parse the date and time folders of a key."""
+    result = get_key_timestamp("address/2022-11-04/14:25:00.000000.parquet")
+    assert result == pd.Timestamp("2022-11-04 14:25:00")
+
+
+@pytest.mark.describe("list_table_files()")
+@pytest.mark.it("should list every file under the prefix")
+def test_list_table_files(bucket):
+    """list_table_files() should return all files, not one per date folder."""
+    assert len(list_table_files("address/", "test_bucket")) == 3
+
+
+@pytest.mark.describe("get_table_as_of()")
+@pytest.mark.it("should only include rows updated at or before the timestamp")
+def test_as_of_excludes_later_rows(bucket):
+    """get_table_as_of() should return the table as it was at the passed timestamp."""
+    result = get_table_as_of("address", "test_bucket", "2022-11-03 23:59")
+    assert result["address_id"].tolist() == [1, 2]
+    result = get_table_as_of("address", "test_bucket", "2022-11-04 23:59")
+    assert result["address_id"].tolist() == [1, 2, 3]
+
+
+@pytest.mark.describe("get_table_as_of()")
+@pytest.mark.it("should return the latest version of each row")
+def test_as_of_returns_latest_versions(bucket):
+    """get_table_as_of() should apply updates made before the timestamp."""
+    before = get_table_as_of("address", "test_bucket", "2022-11-04 23:59")
+    after = get_table_as_of("address", "test_bucket", "2022-11-06")
+    assert before.loc[before["address_id"] == 2, "city"].item() == "Olsonside"
+    assert after.loc[after["address_id"] == 2, "city"].item() == "Updated City"
+
+
+@pytest.mark.describe("get_table_as_of()")
+@pytest.mark.it("should give the same result from the catalog as from listing")
+def test_as_of_catalogued(catalogued_bucket):
+    """get_table_as_of() should use the catalog to choose delta files."""
+    result = get_table_as_of("address", "test_bucket", "2022-11-06")
+    assert result["address_id"].tolist() == [1, 2, 3]
+    assert result.loc[result["address_id"] == 2, "city"].item() == "Updated City"
+
+
+@pytest.mark.describe("create_table_snapshot()")
+@pytest.mark.it("should save a snapshot that later reconstructions start from")
+def test_snapshot_used(s3, bucket):
+    """get_table_as_of() should combine a snapshot with the deltas written after it."""
+    snapshot_key = create_table_snapshot("address", "test_bucket", "2022-11-04 23:59")
+    assert snapshot_key == "_snapshots/address/2022-11-04/23:59:00.000000.parquet"
+    s3.delete_object(Bucket="test_bucket", Key="address/2022-11-03/14:25:00.000000.parquet")
+    result = get_table_as_of("address", "test_bucket", "2022-11-06")
+    assert result["address_id"].tolist() == [1, 2, 3]
+    assert result.loc[result["address_id"] == 2, "city"].item() == "Updated City"
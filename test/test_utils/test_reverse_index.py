@@ -0,0 +1,102 @@
+"""This module contains the test suite for `build_reverse_index()`,
+`update_reverse_index()`, `get_reverse_index()` and `find_dependent_keys()`."""
+
+import json
+import os
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+import pytest
+
+from src.utils.reverse_index import (
+    build_reverse_index,
+    find_dependent_keys,
+    get_reverse_index,
+    update_reverse_index,
+)
+
+INGESTION_BUCKET = "totesys-etl-ingestion-bucket-teamness-120224"
+CATALOG_BUCKET = "totesys-etl-catalog-bucket-teamness-120224"
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client."""
+    with mock_aws():
+        yield boto3.client("s3", region_name="eu-west-2")
+
+
+@pytest.fixture
+def counterparty_df():
+    """Sets up a test data frame of counterparties 1-3 at addresses 1-3."""
+    with open("test/test_transform/test_data/test_counterparty_data.json") as f:
+        json_data = json.loads(f.read())
+        return pd.DataFrame.from_records(json_data["counterparty"])
+
+
+@pytest.fixture
+def buckets(s3, counterparty_df):
+    """Create mock ingestion and catalog buckets with one counterparty file."""
+    for bucket_name in [INGESTION_BUCKET, CATALOG_BUCKET]:
+        s3.create_bucket(
+            Bucket=bucket_name,
+            CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+        )
+
+    s3.put_object(
+        Bucket=INGESTION_BUCKET,
+        Key="counterparty/2022-11-03/14:20:51.563.parquet",
+        Body=counterparty_df.to_parquet(),
+    )
+
+
+@pytest.mark.describe("build_reverse_index()")
+@pytest.mark.it("should build and save the index from the archived table")
+def test_build_reverse_index(buckets):
+    index = build_reverse_index(
+        "counterparty", "address", "legal_address_id", INGESTION_BUCKET
+    )
+    assert index.to_dict("list") == {
+        "legal_address_id": [1, 2, 3],
+        "counterparty_id": [1, 2, 3],
+    }
+    assert get_reverse_index("address", "counterparty").equals(index)
+
+
+@pytest.mark.describe("update_reverse_index()")
+@pytest.mark.it("should replace the entries of rows that change their reference")
+def test_update_reverse_index(buckets, counterparty_df):
+    build_reverse_index("counterparty", "address", "legal_address_id", INGESTION_BUCKET)
+    moved_df = counterparty_df[counterparty_df["counterparty_id"] == 3].assign(
+        legal_address_id=1
+    )
+    update_reverse_index(
+        moved_df, "counterparty", "address", "legal_address_id", INGESTION_BUCKET
+    )
+    assert find_dependent_keys(
+        "counterparty", "address", "legal_address_id", [1], INGESTION_BUCKET
+    ) == [1, 3]
+    assert find_dependent_keys(
+        "counterparty", "address", "legal_address_id", [3], INGESTION_BUCKET
+    ) == []
+
+
+@pytest.mark.describe("find_dependent_keys()")
+@pytest.mark.it("should build the index from the archive when there is none")
+def test_find_dependent_keys_builds_index(buckets):
+    assert get_reverse_index("address", "counterparty") is None
+    assert find_dependent_keys(
+        "counterparty", "address", "legal_address_id", [2, 9], INGESTION_BUCKET
+    ) == [2]
+    assert get_reverse_index("address", "counterparty") is not None
@@ -0,0 +1,95 @@
+"""This module contains the test suite for `compute_row_hashes()`,
+`find_changed_rows()` and `update_row_hashes()`."""
+
+import os
+
+import boto3
+from moto import mock_aws
+import pandas as pd
+import pytest
+
+from src.utils.row_hash import (
+    compute_row_hashes,
+    find_changed_rows,
+    get_row_hashes,
+    update_row_hashes,
+)
+
+
+@pytest.fixture(scope="function")
+def aws_credentials():
+    """Mocked AWS Credentials for moto"""
+    os.environ["AWS_ACCESS_KEY_ID"] = "testing"
+    os.environ["AWS_SECRET_ACCESS_KEY"] = "testing"
+    os.environ["AWS_SECURITY_TOKEN"] = "testing"
+    os.environ["AWS_SESSION_TOKEN"] = "testing"
+    os.environ["AWS_DEFAULT_REGION"] = "eu-west-2"
+
+
+@pytest.fixture(scope="function")
+def s3(aws_credentials):
+    """Create mock s3 client."""
+    with mock_aws():
+        yield boto3.client("s3", region_name="eu-west-2")
+
+
+@pytest.fixture
+def catalog_bucket(s3):
+    """Create mock catalog bucket."""
+    s3.create_bucket(
+        Bucket="totesys-etl-catalog-bucket-teamness-120224",
+        CreateBucketConfiguration={"LocationConstraint": "eu-west-2"},
+    )
+
+
+@pytest.fixture
+def payment_type_df():
+    """Sets up a test dim_payment_type data frame."""
+    return pd.DataFrame(
+        {
+            "payment_type_id": [1, 2, 3],
+            "payment_type_name": ["SALES_RECEIPT", "SALES_REFUND", "PURCHASE_PAYMENT"],
+        }
+    )
+
+
+@pytest.mark.describe("compute_row_hashes()")
+@pytest.mark.it("should give equal rows equal hashes and changed rows different ones")
+def test_compute_row_hashes(payment_type_df):
+    changed_df = payment_type_df.assign(payment_type_name=["SALES_RECEIPT", "X", "Y"])
+    hashes = compute_row_hashes(payment_type_df)
+    changed_hashes = compute_row_hashes(changed_df)
+    assert hashes.dtype == "int64"
+    assert hashes[0] == changed_hashes[0]
+    assert (hashes[1:] != changed_hashes[1:]).all()
+
+
+@pytest.mark.describe("find_changed_rows()")
+@pytest.mark.it("should treat every row as changed when there is no state")
+def test_find_changed_rows_no_state(s3, payment_type_df):
+    assert find_changed_rows(payment_type_df, "dim_payment_type").all()
+
+
+@pytest.mark.describe("find_changed_rows()")
+@pytest.mark.it("should only flag new and changed rows once rows are recorded")
+def test_find_changed_rows(catalog_bucket, payment_type_df):
+    update_row_hashes(payment_type_df, "dim_payment_type")
+    new_df = pd.concat(
+        [
+            payment_type_df.assign(
+                payment_type_name=["SALES_RECEIPT", "SALES_REFUND", "CHANGED"]
+            ),
+            pd.DataFrame({"payment_type_id": [4], "payment_type_name": ["NEW"]}),
+        ],
+        ignore_index=True,
+    )
+    assert find_changed_rows(new_df, "dim_payment_type").tolist() == [
+        False,
+        False,
+        True,
+        True,
+    ]
+
+    update_row_hashes(new_df.iloc[2:], "dim_payment_type")
+    assert not find_changed_rows(new_df, "dim_payment_type").any()
+    assert len(get_row_hashes("dim_payment_type")) == 4
@@ -0,0 +1,75 @@
+"""This module contains the test suite for `get_static_lookup()` and
+`apply_static_lookup()`."""
+
+import logging
+
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.utils.static_lookup import apply_static_lookup, get_static_lookup
+
+
+@pytest.mark.describe("get_static_lookup()")
+@pytest.mark.it("should build the currency name lookup once per process")
+def test_get_static_lookup_is_cached():
+    lookup = get_static_lookup("currency_name")
+    assert lookup["GBP"] == "British Pound"
+    assert get_static_lookup("currency_name") is lookup
+
+
+@pytest.mark.describe("get_static_lookup()")
+@pytest.mark.it("should raise ValueError for an unknown lookup")
+def test_get_static_lookup_raises():
+    with pytest.raises(ValueError):
+        get_static_lookup("colour_name")
+
+
+@pytest.mark.describe("apply_static_lookup()")
+@pytest.mark.it("should map each row of a series by its code")
+def test_apply_static_lookup_series():
+    codes = pd.Series(["GBP", "USD", "GBP", None, "EUR"], index=[5, 6, 7, 8, 9])
+    result = apply_static_lookup(codes, "currency_name")
+    assert result.index.tolist() == [5, 6, 7, 8, 9]
+    assert result.tolist() == [
+        "British Pound",
+        "US Dollar",
+        "British Pound",
+        None,
+        "Euro",
+    ]
+
+
+@pytest.mark.describe("apply_static_lookup()")
+@pytest.mark.it("should map an Arrow array to an Arrow array")
+def test_apply_static_lookup_arrow():
+    codes = pa.chunked_array([["GBP", "USD"], ["GBP"]])
+    result = apply_static_lookup(codes, "currency_name")
+    assert result.to_pylist() == ["British Pound", "US Dollar", "British Pound"]
+
+
+@pytest.mark.describe("apply_static_lookup()")
+@pytest.mark.it("should use the fallback for unknown codes and log them")
+def test_apply_static_lookup_fallback(caplog):
+    codes = pd.Series(["GBP", "ZZZ"])
+    with caplog.at_level(logging.WARNING):
+        result = apply_static_lookup(codes, "currency_name", fallback=lambda code: code)
+    assert result.tolist() == ["British Pound", "ZZZ"]
+    assert "['ZZZ']" in caplog.text
+    assert apply_static_lookup(codes, "currency_name").tolist() == [
+        "British Pound",
+        None,
+    ]
+
+
+@pytest.mark.describe("apply_static_lookup()")
+@pytest.mark.it("should map lowercase codes like uppercase codes")
+def test_apply_static_lookup_lowercase():
+    codes = pd.Series(["gbp", "Usd", "GBP"])
+    assert apply_static_lookup(codes, "currency_name").tolist() == [
+        "British Pound",
+        "US Dollar",
+        "British Pound",
+    ]
+    result = apply_static_lookup(pa.array(["eur"]), "currency_name")
+    assert result.to_pylist() == ["Euro"]